@@ -1,11 +1,46 @@
+import asyncio
 import logging
 
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import HomeAssistant, ServiceCall, SupportsResponse, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.storage import Store
 from .api import NatureRemoAPI
+from .cassette import CassetteRecorder
 from .coordinator import NatureRemoCoordinator
-from .const import DOMAIN
+from .echonet import WRAP_SAVE_DELAY, WRAP_STORAGE_VERSION
+from .energy_statistics import SmartMeterStatisticsImporter
+from .hub import NatureRemoHubView
+from .journal import DEFAULT_JOURNAL_TTL, CommandJournal
+from .light import NatureRemoLight
+from .macro import MacroExecutor
+from .peak_demand import PeakDemandTracker
+from .polling import USAGE_SAVE_DELAY, USAGE_STORAGE_VERSION
+from .profiler import NatureRemoProfiler
+from .remote import NatureRemoRemoteEntity
+from .scheduler import NatureRemoPollScheduler
+from .signal_library import SignalLibrary
+from .websocket import SnapshotPublisher, async_register_commands
+from .scene import (
+    SCENE_STORAGE_KEY,
+    SCENE_STORAGE_VERSION,
+    capture_state,
+    execute_plan,
+    plan_restore,
+)
+from .const import (
+    DEFAULT_TIMEOUT_APPLIANCES,
+    DEFAULT_TIMEOUT_COMMANDS,
+    DEFAULT_TIMEOUT_DEVICES,
+    DATA_HUB,
+    DATA_MACROS,
+    DATA_PROFILER,
+    DATA_SCHEDULER,
+    DATA_WEBSOCKET,
+    DOMAIN,
+)
 
 _LOGGER = logging.getLogger(__name__)
 PLATFORMS = ["climate", "light", "sensor", "remote"]
@@ -28,48 +63,465 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     # Coordinator作成 / Create the coordinator
     update_interval = entry.options.get("update_interval", 60)
-    coordinator = NatureRemoCoordinator(hass, api, update_interval)
+    # cProfile・tracemallocはプロセスで1つなので、プロファイラーは全エントリーで共有する
+    # cProfile and tracemalloc are process-wide, so every entry shares one profiler
+    if DATA_PROFILER not in hass.data:
+        hass.data[DATA_PROFILER] = NatureRemoProfiler(hass, "Nature Remo")
+    coordinator = NatureRemoCoordinator(
+        hass, api, update_interval, profiler=hass.data[DATA_PROFILER]
+    )
+    # 届かなかったコマンドのジャーナル（有効かどうかはオプションで決まる）
+    # Journal for commands that did not land; the options decide whether it is used
+    api.journal = CommandJournal(hass, entry.entry_id)
+    await api.journal.async_load()
+    # 当日のリクエスト数を再起動後も引き継ぐ（1日の上限の計算に使う）
+    # Carry today's request count over restarts; the daily ceiling depends on it
+    usage_store = Store(
+        hass, USAGE_STORAGE_VERSION, f"nature_remo.usage.{entry.entry_id}"
+    )
+    if usage := await usage_store.async_load():
+        coordinator.polling.restore_usage(usage, api.request_count)
+    _apply_options(hass, entry, api, coordinator)
+
+    # 永続化したシグナルライブラリを最初のリフレッシュ前に読み込む
+    # Load the persistent signal library before the first refresh
+    signal_library = SignalLibrary(hass, entry.entry_id)
+    await signal_library.async_load()
+    coordinator.signal_library = api.signal_library = signal_library
+
+    # 全アカウントのリフレッシュを1つのスケジューラーで位相をずらして駆動する
+    # One scheduler drives every account's refreshes on staggered phases
+    if DATA_SCHEDULER not in hass.data:
+        hass.data[DATA_SCHEDULER] = NatureRemoPollScheduler(hass)
+    scheduler: NatureRemoPollScheduler = hass.data[DATA_SCHEDULER]
+    entry.async_on_unload(scheduler.async_add(entry.entry_id, coordinator))
+
+    # ピーク需要を契約期間単位で永続化する（最初のリフレッシュ前に読み込む）
+    # Persist peak demand per billing period; loaded before the first refresh
+    peak_tracker = PeakDemandTracker(hass, entry.entry_id)
+    await peak_tracker.async_load()
+    # 積算値の周回補正を引き継ぎ、再起動で積算値が戻らないようにする
+    # Carry the counters' wraparound state over restarts so readings never step back
+    wrap_store = Store(hass, WRAP_STORAGE_VERSION, f"nature_remo.wrap.{entry.entry_id}")
+    if wrap_state := await wrap_store.async_load():
+        coordinator.restore_smart_meter_wrap_state(wrap_state)
+
     await coordinator.async_config_entry_first_refresh()
 
+    @callback
+    def _async_update_peaks() -> None:
+        if coordinator.last_update_success and coordinator.appliances_refreshed:
+            peak_tracker.async_update(coordinator.smart_meter_history)
+
+    entry.async_on_unload(coordinator.async_add_listener(_async_update_peaks))
+    _async_update_peaks()
+
+    @callback
+    def _async_save_wrap_state() -> None:
+        nonlocal wrap_state
+        if not (coordinator.last_update_success and coordinator.appliances_refreshed):
+            return
+        current = coordinator.smart_meter_wrap_state()
+        if current != wrap_state:
+            wrap_state = current
+            wrap_store.async_delay_save(lambda: current, WRAP_SAVE_DELAY)
+
+    entry.async_on_unload(coordinator.async_add_listener(_async_save_wrap_state))
+    _async_save_wrap_state()
+
+    saved_usage = usage
+
+    @callback
+    def _async_save_usage() -> None:
+        nonlocal saved_usage
+        current = coordinator.polling.usage()
+        if current is not None and current != saved_usage:
+            saved_usage = current
+            usage_store.async_delay_save(lambda: current, USAGE_SAVE_DELAY)
+
+    entry.async_on_unload(coordinator.async_add_listener(_async_save_usage))
+    _async_save_usage()
+
     # coordinator, apiをhassのデータ管理下に置く / Store coordinator, api in hass data for access in platforms
     hass.data[DOMAIN][entry.entry_id] = {
         "coordinator": coordinator,
         "api": api,
+        "publisher": SnapshotPublisher(entry.entry_id, coordinator),
     }
 
-    # カスタムサービスの登録
+    # ダッシュボード向けのスナップショット取得・差分購読のWebSocketコマンド（1回だけ登録）
+    # Websocket commands for dashboards to fetch the snapshot or subscribe to diffs (registered once)
+    if DATA_WEBSOCKET not in hass.data:
+        async_register_commands(hass)
+        hass.data[DATA_WEBSOCKET] = True
+
+    # サービスは全エントリーで共有し、1回だけ登録する / Services are shared by every entry and registered once
+    if not hass.services.has_service(DOMAIN, "profile"):
+        _async_register_services(hass)
+
+    # スマートメーターの積算値を長期統計へ直接書き込む
+    # Write smart-meter cumulative readings straight into long-term statistics
+    if "recorder" in hass.config.components:
+        importer = SmartMeterStatisticsImporter(hass)
+
+        @callback
+        def _async_import_statistics() -> None:
+            # 読み取り値は/appliancesを取得した時点のもの（デバイスだけの回は取り込まない）
+            # Readings date from the /appliances fetch; devices-only refreshes are skipped
+            if (
+                coordinator.last_update_success
+                and coordinator.appliances_refreshed
+                and coordinator.smart_meters
+            ):
+                importer.async_schedule(
+                    coordinator.smart_meters, coordinator.last_fetched["/appliances"]
+                )
+
+        entry.async_on_unload(coordinator.async_add_listener(_async_import_statistics))
+        _async_import_statistics()
+
+    # オプション変更を再読み込みなしで反映する / Apply option changes without reloading
+    entry.async_on_unload(entry.add_update_listener(async_options_updated))
+    entry.async_on_unload(lambda: coordinator.async_set_presence_entity(None))
+
+    # 赤外線マクロ：実行器は全エントリーで共有し、シグナルが変化したらコンパイル結果を破棄する
+    # IR macros: one executor for every entry; compiled plans are dropped when signals change
+    if DATA_MACROS not in hass.data:
+        hass.data[DATA_MACROS] = MacroExecutor(
+            hass, lambda entity_id: _find_remote(hass, entity_id)
+        )
+    macros: MacroExecutor = hass.data[DATA_MACROS]
+    entry.async_on_unload(
+        coordinator.async_add_listener(
+            lambda: macros.invalidate(coordinator.changed_signals)
+        )
+    )
+
+    # ハブモード：エンドポイントは1回だけ登録し、公開の可否はリクエスト毎にオプションで判定する
+    # Hub mode: register the endpoint once; whether an entry is served is checked per request
+    if "http" in hass.config.components and DATA_HUB not in hass.data:
+        hass.data[DATA_HUB] = NatureRemoHubView(hass)
+        hass.http.register_view(hass.data[DATA_HUB])
+
+    # エンティティが作られ、全エンティティが無効化されていないプラットフォームだけを起動し、
+    # 以降のリフレッシュではそれらが使う構造だけを作る
+    # Forward only platforms that get entities and aren't entirely disabled; later
+    # refreshes then build just the structures those platforms use
+    disabled = _disabled_platforms(hass, entry)
+    platforms = [
+        platform
+        for platform in PLATFORMS
+        if platform in coordinator.available_platforms and platform not in disabled
+    ]
+    coordinator.async_set_platforms(platforms)
+    hass.data[DOMAIN][entry.entry_id]["platforms"] = platforms
+    await hass.config_entries.async_forward_entry_setups(entry, platforms)
+
+    # 新しい種類の家電が現れたら、そのプラットフォームを含めて読み込み直す
+    # Reload to pick up the platform when a new kind of appliance appears
+    @callback
+    def _async_check_new_platforms() -> None:
+        new = coordinator.available_platforms - set(platforms) - disabled
+        if new:
+            _LOGGER.info("New Nature Remo platforms %s, reloading", sorted(new))
+            hass.config_entries.async_schedule_reload(entry.entry_id)
+
+    entry.async_on_unload(coordinator.async_add_listener(_async_check_new_platforms))
+
+    # クラウドに届くようになったら（再起動後の最初のリフレッシュを含む）ジャーナルを再送する
+    # Replay the journal once the cloud answers again, including the first refresh after a restart
+    @callback
+    def _async_replay_journal() -> None:
+        if coordinator.last_update_success and len(api.journal):
+            hass.async_create_task(api.journal.async_replay(api.replay_command))
+
+    entry.async_on_unload(coordinator.async_add_listener(_async_replay_journal))
+    _async_replay_journal()
+
+    return True
+
+
+# 登録するサービス（全エントリーで共有） / Services registered for every entry together
+SERVICES = (
+    "send_light_mode",
+    "profile",
+    "snapshot",
+    "restore",
+    "define_macro",
+    "delete_macro",
+    "run_macro",
+    "cancel_macro",
+    "learn_signal",
+)
+
+
+@callback
+def _async_register_services(hass: HomeAssistant) -> None:
+    """
+    サービスを登録する（最初のエントリーで1回だけ）.
+    共有の状態はhass.dataから呼び出し時に取得する.
+
+    Register the services once, for the first entry. Shared state is looked
+    up in hass.data when a service is called.
+    """
+
     async def handle_send_light_mode(call: ServiceCall):
         # サービスコールからエンティティIDと動作モードを取得する
         entity_id = call.data.get("entity_id")
         mode = call.data.get("mode", "on")
 
-        # entity_idからappliance_idを取り出す
-        _LOGGER.debug(f"coordinator.entity_map：{coordinator.entity_map}")
-        light_entity = coordinator.entity_map.get(entity_id)
-        if light_entity is None:
-            raise ValueError(f"{entity_id} not found in coordinator.entity_map")
+        # 全エントリーのエンティティ索引からライトを探す / Look the light up in every entry's index
+        light_entity = _find_entity(hass, entity_id)
+        if not isinstance(light_entity, NatureRemoLight):
+            raise ValueError(f"{entity_id} is not a Nature Remo light")
+
+        await light_entity.async_send_mode(mode)
+
+        return {"status": "success", "appliance_id": light_entity.appliance_id}
+
+    hass.services.async_register(
+        DOMAIN, "send_light_mode", handle_send_light_mode, supports_response=True
+    )
+
+    # プロファイルサービス：次のN回のリフレッシュ/コマンドを計測する
+    # Profile service: measure the next N refreshes or commands
+    # （全エントリーのリフレッシュ/コマンドを合わせて数える）
+    # (refreshes and commands of every entry count together)
+    async def handle_profile(call: ServiceCall):
+        hass.data[DATA_PROFILER].start(int(call.data.get("count", 3)))
+
+    hass.services.async_register(DOMAIN, "profile", handle_profile)
 
-        if mode not in light_entity._supported_effects:
-            raise ValueError(f"Effect '{mode}' is not supported by this light")
+    # シーンの保存と差分復元：全エントリーの家電状態をまとめて扱う
+    # Scene snapshot and diff-minimal restore across every entry's appliances
+    scene_store = Store(hass, SCENE_STORAGE_VERSION, SCENE_STORAGE_KEY)
 
-        # NatureRemo APIへリクエスト送信
-        await api.send_light_command(light_entity._appliance_id, mode)
+    async def handle_snapshot(call: ServiceCall):
+        name = call.data.get("name", "default")
+        scenes = await scene_store.async_load() or {}
+        states = {}
+        for entry_data in hass.data[DOMAIN].values():
+            states.update(capture_state(entry_data["coordinator"]))
+        scenes[name] = states
+        await scene_store.async_save(scenes)
+        _LOGGER.info("Saved Nature Remo scene %s (%d appliances)", name, len(states))
+        return {"name": name, "appliances": len(states)}
 
-        # エンティティの内部状態を即時更新
-        light_entity._last_mode = mode
-        light_entity._is_on = mode != "off"
-        light_entity.async_write_ha_state()
+    async def handle_restore(call: ServiceCall):
+        name = call.data.get("name", "default")
+        scenes = await scene_store.async_load() or {}
+        if name not in scenes:
+            raise ValueError(f"Nature Remo scene '{name}' has not been saved")
 
-        return {"status": "success", "appliance_id": light_entity._appliance_id}
+        plans = []
+        unchanged = []
+        for entry_data in hass.data[DOMAIN].values():
+            coordinator = entry_data["coordinator"]
+            commands, matched = plan_restore(coordinator, scenes[name])
+            unchanged.extend(matched)
+            if commands:
+                plans.append((coordinator, commands))
+
+        # Remoデバイス単位で並列に送信し、変化した家電のみ1回ずつ送る
+        # Send in parallel per Remo device, once per changed appliance
+        results = await asyncio.gather(
+            *(execute_plan(commands) for _, commands in plans)
+        )
+        sent = [appliance_id for ok, _, _ in results for appliance_id in ok]
+        # ジャーナルに記録され、クラウドの回復後に再送される家電
+        # Appliances journaled for replay once the cloud is back
+        queued = [appliance_id for _, later, _ in results for appliance_id in later]
+        failed = [appliance_id for _, _, ng in results for appliance_id in ng]
+        for coordinator, _ in plans:
+            await coordinator.async_request_refresh()
+
+        _LOGGER.info(
+            "Restored Nature Remo scene %s: %d sent, %d queued, %d unchanged, %d failed",
+            name,
+            len(sent),
+            len(queued),
+            len(unchanged),
+            len(failed),
+        )
+        return {
+            "sent": sent,
+            "queued": queued,
+            "unchanged": unchanged,
+            "failed": failed,
+        }
 
     hass.services.async_register(
-        DOMAIN, "send_light_mode", handle_send_light_mode, supports_response=True
+        DOMAIN, "snapshot", handle_snapshot, supports_response=SupportsResponse.OPTIONAL
+    )
+    hass.services.async_register(
+        DOMAIN, "restore", handle_restore, supports_response=SupportsResponse.OPTIONAL
     )
 
-    # プラットフォームを起動 / Forward entry setup to the platform
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    # 赤外線マクロ（実行器は全エントリーで共有） / IR macros, run by the executor every entry shares
+    async def handle_define_macro(call: ServiceCall):
+        plan = await hass.data[DATA_MACROS].async_define(
+            call.data["name"], list(call.data["steps"])
+        )
+        return {"name": plan.name, "signals": len(plan.signals)}
 
-    return True
+    async def handle_delete_macro(call: ServiceCall):
+        await hass.data[DATA_MACROS].async_delete(call.data["name"])
+
+    async def handle_run_macro(call: ServiceCall):
+        await hass.data[DATA_MACROS].async_run(call.data["name"])
+
+    async def handle_cancel_macro(call: ServiceCall):
+        hass.data[DATA_MACROS].cancel(call.data["name"])
+
+    hass.services.async_register(
+        DOMAIN,
+        "define_macro",
+        handle_define_macro,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(DOMAIN, "delete_macro", handle_delete_macro)
+    hass.services.async_register(DOMAIN, "run_macro", handle_run_macro)
+    hass.services.async_register(DOMAIN, "cancel_macro", handle_cancel_macro)
+
+    # 生IRデータの学習：Remoが最後に受信した信号をリモコンのボタンに結び付ける
+    # IR learning: attach the signal a Remo last received to a remote's button
+    async def handle_learn_signal(call: ServiceCall):
+        entity_id = call.data["entity_id"]
+        command = call.data["command"]
+        remote = _find_remote(hass, entity_id)
+        if remote is None:
+            raise ValueError(f"{entity_id} is not a Nature Remo remote")
+        signal_id = remote.signal_id(command)
+        if signal_id is None:
+            raise ValueError(f"Unknown command {command!r} for {entity_id}")
+
+        remote_api = remote.coordinator.api
+        ir = await remote_api.get_local_message(remote.device_id)
+        if not ir or not ir.get("data"):
+            raise ValueError(f"{entity_id} has not received an IR signal to learn")
+        remote.coordinator.signal_library.async_set_ir_data(signal_id, ir)
+        return {"signal_id": signal_id, "length": len(ir["data"])}
+
+    hass.services.async_register(
+        DOMAIN,
+        "learn_signal",
+        handle_learn_signal,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+@callback
+def _async_remove_services(hass: HomeAssistant) -> None:
+    """最後のエントリーが外れたらサービスを削除する. / Remove the services once the last entry is gone."""
+    for service in SERVICES:
+        hass.services.async_remove(DOMAIN, service)
+
+
+def _disabled_platforms(hass: HomeAssistant, entry: ConfigEntry) -> set[str]:
+    """
+    登録済みのエンティティがすべて無効化されているプラットフォーム.
+    Platforms whose registered entities are all disabled.
+    """
+    enabled: dict[str, bool] = {}
+    for entity in er.async_entries_for_config_entry(er.async_get(hass), entry.entry_id):
+        # モーションのバイナリセンサーはsensorプラットフォームが作る
+        # The motion binary sensors are created by the sensor platform
+        domain = "sensor" if entity.domain == "binary_sensor" else entity.domain
+        enabled[domain] = enabled.get(domain, False) or entity.disabled_by is None
+    return {domain for domain, any_enabled in enabled.items() if not any_enabled}
+
+
+def _find_entity(hass: HomeAssistant, entity_id: str):
+    """
+    全エントリーのエンティティ索引からentity_idでエンティティを探す.
+    Find an entity by entity_id across every entry's entity index.
+    """
+    for entry_data in hass.data[DOMAIN].values():
+        entity = entry_data["coordinator"].entities.get(entity_id)
+        if entity is not None:
+            return entity
+    return None
+
+
+def _find_remote(hass: HomeAssistant, entity_id: str) -> NatureRemoRemoteEntity | None:
+    """
+    entity_idからNature Remoのリモートエンティティを探す.
+    Find a Nature Remo remote entity by entity_id.
+    """
+    entity = _find_entity(hass, entity_id)
+    return entity if isinstance(entity, NatureRemoRemoteEntity) else None
+
+
+def _apply_options(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    api: NatureRemoAPI,
+    coordinator: NatureRemoCoordinator,
+) -> None:
+    """
+    オプション設定を稼働中のAPIクライアントとコーディネーターへ反映する.
+    Apply the entry options to the running API client and coordinator.
+    """
+    options = entry.options
+
+    # オプションのキーはデバイスレジストリのIDなので、Nature RemoのデバイスIDへ変換する
+    # Option keys are device registry IDs; map them to Nature Remo device IDs
+    device_registry = dr.async_get(hass)
+    local_ips = {}
+    for device in dr.async_entries_for_config_entry(device_registry, entry.entry_id):
+        ip = options.get(device.id)
+        if not ip:
+            continue
+        for domain, remo_device_id in device.identifiers:
+            if domain == DOMAIN:
+                local_ips[remo_device_id] = ip
+
+    api.configure(
+        timeouts={
+            "/devices": options.get("timeout_devices", DEFAULT_TIMEOUT_DEVICES),
+            "/appliances": options.get(
+                "timeout_appliances", DEFAULT_TIMEOUT_APPLIANCES
+            ),
+            "command": options.get("timeout_commands", DEFAULT_TIMEOUT_COMMANDS),
+        },
+        hedge=options.get("hedge_requests", False),
+        local_ips=local_ips,
+        # ハブのURLが設定されていればクラウドの代わりにハブへ接続する
+        # Talk to the hub instead of the cloud when a hub URL is set
+        hub_url=options.get("hub_url", ""),
+        hub_token=options.get("hub_token", ""),
+    )
+    # 通信記録（カセット）の開始・停止 / Start or stop cassette recording
+    if options.get("record_cassette", False):
+        if api.recorder is None:
+            path = hass.config.path(f"nature_remo_cassette_{entry.entry_id}.jsonl.gz")
+            _LOGGER.info("Recording Nature Remo API traffic to %s", path)
+            api.recorder = CassetteRecorder(path, salt=entry.entry_id)
+    elif api.recorder is not None:
+        hass.async_add_executor_job(api.recorder.close)
+        api.recorder = None
+
+    api.journal.configure(
+        options.get("command_journal", False),
+        options.get("journal_ttl", DEFAULT_JOURNAL_TTL),
+    )
+    coordinator.sensor_options = options
+    # 時間帯・在宅状態によるポーリング設定 / Time-of-day and presence polling profiles
+    coordinator.polling.configure(options)
+    coordinator.async_set_presence_entity(options.get("presence_entity"))
+    coordinator.async_update_polling()
+
+
+async def async_options_updated(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """
+    オプション変更時に呼ばれ、エンティティを作り直さずに設定を反映する.
+    Called when options change; applies them without recreating entities.
+    """
+    data = hass.data[DOMAIN].get(entry.entry_id)
+    if data is None:
+        return
+    _LOGGER.debug("Applying updated Nature Remo options")
+    _apply_options(hass, entry, data["api"], data["coordinator"])
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -80,7 +532,22 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     Called when a config entry is unloaded.
     Cleans up Nature Remo-related data and platform entries.
     """
-    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    platforms = hass.data[DOMAIN][entry.entry_id]["platforms"]
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, platforms)
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        data = hass.data[DOMAIN].pop(entry.entry_id)
+        data["publisher"].async_shutdown()
+        # 古いAPIクライアントを使い続けないよう、このエントリーのマクロ計画を破棄する
+        # Drop this entry's macro plans so they don't keep using the old API client
+        if DATA_MACROS in hass.data:
+            hass.data[DATA_MACROS].async_forget_api(data["api"])
+        if data["api"].recorder is not None:
+            await hass.async_add_executor_job(data["api"].recorder.close)
+        # 最後のエントリーが外れたら実行中のマクロを止める / Stop running macros once the last entry is gone
+        if not hass.data[DOMAIN] and DATA_MACROS in hass.data:
+            hass.data.pop(DATA_MACROS).cancel_all()
+        if not hass.data[DOMAIN]:
+            _async_remove_services(hass)
+            hass.data.pop(DATA_SCHEDULER, None)
+            hass.data.pop(DATA_PROFILER).stop()
     return unload_ok
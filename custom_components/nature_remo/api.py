@@ -1,11 +1,129 @@
+import asyncio
+import json
 import logging
+import time
 import aiohttp
 
+from collections.abc import Callable
+from contextlib import nullcontext
+from dataclasses import dataclass
 from datetime import datetime
+from typing import TYPE_CHECKING
+
+from .const import (
+    DEFAULT_TIMEOUT_APPLIANCES,
+    DEFAULT_TIMEOUT_COMMANDS,
+    DEFAULT_TIMEOUT_DEVICES,
+)
+from .echonet import SmartMeterDecoder
+from .metrics import LatencyHistogram
+
+if TYPE_CHECKING:
+    from .cassette import CassetteRecorder
+    from .journal import CommandJournal
+    from .profiler import NatureRemoProfiler
+    from .signal_library import SignalLibrary
 
 _LOGGER = logging.getLogger(__name__)
 NATURE_REMO_URL = "https://api.nature.global/1"
 
+# 処理前に断られたとみなして再送するステータス（502・504は上流に届いた可能性があるので含めない）
+# Statuses treated as refused before processing and retried. 502 and 504 are
+# left out because the request may already have reached the upstream.
+RETRY_STATUSES = frozenset({503})
+# 一時的な失敗で、後で再送する価値のあるステータス / Transient statuses worth replaying later
+TRANSIENT_STATUSES = frozenset({429, 502, 503, 504})
+# 処理されていないことが確実なステータス / Statuses where the request was certainly not processed
+UNPROCESSED_STATUSES = frozenset({429, 503})
+
+
+def is_replayable(kind: str, status: int) -> bool:
+    """
+    失敗したコマンドを後で再送してよいか.
+    シグナルはトグルのことが多いので、処理されていないことが確実な場合だけ再送する.
+
+    Whether a failed command may be replayed later. Signals are often toggles,
+    so they are only replayed when the request was certainly not processed.
+    """
+    if kind == "signal":
+        return status in UNPROCESSED_STATUSES
+    return status in TRANSIENT_STATUSES
+
+
+COMMAND_RETRIES = 2
+RETRY_BACKOFF = 0.5
+
+# 同じGETの結果を使い回す期間（秒） / Window in which an identical GET reuses the last result (seconds)
+READ_FRESHNESS = 2.0
+
+# エアコン設定のパラメーター名 → 応答のキー / Aircon setting parameter → response key
+AIRCON_RESPONSE_KEYS = {
+    "operation_mode": "mode",
+    "temperature": "temp",
+    "air_volume": "vol",
+    "air_direction": "dir",
+    "button": "button",
+}
+
+
+@dataclass
+class ApiResponse:
+    """
+    Nature Remo APIのレスポンス（ステータス、ヘッダ、本文）.
+    A Nature Remo API response: status, headers and body.
+    """
+
+    status: int
+    headers: dict[str, str]
+    text: str
+    request_info: aiohttp.RequestInfo | None = None
+
+    @property
+    def json(self):
+        """本文をJSONとしてパースする（本文が空ならNone）. / Parse the body as JSON (None if empty)."""
+        return json.loads(self.text) if self.text else None
+
+    def raise_for_status(self) -> None:
+        """
+        エラーステータスの場合にClientResponseErrorを送出する.
+        Raise ClientResponseError for an error status.
+        """
+        if self.status < 400:
+            return
+        if self.request_info is None:
+            # 再生（replay）時など実リクエストがない場合 / No real request, e.g. during replay
+            raise aiohttp.ClientError(f"{self.status}: {self.text}")
+        raise aiohttp.ClientResponseError(
+            self.request_info, (), status=self.status, message=self.text
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class CommandResult:
+    """
+    1回のコマンド送信の結果（完了イベントとして通知する）.
+    Outcome of one command send, reported as a completion event.
+    """
+
+    kind: str  # "aircon" / "light" / "signal"
+    target: str  # 家電IDまたはシグナルID / Appliance ID or signal ID
+    success: bool
+    status: int | None  # 通信エラー時はNone / None on a transport error
+    latency: float  # 最初の送信から最終応答までの秒数 / Seconds from first attempt to final response
+    retries: int
+    transport: str  # "cloud" / "local"
+
+
+class QueuedCommand(dict):
+    """
+    ジャーナルに記録され、まだ届いていないコマンドの結果（エアコンは送った設定を持つ）.
+    送信済みと区別するにはisinstanceで判定する.
+
+    Result of a command that was journaled and has not landed yet; for air
+    conditioners it holds the requested settings. Tell it apart from a
+    delivered command with isinstance.
+    """
+
 
 class NatureRemoAPI:
     """
@@ -13,44 +131,364 @@ class NatureRemoAPI:
     Class to handle Nature Remo API communication.
     """
 
-    def __init__(self, token) -> None:
+    def __init__(
+        self,
+        token,
+        timeouts: dict[str, float] | None = None,
+        hedge: bool = False,
+    ) -> None:
         """
         Nature Remo APIの初期化.
         Initialize the Nature Remo API.
+
+        timeouts: エンドポイント毎のタイムアウト（"/devices", "/appliances", "command"）
+                  Per-endpoint deadlines keyed by "/devices", "/appliances" and "command".
+        hedge: GETリクエストのヘッジ送信を有効にする / Enable hedged GET requests.
         """
         self._token = token
+        # 接続先（ハブ利用時はハブのURLとハブのトークン） / Target; the hub's URL and token when using a hub
+        self.base_url = NATURE_REMO_URL
+        self._auth_token = token
+        self.timeouts = {
+            "/devices": DEFAULT_TIMEOUT_DEVICES,
+            "/appliances": DEFAULT_TIMEOUT_APPLIANCES,
+            "command": DEFAULT_TIMEOUT_COMMANDS,
+        }
+        self.hedge = hedge
+        # Nature RemoデバイスID → ローカルIPアドレス / Nature Remo device ID → local IP address
+        self.local_ips: dict[str, str] = {}
+        # 通信記録（カセット）の書き込み先、Noneなら記録しない
+        # Cassette recorder for request/response pairs; None disables recording
+        self.recorder: CassetteRecorder | None = None
+        # コーディネーターから設定されるプロファイラー / Profiler, set by the coordinator
+        self.profiler: NatureRemoProfiler | None = None
+        # 学習済みの生IRデータを持つシグナルライブラリ（ローカル送信に使う）
+        # Signal library with learned raw IR data, used for local sends
+        self.signal_library: SignalLibrary | None = None
+        # コマンド完了の通知先 / Receiver of command completion results
+        self.command_listener: Callable[[CommandResult], None] | None = None
+        # 届かなかったコマンドを再送するジャーナル / Journal that replays commands that did not land
+        self.journal: CommandJournal | None = None
+        self.configure(timeouts=timeouts)
+
+        # エンドポイント毎のレイテンシ / Per-endpoint latency histograms
+        self.latency: dict[str, LatencyHistogram] = {}
+        # ヘッジ送信の統計（追加で消費したクォータを含む）
+        # Hedging statistics, including the extra quota consumed
+        self.hedged_requests = 0
+        self.hedge_wins = 0
+        # クラウド（またはハブ）へ送った累計リクエスト数 / Running count of requests sent to the cloud or hub
+        self.request_count = 0
+        # パス毎の実行中のGETと、直近の結果（取得時刻, 結果）
+        # In-flight GET per path, and the latest result as (fetched at, result)
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._fresh: dict[str, tuple[float, object]] = {}
+        # 実行中・直近の結果を共有して省いたGETの数 / GETs saved by sharing an in-flight or fresh result
+        self.shared_reads = 0
+
+    def configure(
+        self,
+        timeouts: dict[str, float] | None = None,
+        hedge: bool | None = None,
+        local_ips: dict[str, str] | None = None,
+        hub_url: str | None = None,
+        hub_token: str | None = None,
+    ) -> None:
+        """
+        稼働中のクライアント設定を更新する（再読み込み不要）.
+        次のリクエストから新しい設定が使われる.
+
+        Update the running client's settings without a reload.
+        New settings take effect from the next request.
+
+        hub_url: ハブのURL（空ならクラウドへ直接接続） / Hub base URL; empty connects to the cloud directly.
+        hub_token: 接続先ハブへ送るトークン / Token sent to the hub at hub_url.
+        """
+        if timeouts:
+            self.timeouts.update(timeouts)
+        if hedge is not None:
+            self.hedge = hedge
+        if local_ips is not None:
+            self.local_ips = {k: v for k, v in local_ips.items() if v}
+        if hub_url is not None:
+            # 接続先が変わるので直近の結果は使わない / The target may change, so drop recent results
+            self._fresh.clear()
+            if hub_url:
+                self.base_url = hub_url.rstrip("/")
+                self._auth_token = hub_token or ""
+            else:
+                self.base_url = NATURE_REMO_URL
+                self._auth_token = self._token
+
+    def _stage(self, name: str):
+        """
+        プロファイル中ならステージ計測用のコンテキストマネージャを返す.
+        Return a stage-timing context manager while profiling.
+        """
+        if self.profiler is None:
+            return nullcontext()
+        return self.profiler.stage(name)
+
+    def _timeout(self, key: str) -> aiohttp.ClientTimeout:
+        """
+        エンドポイントに対応するタイムアウトを返す.
+        Return the client timeout configured for an endpoint.
+        """
+        total = self.timeouts.get(key, self.timeouts["command"])
+        return aiohttp.ClientTimeout(total=total)
 
     async def _get(self, path: str):
+        """
+        同じパスへの同時のGETを1つにまとめ、READ_FRESHNESS秒以内の結果は再利用する.
+        結果は呼び出し元の間で共有されるので、変更してはならない.
+
+        Collapse concurrent GETs for the same path into one request, and reuse a
+        result younger than READ_FRESHNESS seconds. The result is shared between
+        callers, so it must not be mutated.
+        """
+        fresh = self._fresh.get(path)
+        if fresh is not None and time.monotonic() - fresh[0] < READ_FRESHNESS:
+            self.shared_reads += 1
+            return fresh[1]
+
+        task = self._inflight.get(path)
+        if task is None:
+            task = self._inflight[path] = asyncio.ensure_future(self._get_once(path))
+            task.add_done_callback(lambda done: self._read_done(path, done))
+        else:
+            self.shared_reads += 1
+            _LOGGER.debug("Sharing in-flight GET %s", path)
+        # 1人の呼び出し元が中断しても共有中のリクエストは止めない
+        # One caller being cancelled must not cancel the shared request
+        return await asyncio.shield(task)
+
+    def _read_done(self, path: str, task: asyncio.Future) -> None:
+        """共有中のGETの後始末と結果の記録. / Clean up a shared GET and remember its result."""
+        if self._inflight.get(path) is task:
+            del self._inflight[path]
+        if task.cancelled():
+            return
+        # 待つ呼び出し元がいなくても例外を取り出しておく / Retrieve the exception even if nobody awaits it
+        if task.exception() is None and task.result() is not None:
+            self._fresh[path] = (time.monotonic(), task.result())
+
+    async def _get_once(self, path: str):
         """
         Nature RemoのAPI GETリクエスト用の内部メソッド.
+        ヘッジ有効時、p95レイテンシまでに応答がなければ2本目のリクエストを送り、先に返った方を使う.
+
         Internal method to perform GET requests to the Nature Remo API.
+        With hedging enabled, a second request is sent if the first has not answered
+        by the endpoint's p95 latency, and whichever finishes first is used.
         """
-        headers = {"Authorization": f"Bearer {self._token}"}
-        url = f"{NATURE_REMO_URL}{path}"
-        async with (
-            aiohttp.ClientSession() as session,
-            session.get(url, headers=headers) as response,
-        ):
-            if response.status == 429:
-                _LOGGER.warning("API制限に達しました! 429 Too Many Requests.")
-
-            # レート制限系のヘッダを取得・ログ出力
-            rate_limit = response.headers.get("X-Rate-Limit-Limit")
-            rate_remaining = response.headers.get("X-Rate-Limit-Remaining")
-            rate_reset = response.headers.get("X-Rate-Limit-Reset")
-            # rate_resetを読める時間に変換する
-            reset_time = datetime.fromtimestamp(int(rate_reset))
-
-            # デバッグログにリクエスト情報を出力する
-            _LOGGER.debug(
-                f"NatureRemo RateLimit → Limit: {rate_limit}, Remaining: {rate_remaining}, Reset: {reset_time}"
+        histogram = self.latency.setdefault(path, LatencyHistogram())
+        # 十分なサンプルが集まるまではヘッジしない / Don't hedge until enough samples exist
+        hedge_delay = histogram.percentile(0.95, min_samples=20) if self.hedge else None
+        start = time.monotonic()
+
+        first = asyncio.ensure_future(self._fetch(path))
+        if hedge_delay is None:
+            result = await first
+            histogram.observe(time.monotonic() - start)
+            return result
+
+        done, _ = await asyncio.wait({first}, timeout=hedge_delay)
+        if done:
+            result = first.result()
+            histogram.observe(time.monotonic() - start)
+            return result
+
+        _LOGGER.debug("Hedging GET %s after %.2fs", path, hedge_delay)
+        self.hedged_requests += 1
+        second = asyncio.ensure_future(self._fetch(path))
+        pending = {first, second}
+        error: BaseException | None = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is not None:
+                        error = task.exception()
+                        continue
+                    if task is second:
+                        self.hedge_wins += 1
+                    histogram.observe(time.monotonic() - start, hedged=True)
+                    return task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+        raise error
+
+    async def _fetch(self, path: str):
+        """
+        GETリクエストを1回実行する.
+        Perform a single GET request.
+        """
+        response = await self._request("GET", path, path)
+        if response.status == 200:
+            with self._stage("api.json_decode"):
+                return response.json
+
+        _LOGGER.error("Failed to fetch request: %s", response.status)
+        return None
+
+    async def _request(
+        self, method: str, path: str, timeout_key: str, data=None
+    ) -> ApiResponse:
+        """
+        Nature Remo APIへのHTTPリクエストを1回実行する（すべての通信はここを通る）.
+        Perform a single HTTP request to the Nature Remo API; all traffic goes through here.
+        """
+        headers = {"Authorization": f"Bearer {self._auth_token}"}
+        url = f"{self.base_url}{path}"
+        self.request_count += 1
+        start = time.monotonic()
+        with self._stage("api.io"):
+            async with (
+                aiohttp.ClientSession(timeout=self._timeout(timeout_key)) as session,
+                session.request(method, url, headers=headers, data=data) as response,
+            ):
+                text = await response.text()
+                result = ApiResponse(
+                    status=response.status,
+                    headers=dict(response.headers),
+                    text=text,
+                    request_info=response.request_info,
+                )
+        elapsed = time.monotonic() - start
+
+        if result.status == 429:
+            _LOGGER.warning("API制限に達しました! 429 Too Many Requests.")
+        self._log_rate_limit(result.headers)
+
+        if self.recorder is not None:
+            self.recorder.record(method, path, data, result, elapsed, headers)
+        # コマンド送信もプロファイル対象の1回として数える / Commands count toward the profiling window
+        if method != "GET" and self.profiler is not None:
+            self.profiler.tick()
+        return result
+
+    async def forward(self, method: str, path: str, data=None) -> ApiResponse:
+        """
+        ハブ経由のコマンドをそのまま転送する.
+        Forward a command received by the hub as-is.
+        """
+        response = await self._request(method, path, "command", data)
+        if response.status == 200:
+            # 操作後の状態を読み直せるよう、直近のGETの結果は使い回さない
+            # Don't reuse recent GET results, so the state after the command can be read back
+            self._fresh.clear()
+        return response
+
+    async def _send_command(
+        self, kind: str, target: str, path: str, data=None, journal: bool = True
+    ) -> ApiResponse | None:
+        """
+        コマンドを送信し、届いていないことが確実な失敗のみ再送して、結果を通知する.
+        ジャーナルが有効なら、届かなかったコマンドを記録してNoneを返す.
+
+        Send a command, retrying only failures where it certainly did not land,
+        and report the outcome. With the journal enabled, a command that did not
+        land is recorded and None is returned.
+        """
+        start = time.monotonic()
+        retries = 0
+        try:
+            while True:
+                try:
+                    response = await self._request("POST", path, "command", data)
+                except aiohttp.ClientConnectorError:
+                    # 接続できていないので送信されていない / Never connected, so nothing was sent
+                    if retries >= COMMAND_RETRIES:
+                        raise
+                else:
+                    # シグナルは二重送信を避けるため、応答のステータスでは再送しない
+                    # Signals are never retried on a response status, to avoid sending twice
+                    if (
+                        kind == "signal"
+                        or response.status not in RETRY_STATUSES
+                        or retries >= COMMAND_RETRIES
+                    ):
+                        break
+                retries += 1
+                await asyncio.sleep(RETRY_BACKOFF * retries)
+        except (aiohttp.ClientError, TimeoutError) as err:
+            self._notify_command(
+                CommandResult(
+                    kind, target, False, None, time.monotonic() - start, retries, "cloud"
+                )
             )
+            # シグナルは二重送信を避けるため、接続できなかった（確実に届いていない）時だけ記録する
+            # Signals are only journaled when we never connected, to avoid sending one twice
+            delivered_unknown = not isinstance(err, aiohttp.ClientConnectorError)
+            if (
+                journal
+                and not (kind == "signal" and delivered_unknown)
+                and self._journal_command(kind, target, path, data)
+            ):
+                return None
+            raise
 
-            if response.status == 200:
-                return await response.json()
+        latency = time.monotonic() - start
+        success = response.status == 200
+        if success:
+            # 操作後の状態を読み直せるよう、直近のGETの結果は使い回さない
+            # Don't reuse recent GET results, so the state after the command can be read back
+            self._fresh.clear()
+        self._notify_command(
+            CommandResult(
+                kind, target, success, response.status, latency, retries, "cloud"
+            )
+        )
+        if journal and self.journal is not None:
+            if success:
+                # 届いたコマンドより古い意図は再送しない / Never replay intents older than a delivered command
+                self.journal.async_resolve(kind, target, data)
+            elif is_replayable(kind, response.status) and self._journal_command(
+                kind, target, path, data
+            ):
+                return None
+        return response
 
-            _LOGGER.error("Failed to fetch request: %s", response.status)
-            return None
+    def _journal_command(self, kind: str, target: str, path: str, data) -> bool:
+        """ジャーナルが有効なら記録する. / Record the command when the journal is enabled."""
+        if self.journal is None or not self.journal.async_record(kind, target, path, data):
+            return False
+        _LOGGER.warning("Nature Remo cloud unreachable, queued %s %s for replay", kind, target)
+        return True
+
+    async def replay_command(self, kind: str, target: str, path: str, data=None) -> int:
+        """
+        ジャーナルから再送する（再送の失敗は記録し直さない）. HTTPステータスを返す.
+        Replay a command from the journal without journaling it again; returns the HTTP status.
+        """
+        response = await self._send_command(kind, target, path, data, journal=False)
+        return response.status
+
+    def _notify_command(self, result: CommandResult) -> None:
+        """コマンドの結果を通知先へ渡す. / Hand a command result to the listener."""
+        if self.command_listener is not None:
+            self.command_listener(result)
+
+    @staticmethod
+    def _log_rate_limit(headers) -> None:
+        """
+        レート制限系のヘッダをデバッグログに出力する.
+        Log the rate limit headers at debug level.
+        """
+        if not _LOGGER.isEnabledFor(logging.DEBUG):
+            return
+        rate_reset = headers.get("X-Rate-Limit-Reset")
+        # rate_resetを読める時間に変換する
+        reset_time = datetime.fromtimestamp(int(rate_reset)) if rate_reset else None
+        _LOGGER.debug(
+            "NatureRemo RateLimit → Limit: %s, Remaining: %s, Reset: %s",
+            headers.get("X-Rate-Limit-Limit"),
+            headers.get("X-Rate-Limit-Remaining"),
+            reset_time,
+        )
 
     async def get_appliances(self):
         """
@@ -66,151 +504,180 @@ class NatureRemoAPI:
         """
         return await self._get("/devices")
 
-    async def send_command_climate(self, payload, appliance_id):
+    async def send_command_climate(
+        self, payload, appliance_id, raise_on_error: bool = False
+    ):
         """
         Nature Remo APIを使ってエアコンを操作.
         Control the air conditioner using the Nature Remo API.
+
+        raise_on_error: 失敗したステータスでエラー応答を返さずに送出する
+                        Raise on an error status instead of returning the error response.
         """
-        _LOGGER.info("Setting payload: %s", payload)
-        headers = {"Authorization": f"Bearer {self._token}"}
-        api_url = f"{NATURE_REMO_URL}/appliances/{appliance_id}/aircon_settings"
-
-        async with (
-            aiohttp.ClientSession() as session,
-            session.post(api_url, headers=headers, data=payload) as response,
-        ):
-            # レート制限系のヘッダを取得・ログ出力
-            rate_limit = response.headers.get("X-Rate-Limit-Limit")
-            rate_remaining = response.headers.get("X-Rate-Limit-Remaining")
-            rate_reset = datetime.fromtimestamp(
-                int(response.headers.get("X-Rate-Limit-Reset"))
+        _LOGGER.debug("Setting payload: %s", payload)
+        response = await self._send_command(
+            "aircon", appliance_id, f"/appliances/{appliance_id}/aircon_settings", payload
+        )
+        if response is None:
+            # ジャーナルに記録した場合は送った設定を応答の代わりに返す
+            # When journaled, echo the requested settings in place of a response
+            return QueuedCommand(
+                {
+                    AIRCON_RESPONSE_KEYS[key]: value
+                    for key, value in payload.items()
+                    if key in AIRCON_RESPONSE_KEYS
+                }
             )
 
-            # デバッグログにリクエスト情報を出力
-            _LOGGER.debug(
-                f"NatureRemo RateLimit → Limit: {rate_limit}, Remaining: {rate_remaining}, Reset: {rate_reset}"
+        with self._stage("api.json_decode"):
+            response_json = response.json
+        if response.status == 200:
+            _LOGGER.info(
+                "エアコンの操作に成功しました: %s",
+                response_json,
             )
+        else:
+            _LOGGER.error(
+                "エアコンの操作に失敗しました: %s",
+                response.text,
+            )
+            if raise_on_error:
+                response.raise_for_status()
+        return response_json
 
-            response_json = await response.json()
-            if response.status == 200:
-                _LOGGER.info(
-                    "エアコンの操作に成功しました: %s",
-                    response_json,
-                )
-            else:
-                _LOGGER.error(
-                    "エアコンの操作に失敗しました: %s",
-                    await response.text(),
-                )
-            return response_json
-
-    async def send_light_command(self, appliance_id: str, command: str):
+    async def send_light_command(
+        self, appliance_id: str, command: str, raise_on_error: bool = False
+    ):
         """
         Nature Remo LightのON/OFFを送信.
         Send ON/OFF commands to Nature Remo Light.
-        """
-        _LOGGER.info(f"Send Light applicance_id:{appliance_id} command:{command}")
-        url = f"{NATURE_REMO_URL}/appliances/{appliance_id}/light"
 
-        headers = {"Authorization": f"Bearer {self._token}"}
+        raise_on_error: 失敗したステータスでエラー応答を返さずに送出する
+                        Raise on an error status instead of returning the error response.
+        """
+        _LOGGER.debug("Send Light appliance_id:%s command:%s", appliance_id, command)
         payload = {"button": command}
+        response = await self._send_command(
+            "light", appliance_id, f"/appliances/{appliance_id}/light", payload
+        )
+        if response is None:
+            return QueuedCommand()
 
-        async with (
-            aiohttp.ClientSession() as session,
-            session.post(url, headers=headers, data=payload) as response,
-        ):
-            # レート制限系のヘッダを取得・ログ出力！
-            rate_limit = response.headers.get("X-Rate-Limit-Limit")
-            rate_remaining = response.headers.get("X-Rate-Limit-Remaining")
-            rate_reset = datetime.fromtimestamp(
-                int(response.headers.get("X-Rate-Limit-Reset"))
-            )
+        with self._stage("api.json_decode"):
+            response_json = response.json
+        if response.status == 200:
+            _LOGGER.info("照明の操作に成功しました： %s", response_json)
+        else:
+            _LOGGER.error("Nature Remo API Error: %s - %s", response.status, response.text)
+            if raise_on_error:
+                response.raise_for_status()
+        return response_json
 
-            # デバッグログにリクエスト情報を出力
-            _LOGGER.debug(
-                f"NatureRemo RateLimit → Limit: {rate_limit}, Remaining: {rate_remaining}, Reset: {rate_reset}"
-            )
-
-            response_json = await response.json()
-            if response.status == 200:
-                _LOGGER.info("照明の操作に成功しました： %s", response_json)
-            else:
-                error_text = await response.text()
-                _LOGGER.error(
-                    f"Nature Remo API Error: {response.status} - {error_text}"
-                )
-            return response_json
-
-    def parse_smart_meter_properties(self, properties: list[dict]) -> dict:
+    def parse_smart_meter_properties(
+        self, properties: list[dict], decoder: SmartMeterDecoder | None = None
+    ) -> dict:
         """
         Nature Remo E / E Liteのechonetlite_propertiesを元に買電・売電・瞬時電力をパースして返却する.
+        積算値の周回補正を行うには、メーター毎のdecoderを渡す.
+
         Parse echonetlite_properties from Nature Remo E / E Lite to extract buy/sell power and instantaneous power.
+        Pass a per-meter decoder to get cumulative wraparound correction across polls.
         """
-        # 値が欠損している場合にも備え、各種初期値を定義
-        coefficient = 1
-        unit_power = 0
-        buy_power_raw = 0
-        sold_power_raw = 0
-        instant_power = 0
-
-        for prop in properties:
-            epc = int(prop.get("epc"))
-            val_str = prop.get("val", "0")
-            try:
-                val = int(val_str)
-            except ValueError:
-                val = 0
-
-            # epc（Echonet Lite Property）に応じて各値を格納
-            if epc == 211:  # 係数
-                coefficient = val
-            elif epc == 215:  # 有効桁数（今回は使用せず）
-                continue
-            elif epc == 224:  # 積算買電量
-                buy_power_raw = val
-            elif epc == 225:  # 単位（指数）
-                unit_power = val
-            elif epc == 227:  # 積算売電量
-                sold_power_raw = val
-            elif epc == 231:  # 瞬時電力（W）
-                instant_power = val
-
-        # 単位変換テーブルを定義
-        unit_table = {
-            0x00: 1,
-            0x01: 0.1,
-            0x02: 0.01,
-            0x03: 0.001,
-            0x04: 0.0001,
-            0x0A: 10,
-            0x0B: 100,
-            0x0C: 1000,
-            0x0D: 10000,
-        }
+        if decoder is None:
+            decoder = SmartMeterDecoder()
+        with self._stage("api.parse_smart_meter_properties"):
+            return decoder.decode(properties)
 
-        # 取得した値を変換
-        factor = coefficient * unit_table.get(unit_power, 1)
-        buy_power = buy_power_raw * factor
-        sold_power = sold_power_raw * factor
+    async def _local_request(self, ip: str, method: str, ir=None) -> ApiResponse:
+        """
+        Remo本体のローカルAPI（/messages）へリクエストを1回実行する.
+        Perform a single request against a Remo's local API (/messages).
+        """
+        headers = {"X-Requested-With": "local"}
+        with self._stage("api.local_io"):
+            async with (
+                aiohttp.ClientSession(timeout=self._timeout("command")) as session,
+                session.request(
+                    method, f"http://{ip}/messages", headers=headers, json=ir
+                ) as response,
+            ):
+                return ApiResponse(
+                    status=response.status,
+                    headers=dict(response.headers),
+                    text=await response.text(),
+                    request_info=response.request_info,
+                )
 
-        # センサー用データとして返却
-        return {
-            "buy_power": buy_power,
-            "sold_power": sold_power,
-            "instant_power": instant_power,
-        }
+    async def get_local_message(self, device_id: str):
+        """
+        Remoが最後に受信した生のIRデータをローカルAPIから取得する.
+        Fetch the raw IR data last received by a Remo from its local API.
+        """
+        ip = self.local_ips.get(device_id)
+        if not ip:
+            raise ValueError(f"No local IP address configured for device {device_id}")
+        response = await self._local_request(ip, "GET")
+        response.raise_for_status()
+        return response.json
+
+    async def _send_signal_local(self, signal_id: str) -> bool:
+        """
+        学習済みの生IRデータとローカルIPがあれば、クラウドを経由せずに送信する.
+        Send through the Remo's local API when raw IR data and a local IP are known.
+        """
+        if self.signal_library is None:
+            return False
+        ir = self.signal_library.ir_data(signal_id)
+        if ir is None:
+            return False
+        ip = self.local_ips.get(self.signal_library.get(signal_id)["device_id"])
+        if not ip:
+            return False
+        start = time.monotonic()
+        try:
+            response = await self._local_request(ip, "POST", ir)
+        except (aiohttp.ClientError, TimeoutError) as err:
+            _LOGGER.debug("Local send of %s failed, using the cloud: %s", signal_id, err)
+            return False
+        if response.status != 200:
+            _LOGGER.debug(
+                "Local send of %s returned %s, using the cloud", signal_id, response.status
+            )
+            return False
+        if self.profiler is not None:
+            self.profiler.tick()
+        self._notify_command(
+            CommandResult(
+                "signal", signal_id, True, 200, time.monotonic() - start, 0, "local"
+            )
+        )
+        if self.journal is not None:
+            self.journal.async_resolve("signal", signal_id, None)
+        return True
 
-    async def send_command_signal(self, signal_id: str) -> None:
+    async def send_command_signal(
+        self, signal_id: str, journal: bool = True
+    ) -> QueuedCommand | None:
         """
         指定されたシグナルIDを使ってNature Remo APIを送信する.
-        Send a signal by its ID using the Nature Remo API.
+        ジャーナルに記録した場合はQueuedCommandを返す.
+
+        Send a signal by its ID using the Nature Remo API. Returns a
+        QueuedCommand when the signal was journaled.
+
+        journal: Falseなら届かなかった場合に記録せず送出する（時間指定の連続送信など）
+                 When False, raise instead of journaling, e.g. for timed sequences.
         """
-        api_url = f"{NATURE_REMO_URL}/signals/{signal_id}/send"
-        headers = {"Authorization": f"Bearer {self._token}"}
+        # 学習済みのシグナルはローカルで送信し、失敗時のみクラウドを使う
+        # Learned signals go out locally; the cloud is only the fallback
+        if await self._send_signal_local(signal_id):
+            return None
 
-        async with aiohttp.ClientSession() as session:
-            async with session.post(api_url, headers=headers) as response:
-                if response.status != 200:
-                    text = await response.text()
-                    _LOGGER.error("Failed to send signal %s: %s", signal_id, text)
-                    response.raise_for_status()
+        response = await self._send_command(
+            "signal", signal_id, f"/signals/{signal_id}/send", journal=journal
+        )
+        if response is None:
+            return QueuedCommand()
+        if response.status != 200:
+            _LOGGER.error("Failed to send signal %s: %s", signal_id, response.text)
+            response.raise_for_status()
@@ -0,0 +1,238 @@
+import asyncio
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+import gzip
+import hashlib
+import json
+import logging
+import re
+import time
+import zlib
+
+from .api import ApiResponse, NatureRemoAPI
+
+_LOGGER = logging.getLogger(__name__)
+
+# Nature RemoのID（UUID）/ Nature Remo IDs (UUIDs)
+_UUID_RE = re.compile(
+    r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"
+)
+# 値を丸ごと伏せるキー / Keys whose values are always masked
+_SECRET_KEYS = frozenset(
+    {"mac_address", "bt_mac_address", "serial_number", "email", "token"}
+)
+# 値を伏せるリクエストヘッダ / Request headers whose values are masked
+_SECRET_HEADERS = frozenset({"Authorization"})
+# 記録するレスポンスヘッダ / Response headers kept in the cassette
+_KEPT_HEADERS = frozenset(
+    {"Content-Type", "X-Rate-Limit-Limit", "X-Rate-Limit-Remaining", "X-Rate-Limit-Reset"}
+)
+
+
+class CassetteRecorder:
+    """
+    リクエストとレスポンスの組を、トークンやIDを伏せたうえでgzip圧縮のJSONLへ書き出す.
+    IDはハッシュで置き換えるため、同じIDは常に同じ値になり、再生時の対応関係が保たれる.
+
+    Streams request/response pairs to gzip-compressed JSONL with tokens and IDs redacted.
+    IDs are replaced by a salted hash, so the same ID always maps to the same value
+    and cross references still line up on replay.
+    """
+
+    def __init__(self, path: str, salt: str = "") -> None:
+        """初期化. / Initialize the recorder."""
+        self.path = path
+        self._salt = salt
+        self._start = time.monotonic()
+        # 書き込み順を保つため1スレッドで書き込む / A single writer thread keeps lines in order
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        # 書き込みスレッドで最初の行の時に開き、close()まで開いたままにする
+        # Opened by the writer thread on the first line and kept open until close()
+        self._file: gzip.GzipFile | None = None
+
+    def _redact_id(self, match: re.Match) -> str:
+        digest = hashlib.sha256((self._salt + match.group(0)).encode()).hexdigest()
+        return f"{digest[:8]}-{digest[8:12]}-{digest[12:16]}-{digest[16:20]}-{digest[20:32]}"
+
+    def redact(self, value):
+        """
+        値に含まれるIDと秘匿情報を伏せる.
+        Redact IDs and secrets contained in a value.
+        """
+        if isinstance(value, str):
+            return _UUID_RE.sub(self._redact_id, value)
+        if isinstance(value, dict):
+            return {
+                key: "REDACTED" if key in _SECRET_KEYS else self.redact(item)
+                for key, item in value.items()
+            }
+        if isinstance(value, list):
+            return [self.redact(item) for item in value]
+        return value
+
+    def record(
+        self,
+        method: str,
+        path: str,
+        data,
+        response: ApiResponse,
+        elapsed: float,
+        request_headers: dict[str, str] | None = None,
+    ) -> None:
+        """
+        1往復分を記録する（伏せ字・エンコード・書き込みはバックグラウンドで行う）.
+        Record one round trip; redaction, encoding and the write happen in the background.
+        """
+        self._executor.submit(
+            self._write,
+            round(time.monotonic() - self._start, 3),
+            method,
+            path,
+            data,
+            dict(request_headers or {}),
+            response,
+            elapsed,
+        )
+
+    def _write(
+        self,
+        t: float,
+        method: str,
+        path: str,
+        data,
+        request_headers: dict[str, str],
+        response: ApiResponse,
+        elapsed: float,
+    ) -> None:
+        """
+        書き込みスレッドで1行を組み立てて書き込む.
+        Build and write one line on the writer thread.
+        """
+        try:
+            body = json.loads(response.text) if response.text else None
+        except ValueError:
+            body = response.text
+        line = json.dumps(
+            {
+                "t": t,
+                "method": method,
+                "path": self.redact(path),
+                "data": self.redact(data),
+                "request_headers": {
+                    key: "REDACTED" if key in _SECRET_HEADERS else self.redact(value)
+                    for key, value in request_headers.items()
+                },
+                "status": response.status,
+                "headers": {
+                    k: v for k, v in response.headers.items() if k in _KEPT_HEADERS
+                },
+                "body": self.redact(body),
+                "elapsed": round(elapsed, 4),
+            },
+            ensure_ascii=False,
+        )
+        if self._file is None:
+            self._file = gzip.open(self.path, "ab")
+        self._file.write((line + "\n").encode("utf-8"))
+        # 強制終了しても書き込んだ行までは読めるよう、行毎に圧縮データを書き出す
+        # Flush the compressed data per line so a crash leaves every written line readable
+        self._file.flush(zlib.Z_SYNC_FLUSH)
+
+    def _close_file(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def close(self) -> None:
+        """
+        書き込み待ちを完了させ、ファイルを閉じて終了する（ブロッキングなのでexecutorで呼ぶこと）.
+        Flush pending writes, close the file and shut down; this blocks, so call it from an executor.
+        """
+        self._executor.submit(self._close_file)
+        self._executor.shutdown(wait=True)
+
+
+class CassetteReplayAPI(NatureRemoAPI):
+    """
+    記録したカセットを再生するNatureRemoAPI.
+    NatureRemoCoordinatorやエンティティに渡せば、実際のクラウドなしで同じ負荷を再現できる.
+    同じ（メソッド, パス）の記録は順番に返し、使い切ったら先頭に戻る.
+
+    NatureRemoAPI that replays a recorded cassette.
+    Hand it to NatureRemoCoordinator and the entity platforms to reproduce a
+    recorded workload without the cloud. Recordings for the same (method, path)
+    are returned in order and wrap around once exhausted.
+    """
+
+    def __init__(self, entries: list[dict], realtime: bool = False) -> None:
+        """
+        初期化. realtime=Trueなら記録時の間隔と応答時間を再現する.
+        Initialize. With realtime=True responses follow the recorded spacing and latency.
+        """
+        super().__init__("replay")
+        self.realtime = realtime
+        self._entries: dict[tuple[str, str], deque[dict]] = defaultdict(deque)
+        for entry in entries:
+            self._entries[(entry["method"], entry["path"])].append(entry)
+        # 記録の開始時刻と1周分の長さ / Start of the recording and the length of one lap
+        self._t0 = min((entry["t"] for entry in entries), default=0.0)
+        self._span = max(
+            (entry["t"] + entry["elapsed"] - self._t0 for entry in entries), default=0.0
+        )
+        # (メソッド, パス)毎の返した回数 / Responses served per (method, path)
+        self._served: dict[tuple[str, str], int] = defaultdict(int)
+        # 再生の開始時刻（最初のリクエストで決まる） / Replay start, set by the first request
+        self._started: float | None = None
+
+    async def _pace(self, entry: dict, lap: int) -> None:
+        """
+        記録時のタイムライン上の時刻（周回分を足す）まで待ってから、応答時間だけ待つ.
+        Wait until the entry's offset on the recorded timeline, plus one recording
+        length per lap, then for its recorded latency.
+        """
+        now = time.monotonic()
+        if self._started is None:
+            self._started = now - (entry["t"] - self._t0)
+        due = self._started + entry["t"] - self._t0 + lap * self._span
+        await asyncio.sleep(max(due - now, 0) + entry["elapsed"])
+
+    @staticmethod
+    def load(path: str) -> list[dict]:
+        """
+        カセットを読み込む（ブロッキングI/Oなのでexecutorで呼ぶこと）.
+        Load a cassette; this is blocking I/O, so call it from an executor.
+        """
+        entries = []
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            try:
+                for line in file:
+                    if line.endswith("\n"):
+                        entries.append(json.loads(line))
+            except EOFError:
+                # 閉じられなかったカセット（強制終了など）は書き出し済みの行まで読む
+                # A cassette that was never closed (e.g. after a crash) loads up to its last flushed line
+                _LOGGER.warning("Cassette %s was not closed cleanly", path)
+        return entries
+
+    async def _request(
+        self, method: str, path: str, timeout_key: str, data=None
+    ) -> ApiResponse:
+        """
+        記録済みのレスポンスを返す.
+        Return the recorded response.
+        """
+        queue = self._entries.get((method, path))
+        if not queue:
+            _LOGGER.warning("No recorded response for %s %s", method, path)
+            return ApiResponse(status=404, headers={}, text="")
+
+        entry = queue[0]
+        queue.rotate(-1)
+        served = self._served[(method, path)]
+        self._served[(method, path)] = served + 1
+        if self.realtime:
+            await self._pace(entry, served // len(queue))
+
+        body = entry["body"]
+        text = body if isinstance(body, str) else json.dumps(body) if body is not None else ""
+        return ApiResponse(status=entry["status"], headers=entry["headers"], text=text)
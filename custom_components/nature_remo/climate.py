@@ -12,8 +12,11 @@ from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from .coordinator import NatureRemoCoordinator  # 追加！
 from .const import DOMAIN
+from .profiler import profiled
+from .tracing import Tracer
 
 _LOGGER = logging.getLogger(__name__)
+_TRACER = Tracer("climate")
 
 CONF_TOKEN = "token"
 CONF_NAME = "name"
@@ -46,29 +49,28 @@ async def async_setup_entry(
     Add air conditioner entity from UI configuration.
     """
     _LOGGER.info("Nature Remo Climate: async_setup_entry called!")
-    _LOGGER.debug(f"★[Climate]{hass.data[DOMAIN][entry.entry_id]}")
-    _LOGGER.debug(f"config_entry.options: {entry.options}")
+    _LOGGER.debug("config_entry.options: %s", entry.options)
 
     data = hass.data[DOMAIN][entry.entry_id]
     coordinator: NatureRemoCoordinator = data["coordinator"]
     api = data["api"]
 
-    entities = []
-
-    for appliance in coordinator.aircons.values():
+    if not coordinator.aircons:
+        _LOGGER.warning("No climate appliances matched selected IDs.")
 
-        entity = NatureRemoClimate(
+    # 家電の増減をリフレッシュ毎に反映する / Follow appliance additions and removals on every refresh
+    coordinator.async_track_entities(
+        entry,
+        async_add_entities,
+        lambda: coordinator.aircons,
+        lambda appliance_id, appliance: NatureRemoClimate(
             coordinator=coordinator,
             appliance=appliance,
             device=appliance["device"],
             api=api,
-        )
-        entities.append(entity)
-
-    if not entities:
-        _LOGGER.warning("No climate appliances matched selected IDs.")
-
-    async_add_entities(entities, True)
+        ),
+        update_before_add=True,
+    )
 
 
 class NatureRemoClimate(ClimateEntity):
@@ -81,13 +83,14 @@ class NatureRemoClimate(ClimateEntity):
         self, coordinator: NatureRemoCoordinator, appliance, device, api
     ) -> None:
         """エアコンの初期設定. / Initialize air conditioner settings."""
-        _LOGGER.debug(f'[{appliance["name"]}]Start __init__')
+        _TRACER.debug("[%s]Start __init__", appliance["name"])
         try:
             self._attr_unique_id = f"nature_remo_climate_{appliance["appliance_id"]}"
             self._attr_name = f"Nature Remo {appliance["name"]}"
             self._coordinator = coordinator  # コーディネーターを使う
             self._appliance = appliance
             self._device = device
+            self._attr_device_info = coordinator.device_info(device)
             self._appliance_id = appliance["appliance_id"]
             self._temperature = None
             self._humidity = None
@@ -99,23 +102,15 @@ class NatureRemoClimate(ClimateEntity):
             self._fan_mode = "auto"
             self._swing_mode = "auto"
             self._aircon_range_modes = {}
+            # 動作モード毎の設定可能温度（小数に変換済み） / Settable temperatures per mode, as floats
+            self._temp_lists: dict[str, list[float]] = {}
 
         except Exception as e:
-            _LOGGER.error(f"Error initializing NatureRemoClimate: {e}")
-
-    @property
-    def device_info(self):
-        return {
-            "identifiers": {(DOMAIN, self._device["device_id"])},
-            "name": self._device["name"],
-            "manufacturer": "Nature",
-            "model": self._device.get("firmware_version", "Nature Remo"),
-        }
+            _LOGGER.error("Error initializing NatureRemoClimate: %s", e)
 
     @property
     def supported_features(self) -> int:
         """対応している機能を定義. / Define the features supported by this entity."""
-        _LOGGER.debug(f"[{self._attr_name}] Start supported_features")
         support_feature = ClimateEntityFeature(0)
         if self.min_temp != 0.0 and self.max_temp != 0.0:
             support_feature = support_feature | ClimateEntityFeature.TARGET_TEMPERATURE
@@ -124,19 +119,15 @@ class NatureRemoClimate(ClimateEntity):
         if self.swing_modes:
             support_feature = support_feature | ClimateEntityFeature.SWING_MODE
 
-        _LOGGER.info(
-            f"Nature Remo Climate support_feature: {support_feature}"
-        )  # ログに出す
+        _TRACER.debug("[%s] supported_features: %s", self._attr_name, support_feature)
         return support_feature
 
     @property
     def target_temperature_step(self) -> float:
         """温度変更の刻み幅を設定. / Set the step size for temperature adjustment."""
-        _LOGGER.debug(f"[{self._attr_name}] Start target_temperature_step")
-        # 1. 温度リスト（文字列）を小数で処理できるように変換
+        # 1. 小数に変換済みの温度リストを取得
         remo_mode = MODE_MAP.get(self._hvac_mode)
-        temp_list = self._aircon_range_modes.get(remo_mode, {}).get("temp", [])
-        temp_list = list(map(float, filter(None, temp_list)))
+        temp_list = self._temp_lists.get(remo_mode, [])
 
         if not temp_list:
             return 0.0
@@ -150,36 +141,29 @@ class NatureRemoClimate(ClimateEntity):
         step = 1.0
         if len(set(differences)) == 1:
             step = differences[0]  # すべて同じならその値が刻み幅
-        _LOGGER.debug(f"target_temperature_step: {step}")
+        _TRACER.debug("[%s] target_temperature_step: %s", self._attr_name, step)
         return step
 
     @property
     def min_temp(self):
         """設定可能な最低温度. / Return the minimum temperature that can be set."""
-        _LOGGER.debug(f"[{self._attr_name}] Start min_temp")
-        # 温度リスト（文字列）を小数で処理できるように変換
         remo_mode = MODE_MAP.get(self._hvac_mode)
-        temp_list = self._aircon_range_modes.get(remo_mode, {}).get("temp", [])
-        temp_list = list(map(float, filter(None, temp_list)))
+        temp_list = self._temp_lists.get(remo_mode, [])
         if not temp_list:
             return 0.0
 
         # 最小値を取得
-        _LOGGER.debug(f"min_temp: {min(temp_list)}")
         return min(temp_list)  # 最小値
 
     @property
     def max_temp(self):
         """設定可能な最高温度. / Return the maximum temperature that can be set."""
-        # 温度リスト（文字列）を小数で処理できるように変換
         remo_mode = MODE_MAP.get(self._hvac_mode)
-        temp_list = self._aircon_range_modes.get(remo_mode, {}).get("temp", [])
-        temp_list = list(map(float, filter(None, temp_list)))
+        temp_list = self._temp_lists.get(remo_mode, [])
         if not temp_list:
             return 0.0
 
         # 最大値を取得
-        _LOGGER.debug(f"max_temp: {max(temp_list)}")
         return max(temp_list)  # 最大値
 
     @property
@@ -241,16 +225,19 @@ class NatureRemoClimate(ClimateEntity):
         """現在の風向きを返す. / Return the current swing mode."""
         return self._swing_mode
 
+    @profiled("climate.update_status")
     def update_status(self) -> None:
         """
         コーディネーターで取得した値に更新する.
         Update values using the data from the coordinator.
         """
-        _LOGGER.debug(f"[{self._attr_name}] Start update_status.")
+        _TRACER.debug("[%s] Start update_status.", self._attr_name)
         appliance = self._coordinator.data.get(self._appliance_id, {})
 
         # Climateエンティティに紐づくデバイスから温度、湿度を取得する
-        device = self._coordinator.devices[self._device["device_id"]].get("events", {})
+        device = self._coordinator.devices.get(self._device["device_id"], {}).get(
+            "events", {}
+        )
         if device:
             # 室温
             if "te" in device:
@@ -262,7 +249,14 @@ class NatureRemoClimate(ClimateEntity):
 
         # settingsから取得できる情報
         if appliance and "settings" in appliance:
-            _LOGGER.info("***Nature Remo Settings: %s", appliance["settings"])
+            # 同じ家電の設定ログは5分に1回まで / Settings are logged at most every 5 minutes per AC
+            _TRACER.limited(
+                self._appliance_id,
+                300,
+                "[%s] Nature Remo Settings: %s",
+                self._attr_name,
+                appliance["settings"],
+            )
             # 動作モード
             self._hvac_mode = self.get_remo_mode_to_hvac_mode(
                 appliance["settings"].get("mode", "")
@@ -284,9 +278,15 @@ class NatureRemoClimate(ClimateEntity):
 
         # aircon_range_mode
         if appliance and "aircon" in appliance:
-            self._aircon_range_modes = (
-                appliance["aircon"].get("range", {}).get("modes", {})
-            )
+            range_modes = appliance["aircon"].get("range", {}).get("modes", {})
+            # 温度リスト（文字列）は範囲が変わった時だけ小数に変換する
+            # Convert the temperature lists (strings) only when the range changes
+            if range_modes != self._aircon_range_modes:
+                self._aircon_range_modes = range_modes
+                self._temp_lists = {
+                    mode: list(map(float, filter(None, values.get("temp", []))))
+                    for mode, values in range_modes.items()
+                }
             if self._aircon_range_modes:
                 # 動作モード
                 set_range_modes = [HVACMode.OFF]
@@ -319,10 +319,15 @@ class NatureRemoClimate(ClimateEntity):
         エンティティがHome Assistantに追加されたら更新をトリガー.
         Trigger update when the entity is added to Home Assistant.
         """
-        _LOGGER.info(
-            f"[{self._attr_name}] async_added_to_hass: Climate entity complete setup"
+        _LOGGER.debug(
+            "[%s] async_added_to_hass: Climate entity complete setup", self._attr_name
         )
         self.async_on_remove(self._coordinator.async_add_listener(self.update_status))
+        self.async_on_remove(
+            self._coordinator.entities.async_add(
+                self, self._appliance_id, self._device["device_id"]
+            )
+        )
         self.update_status()
         self.async_write_ha_state()  # 状態をHome Assistantに通知
 
@@ -353,16 +358,20 @@ class NatureRemoClimate(ClimateEntity):
         )  # APIを非同期で送信
         _LOGGER.info("Set HVACMode: %s", response)
         # レスポンス情報をもとに現在の状態を更新する
+        # （ジャーナルに記録した場合など、応答にない項目は現在の値を保つ）
+        # Update from the response; fields it lacks (e.g. when journaled) keep their current value
         # 設定温度
-        self._hvac_mode = self.get_remo_mode_to_hvac_mode(response.get("mode", ""))
+        self._hvac_mode = self.get_remo_mode_to_hvac_mode(
+            response.get("mode", MODE_MAP.get(self._hvac_mode, ""))
+        )
         if self._hvac_mode is HVACMode.FAN_ONLY:
             temp = "0.0"
         else:
-            temp = response.get("temp", "25.0")
+            temp = response.get("temp") or self._target_temperature or "25.0"
         self._target_temperature = float(temp)
-        self._fan_mode = response.get("vol", "auto")
-        self._swing_mode = response.get("dir", "auto")
-        self._button = response.get("button", "")
+        self._fan_mode = response.get("vol", self._fan_mode or "auto")
+        self._swing_mode = response.get("dir", self._swing_mode or "auto")
+        self._button = response.get("button", self._button)
 
         self.async_write_ha_state()  # 状態をHome Assistantに通知
 
@@ -1 +1,34 @@
 DOMAIN = "nature_remo"
+
+# エンドポイント毎のリクエストタイムアウト（秒）
+# Per-endpoint request deadlines (seconds)
+DEFAULT_TIMEOUT_DEVICES = 10
+DEFAULT_TIMEOUT_APPLIANCES = 15
+DEFAULT_TIMEOUT_COMMANDS = 10
+
+# センサー値が変化しなくても状態を書き込む最大の間隔（秒）
+# Maximum seconds between sensor state writes, even without a change
+DEFAULT_SENSOR_HEARTBEAT = 1800
+
+# 全エントリーで共有する赤外線マクロの実行器を置くhass.dataのキー
+# hass.data key for the IR macro executor shared by every entry
+DATA_MACROS = f"{DOMAIN}_macros"
+
+# ハブモードのHTTPエンドポイントを置くhass.dataのキー
+# hass.data key for the hub-mode HTTP endpoint
+DATA_HUB = f"{DOMAIN}_hub"
+
+# コマンド完了イベント / Command completion event
+EVENT_COMMAND = f"{DOMAIN}_command"
+
+# 全エントリーのリフレッシュを駆動するスケジューラーを置くhass.dataのキー
+# hass.data key for the scheduler that drives every entry's refreshes
+DATA_SCHEDULER = f"{DOMAIN}_scheduler"
+
+# WebSocketコマンドの登録済みを示すhass.dataのキー
+# hass.data key marking the websocket commands as registered
+DATA_WEBSOCKET = f"{DOMAIN}_websocket"
+
+# 全エントリーで共有するプロファイラーを置くhass.dataのキー
+# hass.data key for the profiler shared by every entry
+DATA_PROFILER = f"{DOMAIN}_profiler"
@@ -1,14 +1,88 @@
+from collections.abc import Callable, Hashable, Mapping
+from dataclasses import asdict, dataclass, field
 from datetime import timedelta, datetime
 import logging
+import math
+import time
+from types import MappingProxyType
+from typing import Any
 
 from aiohttp import ClientError
 
-from homeassistant.core import HomeAssistant
-from homeassistant.components.light import LightEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_track_state_change_event
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
+
+from .api import CommandResult
+from .const import DOMAIN, EVENT_COMMAND
+from .echonet import SmartMeterDecoder
+from .entity_index import NatureRemoEntityIndex
+from .metrics import LatencyHistogram
+from .peak_demand import billing_period
+from .polling import MODE_HOME, PollingPolicy, PollingProfile
+from .profiler import NatureRemoProfiler
+from .scheduler import NatureRemoPollScheduler
+from .tracing import Tracer
+from .ring_buffer import MotionLog, SmartMeterHistory
+from .signal_library import SignalLibrary
 
 
 _LOGGER = logging.getLogger(__name__)
+_TRACER = Tracer("coordinator")
+
+
+@dataclass(frozen=True, slots=True)
+class NatureRemoSnapshot:
+    """
+    1回のリフレッシュ結果をまとめた不変のスナップショット.
+    読み手は参照を1回取得すれば、リフレッシュ中でも一貫した内容をロックなしで読める.
+
+    Immutable snapshot of one refresh.
+    Readers that grab the reference once get a consistent view without locking,
+    even while the next refresh is running.
+    """
+
+    devices: Mapping[str, dict] = field(default_factory=lambda: MappingProxyType({}))
+    aircons: Mapping[str, dict] = field(default_factory=lambda: MappingProxyType({}))
+    lights: Mapping[str, dict] = field(default_factory=lambda: MappingProxyType({}))
+    ir_remotes: Mapping[str, dict] = field(
+        default_factory=lambda: MappingProxyType({})
+    )
+    smart_meters: Mapping[str, dict] = field(
+        default_factory=lambda: MappingProxyType({})
+    )
+    motion_sensors: Mapping[str, dict] = field(
+        default_factory=lambda: MappingProxyType({})
+    )
+    appliances: Mapping[str, dict] = field(
+        default_factory=lambda: MappingProxyType({})
+    )
+    # /devices の応答そのもの（ハブとして配信する） / The raw /devices response, served in hub mode
+    raw_devices: tuple[dict, ...] = ()
+
+
+# スナップショットの構造と、それを使うプラットフォーム / Snapshot structures and the platforms that use them
+VIEW_PLATFORMS: dict[str, frozenset[str]] = {
+    "aircons": frozenset({"climate"}),
+    "lights": frozenset({"light"}),
+    "smart_meters": frozenset({"sensor"}),
+    "ir_remotes": frozenset({"remote"}),
+    # エアコンは室温・湿度をデバイスから読む / Climate reads room temperature and humidity from devices
+    "devices": frozenset({"sensor", "climate"}),
+    "motion_sensors": frozenset({"sensor"}),
+}
+APPLIANCE_VIEWS = ("aircons", "lights", "smart_meters", "ir_remotes")
+
+# センサーになるデバイスのイベント / Device events that become sensors
+SENSOR_EVENTS = frozenset({"te", "hu", "il", "mo"})
+
+# IDが何回続けて消えたらエンティティを外すか / Successful refreshes an ID must be missing from before its entity is retired
+RETIRE_AFTER_MISSES = 3
 
 
 class NatureRemoCoordinator(DataUpdateCoordinator):
@@ -17,7 +91,13 @@ class NatureRemoCoordinator(DataUpdateCoordinator):
     Coordinator to fetch data from the Nature Remo API.
     """
 
-    def __init__(self, hass: HomeAssistant, api, update_interval: int = 60) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api,
+        update_interval: int = 60,
+        profiler: NatureRemoProfiler | None = None,
+    ) -> None:
         """初期化."""
         super().__init__(
             hass,
@@ -26,135 +106,592 @@ class NatureRemoCoordinator(DataUpdateCoordinator):
             update_interval=timedelta(seconds=update_interval),
         )
         self.api = api
-        self.devices = {}
-        self.aircons = {}
-        self.lights = {}
-        self.ir_remotes = {}
-        self.smart_meters = {}
-        self.motion_sensors = {}  # motionセンサー用の辞書
-        self.entity_map: dict[str, LightEntity] = {}
+        # 公開中のスナップショット（リフレッシュ毎に丸ごと差し替える）
+        # Published snapshot, replaced wholesale on every refresh
+        self.snapshot = NatureRemoSnapshot()
+        # センサーの書き込み制御（デッドバンド等）のオプション / Sensor write-filter options (deadbands etc.)
+        self.sensor_options: Mapping[str, Any] = {}
+        # スマートメーター毎のサンプル履歴（ポーリングを跨いで保持）
+        # Per-smart-meter sample history, kept across polls
+        self.smart_meter_history: dict[str, SmartMeterHistory] = {}
+        # デバイス毎のモーション検出ログ（ポーリングを跨いで保持）
+        # Per-device motion detection log, kept across polls
+        self.motion_logs: dict[str, MotionLog] = {}
+        # スマートメーター毎のデコーダー（積算値の周回補正を保持）
+        # Per-smart-meter decoders, which keep the cumulative wraparound state
+        self._smart_meter_decoders: dict[str, SmartMeterDecoder] = {}
+        # このエントリーのエンティティ索引（弱参照） / Entity index for this entry (weak references)
+        self.entities = NatureRemoEntityIndex()
+        # リフレッシュ全体のレイテンシ（ヘッジ送信を含んだ回も区別して記録）
+        # Refresh latency, with refreshes that used hedged requests tracked separately
+        self.refresh_latency = LatencyHistogram()
+        # オンデマンドのプロファイラー（APIクライアント・他のエントリーと共有）
+        # On-demand profiler, shared with the API client and the other entries
+        self.profiler = profiler or NatureRemoProfiler(hass, "Nature Remo")
+        api.profiler = self.profiler
+        # コマンド完了をHAのイベントとして通知する / Report command completions as HA events
+        api.command_listener = self._async_command_completed
+        # 永続化したシグナルライブラリ（エントリーの設定時に割り当てる）
+        # Persistent signal library, assigned when the entry is set up
+        self.signal_library: SignalLibrary | None = None
+        # 家電毎のシグナル集合と、直近のリフレッシュでシグナルが変化した家電ID
+        # Per-appliance signal sets, and appliance IDs whose signals changed on the last refresh
+        self._signal_sets: dict[str, frozenset] = {}
+        self.changed_signals: set[str] = set()
+        # Remoデバイス毎に共有するデバイス情報 / Device info shared per Remo device
+        self._device_infos: dict[tuple, DeviceInfo] = {}
+        # 読み込み済みのプラットフォーム（Noneならすべての構造を作る）と、エンティティが作られるプラットフォーム
+        # Loaded platforms (None builds every structure), and platforms that would get entities
+        self.platforms: frozenset[str] | None = None
+        self._appliance_platforms: set[str] = set()
+        self._device_platforms: set[str] = set()
+        # 時間帯・在宅状態によるポーリング設定と、エンドポイント毎の最終取得時刻
+        # Time-of-day/presence polling policy, and the last fetch time per endpoint
+        self.polling = PollingPolicy()
+        self.polling_mode = MODE_HOME
+        self.polling_profile = PollingProfile(update_interval, update_interval)
+        # 選択中のリフレッシュ間隔と、登録されていれば共有のスケジューラー
+        # Selected refresh interval, and the shared scheduler when registered
+        self.poll_interval = timedelta(seconds=update_interval)
+        self.scheduler: NatureRemoPollScheduler | None = None
+        self._fetched_at: dict[str, float] = {}
+        # エンドポイント毎の最終取得時刻（UTC、鮮度の表示用） / Last fetch per endpoint in UTC, for reporting freshness
+        self.last_fetched: dict[str, datetime] = {}
+        # 直近のリフレッシュで/appliancesを取得し直したか / Whether the last refresh refetched /appliances
+        self.appliances_refreshed = False
+        self._presence_entity: str | None = None
+        self._unsub_presence: Callable[[], None] | None = None
+
+    @property
+    def available_platforms(self) -> set[str]:
+        """
+        現在のデータでエンティティが作られるプラットフォーム.
+        Platforms that would get entities from the current data.
+        """
+        return self._appliance_platforms | self._device_platforms
+
+    @callback
+    def async_set_platforms(self, platforms) -> None:
+        """
+        読み込み済みのプラットフォームを設定し、以降はそれらが使う構造だけを作る.
+        Set the loaded platforms; from then on only the structures they use are built.
+        """
+        self.platforms = frozenset(platforms)
+
+    def _view_active(self, view: str) -> bool:
+        """構造を作る必要があるか. / Whether a structure needs building."""
+        return self.platforms is None or bool(VIEW_PLATFORMS[view] & self.platforms)
+
+    def _is_due(self, path: str, interval: float, now: float) -> bool:
+        """
+        エンドポイントの取得間隔を過ぎたか（タイマーの揺らぎ分は許容する）.
+        Whether an endpoint's interval has elapsed, allowing for timer jitter.
+        """
+        fetched_at = self._fetched_at.get(path)
+        return fetched_at is None or now - fetched_at >= interval * 0.9
+
+    @callback
+    def async_update_polling(self) -> bool:
+        """
+        現在のモードと上限から取得間隔を選び直し、更新間隔に反映する.
+        モードが変わった場合はTrueを返す.
+
+        Re-select the fetch intervals from the current mode and ceiling and apply
+        them to the update interval. Returns True when the mode changed.
+        """
+        now = dt_util.now()
+        self.polling.record(self.api.request_count, now)
+        presence = None
+        if self._presence_entity:
+            state = self.hass.states.get(self._presence_entity)
+            presence = state.state if state is not None else None
+        mode, profile = self.polling.select(now, presence)
+        changed = mode != self.polling_mode
+        if changed:
+            _LOGGER.debug("Polling mode %s -> %s", self.polling_mode, mode)
+        self.polling_mode = mode
+        self.polling_profile = profile
+        interval = timedelta(seconds=min(profile.devices, profile.appliances))
+        if interval != self.poll_interval:
+            self.poll_interval = interval
+            if self.scheduler is not None:
+                self.scheduler.async_interval_changed()
+        # スケジューラー登録中はスケジューラーがリフレッシュを駆動する
+        # While registered, the scheduler drives the refreshes
+        if self.scheduler is None:
+            self.update_interval = interval
+        return changed
+
+    @callback
+    def async_refresh_appliances(self) -> None:
+        """
+        次のリフレッシュで/appliancesを取得し直させ、リフレッシュを予約する（コマンド送信後など）.
+        リフレッシュの要求はデバウンスされるので、続けて呼ばれても取得は1回にまとまる.
+
+        Make the next refresh refetch /appliances and schedule one, e.g. after a
+        command. Refresh requests are debounced, so a burst of calls results in a
+        single fetch.
+        """
+        self._fetched_at.pop("/appliances", None)
+        self.hass.async_create_task(self.async_request_refresh())
+
+    def smart_meter_wrap_state(self) -> dict[str, dict[str, list[int]]]:
+        """スマートメーター毎の周回補正の状態. / Wraparound state per smart meter."""
+        return {
+            appliance_id: decoder.wrap_state()
+            for appliance_id, decoder in self._smart_meter_decoders.items()
+        }
+
+    def restore_smart_meter_wrap_state(
+        self, state: Mapping[str, dict[str, list[int]]]
+    ) -> None:
+        """
+        保存した周回補正を最初のリフレッシュ前に引き継ぐ.
+        Carry over stored wraparound state; call before the first refresh.
+        """
+        for appliance_id, wrap in state.items():
+            self._smart_meter_decoders.setdefault(
+                appliance_id, SmartMeterDecoder()
+            ).restore_wrap_state(wrap)
+
+    @callback
+    def async_set_presence_entity(self, entity_id: str | None) -> None:
+        """
+        在宅状態を表すエンティティを設定し、状態が変わったら即座にモードを切り替える.
+        Set the entity that reports presence and switch modes as soon as it changes.
+        """
+        if entity_id == self._presence_entity:
+            return
+        if self._unsub_presence is not None:
+            self._unsub_presence()
+            self._unsub_presence = None
+        self._presence_entity = entity_id or None
+        if not self._presence_entity:
+            return
+
+        @callback
+        def _async_presence_changed(event: Event) -> None:
+            # 帰宅時などモードが変わったらすぐに取得し直す / Refresh right away when the mode changes
+            if self.async_update_polling():
+                self._fetched_at.clear()
+                self.hass.async_create_task(self.async_request_refresh())
+
+        self._unsub_presence = async_track_state_change_event(
+            self.hass, [self._presence_entity], _async_presence_changed
+        )
+
+    @callback
+    def _async_command_completed(self, result: CommandResult) -> None:
+        """
+        コマンドの結果をnature_remo_commandイベントとして発行する.
+        Fire a command result as a nature_remo_command event.
+        """
+        self.hass.bus.async_fire(EVENT_COMMAND, asdict(result))
+
+    def device_info(self, device: Mapping[str, Any]) -> DeviceInfo:
+        """
+        Remoデバイスのデバイス情報を返す（同じデバイスのエンティティ間で1つを共有）.
+        Return the device info for a Remo device, shared by all its entities.
+        """
+        key = (device["device_id"], device["name"], device.get("firmware_version"))
+        info = self._device_infos.get(key)
+        if info is None:
+            info = self._device_infos[key] = DeviceInfo(
+                identifiers={(DOMAIN, device["device_id"])},
+                name=device["name"],
+                manufacturer="Nature",
+                model=device.get("firmware_version", "Nature Remo"),
+            )
+        return info
+
+    @property
+    def devices(self) -> Mapping[str, dict]:
+        """Remoデバイス本体（温湿度センサーなど）. / Remo devices (temperature/humidity sensors etc.)."""
+        return self.snapshot.devices
+
+    @property
+    def aircons(self) -> Mapping[str, dict]:
+        """エアコン. / Air conditioners."""
+        return self.snapshot.aircons
+
+    @property
+    def lights(self) -> Mapping[str, dict]:
+        """照明. / Lights."""
+        return self.snapshot.lights
+
+    @property
+    def ir_remotes(self) -> Mapping[str, dict]:
+        """赤外線リモコン. / IR remotes."""
+        return self.snapshot.ir_remotes
+
+    @property
+    def smart_meters(self) -> Mapping[str, dict]:
+        """スマートメーター. / Smart meters."""
+        return self.snapshot.smart_meters
+
+    @property
+    def motion_sensors(self) -> Mapping[str, dict]:
+        """モーションセンサー. / Motion sensors."""
+        return self.snapshot.motion_sensors
+
+    @callback
+    def async_track_entities(
+        self,
+        entry: ConfigEntry,
+        async_add_entities: AddEntitiesCallback,
+        discover: Callable[[], dict[Hashable, Any]],
+        factory: Callable[[Hashable, Any], Entity],
+        update_before_add: bool = False,
+    ) -> None:
+        """
+        リフレッシュ毎にIDの集合を比較し、新しいIDのエンティティを追加、消えたIDのエンティティを外す.
+        discoverは「キー → データ」の辞書を返し、factoryはキーとデータからエンティティを生成する.
+        失敗したリフレッシュでは比較せず、IDがRETIRE_AFTER_MISSES回続けて消えた場合だけ
+        エンティティを外す. レジストリのエントリー（名前・エリア・統計との紐付け）は残す.
+
+        Diff the set of IDs on every refresh: add entities for new IDs and retire
+        entities whose IDs disappeared. discover returns a "key → data" dict and
+        factory builds an entity from a key and its data. Failed refreshes are
+        not diffed, and an entity is only retired once its ID was missing for
+        RETIRE_AFTER_MISSES successful refreshes in a row. Its registry entry,
+        with the user's name, area and statistics link, is kept.
+        """
+        tracked: dict[Hashable, Entity] = {}
+        # 続けて見つからなかった回数 / Consecutive refreshes a key was missing from
+        misses: dict[Hashable, int] = {}
+
+        @callback
+        def _async_sync_entities() -> None:
+            if not self.last_update_success:
+                return
+            current = discover()
+
+            for key in list(tracked):
+                if key in current:
+                    misses.pop(key, None)
+                    continue
+                misses[key] = misses.get(key, 0) + 1
+                if misses[key] < RETIRE_AFTER_MISSES:
+                    continue
+                entity = tracked.pop(key)
+                del misses[key]
+                _LOGGER.debug("Retiring entity for vanished ID: %s", key)
+                # レジストリからは消さず、利用不可として残す / Leave the registry entry so it shows as unavailable
+                self.hass.async_create_task(entity.async_remove())
+
+            new_entities = []
+            for key, data in current.items():
+                if key not in tracked:
+                    entity = factory(key, data)
+                    tracked[key] = entity
+                    new_entities.append(entity)
+            if new_entities:
+                async_add_entities(new_entities, update_before_add)
+
+        _async_sync_entities()
+        entry.async_on_unload(self.async_add_listener(_async_sync_entities))
+
+    def _parse_devices(self, devices, previous: NatureRemoSnapshot):
+        """
+        /devices の応答から温湿度センサーとモーションセンサーの辞書、モーション検出の一覧を作る.
+        検出はスナップショットを公開した後でモーションログへ追加する.
+
+        Build the sensor and motion sensor dicts and the list of motion detections
+        from the /devices response. Detections are added to the motion logs only
+        once the snapshot is published.
+        """
+        self._device_platforms = (
+            {"sensor"}
+            if any(SENSOR_EVENTS.intersection(d.get("newest_events", {})) for d in devices)
+            else set()
+        )
+        build_devices = self._view_active("devices")
+        build_motion = self._view_active("motion_sensors")
+
+        new_devices = {}
+        motion_sensors = {}
+        detections: list[tuple[str, float]] = []
+        if not build_devices and not build_motion:
+            return new_devices, motion_sensors, detections
+        for device in devices:
+            device_id = device.get("id")
+            name = device.get("name", "Unnamed")
+            newest_events = device.get("newest_events", {})
+
+            # モーションセンサー辞書の追加
+            motion_event = newest_events.get("mo") if build_motion else None
+            if motion_event:
+                created_at_str = motion_event.get("created_at")
+                if created_at_str:
+                    # UTCのISO8601文字列をdatetime型に変換して保存しておく
+                    created_at = datetime.fromisoformat(
+                        created_at_str.replace("Z", "+00:00")
+                    )
+                    motion_sensors[device_id] = {
+                        "name": name,
+                        "device_id": device_id,
+                        "last_motion": created_at,
+                        "firmware_version": device.get("firmware_version", ""),
+                    }
+                    detections.append((device_id, created_at.timestamp()))
+
+            # 今回イベントがなくても、存在するデバイスのモーション情報は引き継ぐ
+            # Keep motion info for devices that still exist even without a new event
+            if (
+                build_motion
+                and device_id not in motion_sensors
+                and device_id in previous.motion_sensors
+            ):
+                motion_sensors[device_id] = previous.motion_sensors[device_id]
+
+            if not build_devices:
+                continue
+            # 温湿度センサー辞書の追加
+            new_devices[device_id] = {
+                "name": name,
+                "device_id": device_id,
+                "events": newest_events,
+                "firmware_version": device.get("firmware_version", ""),
+            }
+
+        return new_devices, motion_sensors, detections
+
+    def _appliance_info(self, appliance: dict, device_info: dict) -> dict:
+        """エアコン・照明の情報. / Info for air conditioners and lights."""
+        return {
+            "name": appliance.get("nickname", "Unnamed"),
+            "appliance_id": appliance.get("id"),
+            "device": device_info,
+        }
+
+    def _ir_remote(self, appliance: dict, device_info: dict) -> dict | None:
+        """signalsにボタンが設定されていればリモコンの情報. / Remote info when buttons are set."""
+        signals = appliance.get("signals", [])
+        if not signals:
+            return None
+        return {
+            "name": appliance.get("nickname", "Unnamed"),
+            "appliance_id": appliance.get("id"),
+            "device": device_info,
+            "signals": signals,
+        }
+
+    def _smart_meter(self, appliance: dict, device_info: dict) -> dict:
+        """スマートメーターのパースと履歴の追加. / Parse a smart meter and append to its history."""
+        appliance_id = appliance.get("id")
+        nickname = appliance.get("nickname", "Unnamed")
+        properties = appliance.get("smart_meter", {}).get("echonetlite_properties", [])
+        parsed = self.api.parse_smart_meter_properties(
+            properties,
+            self._smart_meter_decoders.setdefault(appliance_id, SmartMeterDecoder()),
+        )
+
+        _TRACER.debug(
+            "[%s]buy_power:%s, sold_power:%s, current_power:%s",
+            nickname,
+            parsed.get("buy_power"),
+            parsed.get("sold_power"),
+            parsed["instant_power"],
+        )
+        meter = {
+            "name": nickname,
+            "appliance_id": appliance_id,
+            "device": device_info,
+            "current_power": parsed["instant_power"],
+        }
+        # 積算値・瞬時電流・定時積算電力量はメーターが返す場合のみ追加
+        # Cumulative counters, phase currents and fixed-time values only when the meter reports them
+        for key in (
+            "buy_power",
+            "sold_power",
+            "current_r",
+            "current_t",
+            "buy_fixed_power",
+            "buy_fixed_at",
+            "sold_fixed_power",
+            "sold_fixed_at",
+        ):
+            if key in parsed:
+                meter[key] = parsed[key]
+        history = self.smart_meter_history.setdefault(appliance_id, SmartMeterHistory())
+        # 契約期間が変わったら、今回のサンプルを加える前にピーク需要をリセットする
+        # Reset peak demand before adding this sample when the billing period changed
+        period = billing_period()
+        if history.peak_period != period:
+            if history.peak_period is not None:
+                history.reset_peaks()
+            history.peak_period = period
+        history.append(
+            time.time(),
+            parsed["instant_power"],
+            parsed.get("buy_power", math.nan),
+            parsed.get("sold_power", math.nan),
+        )
+        return meter
+
+    def _parse_appliances(self, appliances):
+        """
+        /appliances の応答から家電種別毎の辞書を作る.
+        読み込み済みのプラットフォームが使う構造のハンドラーだけを実行する.
+
+        Build the per-type appliance dicts from the /appliances response.
+        Only the handlers for structures used by loaded platforms run.
+        """
+        views = {view: {} for view in APPLIANCE_VIEWS}
+        available = set()
+        for appliance in appliances:
+            device_info = None
+            for view, handler in APPLIANCE_HANDLERS.get(appliance.get("type"), ()):
+                if not self._view_active(view):
+                    # 未読み込みのプラットフォームは、エンティティが作られるかだけ調べる
+                    # For platforms not loaded, only note whether they would get entities
+                    if view != "ir_remotes" or appliance.get("signals"):
+                        available |= VIEW_PLATFORMS[view]
+                    continue
+                if device_info is None:
+                    device = appliance.get("device", {})
+                    device_info = {
+                        "name": device.get("name", "No Name"),
+                        "device_id": device.get("id", ""),
+                        "firmware_version": device.get("firmware_version", ""),
+                    }
+                result = handler(self, appliance, device_info)
+                if result is not None:
+                    views[view][appliance.get("id")] = result
+                    available |= VIEW_PLATFORMS[view]
+
+        self._appliance_platforms = available
+        return (
+            views["aircons"],
+            views["lights"],
+            views["smart_meters"],
+            views["ir_remotes"],
+        )
 
     async def _async_update_data(self):
         """APIを1回だけ呼び、各アプライアンスの情報を取得."""
-        _LOGGER.info("NatureRemoCoordinator.async_update_data start.")
+        _TRACER.debug("NatureRemoCoordinator.async_update_data start.")
+        start = time.monotonic()
+        hedged_before = self.api.hedged_requests
         try:
-            # Remoデバイス本体（温湿度センサーなど）の処理
-            self.devices = {}
-            devices = await self.api.get_devices()
-            for device in devices:
-                device_id = device.get("id")
-                name = device.get("name", "Unnamed")
-                newest_events = device.get("newest_events", {})
-
-                # モーションセンサー辞書の追加
-                motion_event = newest_events.get("mo")
-                if motion_event:
-                    created_at_str = motion_event.get("created_at")
-                    if created_at_str:
-                        # UTCのISO8601文字列をdatetime型に変換して保存しておく
-                        created_at = datetime.fromisoformat(
-                            created_at_str.replace("Z", "+00:00")
-                        )
-                        self.motion_sensors[device_id] = {
-                            "name": name,
-                            "device_id": device_id,
-                            "last_motion": created_at,
-                            "firmware_version": device.get("firmware_version", ""),
-                        }
-
-                # 温湿度センサー辞書の追加
-                self.devices[device_id] = {
-                    "name": name,
-                    "device_id": device_id,
-                    "events": newest_events,
-                    "firmware_version": device.get("firmware_version", ""),
-                }
+            # 新しいスナップショットは別の辞書に組み立て、最後に参照を1回だけ差し替える
+            # Build the new snapshot off to the side and publish it with one reference swap
+            previous = self.snapshot
 
-            # 初期化
-            self.aircons = {}
-            self.lights = {}
-            self.smart_meters = {}
-            self.ir_remotes = {}
-
-            appliances = await self.api.get_appliances()
-
-            for appliance in appliances:
-                appliance_type = appliance.get("type")
-                appliance_id = appliance.get("id")
-                nickname = appliance.get("nickname", "Unnamed")
-                device_info = {
-                    "name": appliance.get("device", {}).get("name", "No Name"),
-                    "device_id": appliance.get("device", {}).get("id", ""),
-                    "firmware_version": appliance.get("device", {}).get(
-                        "firmware_version", ""
-                    ),
-                }
-                appliance_info = {
-                    "name": nickname,
-                    "appliance_id": appliance_id,
-                    "device": device_info,
-                }
+            # 取得間隔を過ぎたエンドポイントだけ取得し、残りは前回の内容を引き継ぐ
+            # Fetch only the endpoints whose interval elapsed; keep the rest from last time
+            now = time.monotonic()
+            # 取得時刻はスナップショットを公開してから記録する（途中で失敗したら次回も取得する）
+            # Fetch times are recorded only once the snapshot is published, so a
+            # refresh that fails part-way fetches everything again next time
+            fetched: dict[str, datetime] = {}
+            if self._is_due("/devices", self.polling_profile.devices, now):
+                # Remoデバイス本体（温湿度センサーなど）の処理
+                devices = await self.api.get_devices()
+                fetched["/devices"] = dt_util.utcnow()
+                with (
+                    self.profiler.stage("coordinator.parse_devices"),
+                    _TRACER.span("parse_devices"),
+                ):
+                    new_devices, motion_sensors, detections = self._parse_devices(
+                        devices, previous
+                    )
+                raw_devices = tuple(devices)
+                new_devices = MappingProxyType(new_devices)
+                motion_sensors = MappingProxyType(motion_sensors)
+            else:
+                raw_devices = previous.raw_devices
+                new_devices = previous.devices
+                motion_sensors = previous.motion_sensors
+                detections = []
 
-                # スマートメーターの処理
-                if appliance_type == "EL_SMART_METER":
-                    properties = appliance.get("smart_meter", {}).get(
-                        "echonetlite_properties", []
+            if self._is_due("/appliances", self.polling_profile.appliances, now):
+                appliances = await self.api.get_appliances()
+                fetched["/appliances"] = dt_util.utcnow()
+                with (
+                    self.profiler.stage("coordinator.parse_appliances"),
+                    _TRACER.span("parse_appliances"),
+                ):
+                    aircons, lights, smart_meters, ir_remotes = self._parse_appliances(
+                        appliances
                     )
-                    parsed = self.api.parse_smart_meter_properties(properties)
 
-                    _LOGGER.debug(
-                        f"[{nickname}]buy_power:{parsed["buy_power"]}, sold_power:{parsed["sold_power"]}, current_power:{parsed["instant_power"]}"
+                # シグナル集合の差分を取り、変化した家電だけコマンド索引を作り直させる
+                # Diff signal sets so only the affected remotes rebuild their command index
+                signal_sets = {
+                    appliance_id: frozenset(
+                        (s["id"], s["name"]) for s in remote["signals"]
                     )
-                    self.smart_meters[appliance_id] = {
-                        "name": nickname,
-                        "appliance_id": appliance_id,
-                        "device": device_info,
-                        "buy_power": parsed["buy_power"],
-                        "sold_power": parsed["sold_power"],
-                        "current_power": parsed["instant_power"],
-                    }
+                    for appliance_id, remote in ir_remotes.items()
+                }
+                self.changed_signals = {
+                    appliance_id
+                    for appliance_id, signals in signal_sets.items()
+                    if self._signal_sets.get(appliance_id) != signals
+                }
+                self._signal_sets = signal_sets
+                # リモコンを作っていない間はライブラリを空で上書きしない
+                # Don't wipe the library while remotes aren't being built
+                if self.signal_library is not None and self._view_active("ir_remotes"):
+                    self.signal_library.async_update(ir_remotes, self.changed_signals)
 
-                # エアコン（AC）の処理
-                elif appliance_type == "AC":
-                    self.aircons[appliance_id] = appliance_info
-                    # signalsにボタンが設定されていればリモートエンティティに追加
-                    signals = appliance.get("signals", [])
-                    if signals:
-                        self.ir_remotes[appliance_id] = {
-                            "name": nickname,
-                            "appliance_id": appliance_id,
-                            "device": device_info,
-                            "signals": signals,
-                        }
-
-                # 照明（LIGHT）の処理
-                elif appliance_type == "LIGHT":
-                    self.lights[appliance_id] = appliance_info
-                    # signalsにボタンが設定されていればリモートエンティティに追加
-                    signals = appliance.get("signals", [])
-                    if signals:
-                        self.ir_remotes[appliance_id] = {
-                            "name": nickname,
-                            "appliance_id": appliance_id,
-                            "device": device_info,
-                            "signals": signals,
-                        }
-
-                # IRの処理
-                elif appliance_type == "IR":
-                    signals = appliance.get("signals", [])
-                    if signals:
-                        self.ir_remotes[appliance_id] = {
-                            "name": nickname,
-                            "appliance_id": appliance_id,
-                            "device": device_info,
-                            "signals": signals,
-                        }
-
-            return {ac["id"]: ac for ac in appliances}
+                snapshot_appliances = dict(
+                    aircons=MappingProxyType(aircons),
+                    lights=MappingProxyType(lights),
+                    ir_remotes=MappingProxyType(ir_remotes),
+                    smart_meters=MappingProxyType(smart_meters),
+                    appliances=MappingProxyType({ac["id"]: ac for ac in appliances}),
+                )
+            else:
+                self.changed_signals = set()
+                snapshot_appliances = dict(
+                    aircons=previous.aircons,
+                    lights=previous.lights,
+                    ir_remotes=previous.ir_remotes,
+                    smart_meters=previous.smart_meters,
+                    appliances=previous.appliances,
+                )
+
+            self.snapshot = NatureRemoSnapshot(
+                devices=new_devices,
+                motion_sensors=motion_sensors,
+                raw_devices=raw_devices,
+                **snapshot_appliances,
+            )
+            for path, fetched_at in fetched.items():
+                self._fetched_at[path] = now
+                self.last_fetched[path] = fetched_at
+            self.appliances_refreshed = "/appliances" in fetched
+            # 前回と異なる検出時刻だけログに残る / Only a new detection time is logged
+            for device_id, detected_at in detections:
+                self.motion_logs.setdefault(device_id, MotionLog()).append(detected_at)
+            self.async_update_polling()
+
+            self.refresh_latency.observe(
+                time.monotonic() - start,
+                hedged=self.api.hedged_requests != hedged_before,
+            )
+            self.profiler.tick()
+            return self.snapshot.appliances
         except ClientError as err:
             raise UpdateFailed(f"通信エラー: {err}") from err  # ネットワーク系のエラー
         except TimeoutError as err:
             raise UpdateFailed("APIの応答がタイムアウトしました") from err
         except ValueError as err:
             raise UpdateFailed(f"JSONデータのパースエラー: {err}") from err
+
+
+# 家電種別毎のハンドラー（構造名, 構造を作る関数）
+# Per-appliance-type handlers: (structure, function that builds its entry)
+APPLIANCE_HANDLERS = {
+    "EL_SMART_METER": (("smart_meters", NatureRemoCoordinator._smart_meter),),
+    "AC": (
+        ("aircons", NatureRemoCoordinator._appliance_info),
+        ("ir_remotes", NatureRemoCoordinator._ir_remote),
+    ),
+    "LIGHT": (
+        ("lights", NatureRemoCoordinator._appliance_info),
+        ("ir_remotes", NatureRemoCoordinator._ir_remote),
+    ),
+    "IR": (("ir_remotes", NatureRemoCoordinator._ir_remote),),
+}
@@ -0,0 +1,169 @@
+from datetime import datetime
+
+# 積算電力量単位（EPC 0xE1）→ kWh換算係数
+# Cumulative energy unit (EPC 0xE1) → kWh multiplier
+UNIT_TABLE = {
+    0x00: 1,
+    0x01: 0.1,
+    0x02: 0.01,
+    0x03: 0.001,
+    0x04: 0.0001,
+    0x0A: 10,
+    0x0B: 100,
+    0x0C: 1000,
+    0x0D: 10000,
+}
+
+# 瞬時電流の「計測値なし」（単相2線式のT相など）とアンダーフロー
+# Instantaneous current "no data" (e.g. the T phase on single-phase two-wire) and underflow
+PHASE_CURRENT_NO_DATA = frozenset({0x7FFE, 0x8000})
+
+# 周回補正の状態の保存 / Storage for the wraparound state
+WRAP_STORAGE_VERSION = 1
+# 書き込みをまとめる遅延（秒） / Delay that batches writes (seconds)
+WRAP_SAVE_DELAY = 60
+
+
+def _parse_int(val: str) -> int:
+    """10進数文字列を整数に変換する. / Parse a decimal string into an int."""
+    return int(val)
+
+
+def _parse_signed32(val: str) -> int:
+    """符号付き32ビット値として解釈する. / Interpret the value as a signed 32-bit integer."""
+    value = int(val) & 0xFFFFFFFF
+    return value - 0x100000000 if value & 0x80000000 else value
+
+
+def _parse_phase_current(val: str) -> tuple[float | None, float | None]:
+    """
+    瞬時電流（EPC 0xE8）をR相・T相（A）に分解する. 各相は0.1A単位の符号付き16ビット.
+    計測値なし（0x7FFE・0x8000）の相はNone.
+
+    Split instantaneous current (EPC 0xE8) into R/T phases in amperes.
+    Each phase is a signed 16-bit value in 0.1 A units; phases reporting
+    "no data" (0x7FFE or 0x8000) are None.
+    """
+    value = int(val) & 0xFFFFFFFF
+
+    def signed16(v: int) -> float | None:
+        if v in PHASE_CURRENT_NO_DATA:
+            return None
+        return (v - 0x10000 if v & 0x8000 else v) / 10
+
+    return signed16(value >> 16), signed16(value & 0xFFFF)
+
+
+def _parse_fixed_time(val: str) -> tuple[datetime, int]:
+    """
+    定時積算電力量（EPC 0xEA/0xEB）を計測日時と積算値に分解する.
+    11バイト（年2・月・日・時・分・秒・積算値4）の16進文字列を想定する.
+
+    Split a fixed-time cumulative value (EPC 0xEA/0xEB) into its timestamp and raw value.
+    Expects an 11-byte hex string (year 2, month, day, hour, minute, second, value 4).
+    """
+    raw = bytes.fromhex(val)
+    if len(raw) != 11:
+        raise ValueError(f"unexpected fixed-time value length: {len(raw)}")
+    measured_at = datetime(
+        int.from_bytes(raw[0:2], "big"), raw[2], raw[3], raw[4], raw[5], raw[6]
+    )
+    return measured_at, int.from_bytes(raw[7:11], "big")
+
+
+# EPC → (フィールド名, パーサ) / EPC → (field name, parser)
+EPC_TABLE = {
+    0xD3: ("coefficient", _parse_int),  # 係数
+    0xD7: ("digits", _parse_int),  # 積算電力量有効桁数
+    0xE0: ("buy_raw", _parse_int),  # 積算電力量計測値（正方向）
+    0xE1: ("unit", _parse_int),  # 積算電力量単位
+    0xE3: ("sold_raw", _parse_int),  # 積算電力量計測値（逆方向）
+    0xE7: ("instant_power", _parse_signed32),  # 瞬時電力計測値（W）
+    0xE8: ("phase_current", _parse_phase_current),  # 瞬時電流計測値
+    0xEA: ("buy_fixed", _parse_fixed_time),  # 定時積算電力量（正方向）
+    0xEB: ("sold_fixed", _parse_fixed_time),  # 定時積算電力量（逆方向）
+}
+
+
+class SmartMeterDecoder:
+    """
+    Nature Remo E / E LiteのECHONET Liteプロパティをテーブル駆動でデコードする.
+    積算値の桁あふれ（有効桁数による周回）をメーター毎に補正するため、メーター毎に1インスタンスを使う.
+
+    Table-driven decoder for Nature Remo E / E Lite ECHONET Lite properties.
+    Use one instance per meter: it corrects cumulative counter wraparound
+    (driven by the significant-digit count) across polls.
+    """
+
+    def __init__(self) -> None:
+        """初期化. / Initialize the decoder."""
+        # 積算値毎の（前回の生値, 周回補正量） / Per counter: (previous raw value, wrap offset)
+        self._wrap: dict[str, tuple[int, int]] = {}
+
+    def _unwrap(self, name: str, raw: int, digits: int | None) -> int:
+        """
+        有効桁数で周回した積算値を連続した値に補正する.
+        Turn a counter that wraps at its significant digits into a continuous value.
+        """
+        if not digits:
+            return raw
+        modulus = 10**digits
+        previous, offset = self._wrap.get(name, (raw, 0))
+        # 半周以上の減少のみ周回とみなす（小さな揺れは無視）
+        # Only a drop of more than half the range counts as a wrap
+        if previous - raw > modulus // 2:
+            offset += modulus
+        self._wrap[name] = (raw, offset)
+        return raw + offset
+
+    def wrap_state(self) -> dict[str, list[int]]:
+        """
+        保存用の周回補正の状態（積算値毎の[前回の生値, 周回補正量]）.
+        Wraparound state for storage: [previous raw value, wrap offset] per counter.
+        """
+        return {name: [raw, offset] for name, (raw, offset) in self._wrap.items()}
+
+    def restore_wrap_state(self, state: dict[str, list[int]]) -> None:
+        """
+        保存した周回補正を引き継ぐ（再起動で積算値が戻らないように）.
+        Carry over stored wraparound state so a restart does not set the counters back.
+        """
+        self._wrap = {name: (int(raw), int(offset)) for name, (raw, offset) in state.items()}
+
+    def decode(self, properties: list[dict]) -> dict:
+        """
+        echonetlite_propertiesをデコードし、センサー用の値を返却する.
+        Decode echonetlite_properties into sensor values.
+        """
+        values = {}
+        for prop in properties:
+            entry = EPC_TABLE.get(int(prop.get("epc", 0)))
+            if entry is None:
+                continue
+            name, parser = entry
+            try:
+                values[name] = parser(prop.get("val", "0"))
+            except (TypeError, ValueError):
+                continue
+
+        digits = values.get("digits")
+        factor = values.get("coefficient", 1) * UNIT_TABLE.get(values.get("unit", 0), 1)
+        result = {"instant_power": values.get("instant_power", 0)}
+        # 積算値がない回はその積算値を出さない（0として周回補正に渡さない）
+        # Skip a counter missing from this poll rather than unwrapping it as 0
+        for name in ("buy", "sold"):
+            if f"{name}_raw" in values:
+                result[f"{name}_power"] = (
+                    self._unwrap(name, values[f"{name}_raw"], digits) * factor
+                )
+
+        if "phase_current" in values:
+            for key, current in zip(("current_r", "current_t"), values["phase_current"]):
+                if current is not None:
+                    result[key] = current
+        for name in ("buy_fixed", "sold_fixed"):
+            if name in values:
+                measured_at, raw = values[name]
+                result[f"{name}_power"] = raw * factor
+                result[f"{name}_at"] = measured_at
+        return result
@@ -0,0 +1,177 @@
+import asyncio
+from datetime import datetime, timedelta
+import logging
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+)
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+# 長期統計に書き込む積算値のキーと表示名 / Cumulative keys written to long-term statistics
+STATISTIC_KEYS = {
+    "buy_power": "Buy Power",
+    "sold_power": "Sold Power",
+}
+
+HOUR = timedelta(hours=1)
+
+
+def _hour_floor(value: datetime) -> datetime:
+    """正時に切り捨てる. / Truncate to the start of the hour."""
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+class _CounterState:
+    """
+    1つの積算値について、最後に書き込んだ統計と最後の読み取り値を保持する.
+    Last written statistic and last reading for one cumulative counter.
+    """
+
+    def __init__(self, at: datetime, reading: float, total: float) -> None:
+        self.at = at  # 最後の読み取り時刻 / Time of the last reading
+        self.reading = reading  # 最後の積算値 / Last cumulative reading
+        self.state = reading  # 最後に書き込んだ統計のstate / Last written statistic state
+        self.sum = total  # 最後に書き込んだ統計のsum / Last written statistic sum
+
+
+class SmartMeterStatisticsImporter:
+    """
+    スマートメーターの積算買電量・売電量から1時間毎の外部統計を直接書き込む.
+    ポーリングが途切れた場合は、前後の積算値から欠けた時間帯を線形補間して埋める.
+
+    Writes hourly external statistics straight from the smart meters'
+    cumulative buy/sell readings. When polling resumes after a gap, the
+    missing hours are interpolated linearly from the cumulative counters.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """初期化. / Initialize the importer."""
+        self.hass = hass
+        self._counters: dict[str, _CounterState] = {}
+        # 取り込みは1つずつ行う / Imports run one at a time
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+
+    @staticmethod
+    def statistic_id(appliance_id: str, key: str) -> str:
+        """外部統計のIDを返す. / Return the external statistic ID."""
+        object_id = f"{appliance_id}_{key}".lower().replace("-", "_")
+        return f"{DOMAIN}:{object_id}"
+
+    async def _async_load(
+        self, statistic_id: str, now: datetime, reading: float
+    ) -> _CounterState:
+        """
+        最後に書き込まれた統計を読み込み、再起動前からの続きとして状態を復元する.
+        Restore counter state from the last written statistic so restarts resume the series.
+        """
+        last = await get_instance(self.hass).async_add_executor_job(
+            get_last_statistics, self.hass, 1, statistic_id, True, {"state", "sum"}
+        )
+        rows = last.get(statistic_id)
+        if not rows:
+            # 初回は現在値を起点にする / Start the series at the current reading
+            return _CounterState(now, reading, 0.0)
+
+        row = rows[0]
+        start = row["start"]
+        if not isinstance(start, datetime):
+            start = dt_util.utc_from_timestamp(start)
+        counter = _CounterState(start + HOUR, row["state"], row["sum"])
+        return counter
+
+    @callback
+    def async_schedule(self, smart_meters, now: datetime) -> None:
+        """
+        取り込みを開始する. 実行中なら今回は取り込まず、次のリフレッシュで積算値から補う.
+        Start an import. While one is still running this call is skipped; the
+        next refresh covers it from the cumulative counters.
+        """
+        if self._lock.locked() or (self._task is not None and not self._task.done()):
+            _LOGGER.debug("Statistics import still running, skipping this refresh")
+            return
+        self._task = self.hass.async_create_task(self.async_update(smart_meters, now))
+
+    async def async_update(self, smart_meters, now: datetime | None = None) -> None:
+        """
+        最新の読み取り値を取り込み、完了した時間帯の統計を書き込む.
+        Take in the latest readings and write statistics for completed hours.
+        """
+        now = now or dt_util.utcnow()
+        async with self._lock:
+            await self._async_update(smart_meters, now)
+
+    async def _async_update(self, smart_meters, now: datetime) -> None:
+        """
+        ロック取得後の取り込み処理.
+        Import body, run while holding the lock.
+        """
+        for appliance_id, meter in smart_meters.items():
+            for key, name in STATISTIC_KEYS.items():
+                if key not in meter:
+                    continue
+                statistic_id = self.statistic_id(appliance_id, key)
+                reading = float(meter[key])
+
+                counter = self._counters.get(statistic_id)
+                if counter is None:
+                    counter = await self._async_load(statistic_id, now, reading)
+                    self._counters[statistic_id] = counter
+
+                statistics = self._interpolate(counter, now, reading)
+                if not statistics:
+                    continue
+
+                metadata = StatisticMetaData(
+                    has_mean=False,
+                    has_sum=True,
+                    name=f"Nature Remo {meter['name']} {name}",
+                    source=DOMAIN,
+                    statistic_id=statistic_id,
+                    unit_of_measurement="kWh",
+                )
+                _LOGGER.debug(
+                    "Importing %d hourly statistics for %s",
+                    len(statistics),
+                    statistic_id,
+                )
+                async_add_external_statistics(self.hass, metadata, statistics)
+
+    @staticmethod
+    def _interpolate(
+        counter: _CounterState, now: datetime, reading: float
+    ) -> list[StatisticData]:
+        """
+        前回の読み取りから今回までに跨いだ各正時の積算値を線形補間し、統計行を作る.
+        Linearly interpolate the counter at every hour boundary crossed since the
+        previous reading and build one statistic row per completed hour.
+        """
+        statistics = []
+        boundary = _hour_floor(counter.at) + HOUR
+        span = (now - counter.at).total_seconds()
+        while boundary <= now:
+            if span > 0:
+                ratio = (boundary - counter.at).total_seconds() / span
+            else:
+                ratio = 1.0
+            value = counter.reading + (reading - counter.reading) * ratio
+            # 積算値が減った場合はメーター交換等のリセットとみなす
+            # A decreasing counter is treated as a meter reset
+            counter.sum += max(value - counter.state, 0.0)
+            counter.state = value
+            statistics.append(
+                StatisticData(start=boundary - HOUR, state=value, sum=counter.sum)
+            )
+            boundary += HOUR
+
+        counter.at = now
+        counter.reading = reading
+        return statistics
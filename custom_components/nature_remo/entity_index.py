@@ -0,0 +1,73 @@
+from collections.abc import Callable
+import weakref
+
+from homeassistant.core import callback
+from homeassistant.helpers.entity import Entity
+
+
+class NatureRemoEntityIndex:
+    """
+    インテグレーションのエンティティをentity_id・家電ID・デバイスIDで引ける索引.
+    弱参照で保持するため、削除されたエンティティが索引に残り続けることはない.
+
+    Index of the integration's entities by entity_id, appliance ID and device ID.
+    Entities are held by weak reference, so removed entities never linger here.
+    """
+
+    def __init__(self) -> None:
+        """初期化. / Initialize the index."""
+        self._by_entity_id: weakref.WeakValueDictionary[str, Entity] = (
+            weakref.WeakValueDictionary()
+        )
+        self._by_appliance: dict[str, weakref.WeakSet[Entity]] = {}
+        self._by_device: dict[str, weakref.WeakSet[Entity]] = {}
+
+    def __len__(self) -> int:
+        return len(self._by_entity_id)
+
+    @callback
+    def async_add(
+        self,
+        entity: Entity,
+        appliance_id: str | None = None,
+        device_id: str | None = None,
+    ) -> Callable[[], None]:
+        """
+        エンティティを登録し、登録解除用の関数を返す（async_on_removeに渡す）.
+        Register an entity and return the function that unregisters it (for async_on_remove).
+        """
+        entity_id = entity.entity_id
+        self._by_entity_id[entity_id] = entity
+        if appliance_id:
+            self._by_appliance.setdefault(appliance_id, weakref.WeakSet()).add(entity)
+        if device_id:
+            self._by_device.setdefault(device_id, weakref.WeakSet()).add(entity)
+
+        @callback
+        def _async_remove() -> None:
+            if self._by_entity_id.get(entity_id) is entity:
+                del self._by_entity_id[entity_id]
+            for index, key in (
+                (self._by_appliance, appliance_id),
+                (self._by_device, device_id),
+            ):
+                entities = index.get(key)
+                if entities is None:
+                    continue
+                entities.discard(entity)
+                if not entities:
+                    del index[key]
+
+        return _async_remove
+
+    def get(self, entity_id: str) -> Entity | None:
+        """entity_idからエンティティを返す. / Return the entity for an entity_id."""
+        return self._by_entity_id.get(entity_id)
+
+    def by_appliance(self, appliance_id: str) -> list[Entity]:
+        """家電IDに属するエンティティを返す. / Return the entities for an appliance ID."""
+        return list(self._by_appliance.get(appliance_id, ()))
+
+    def by_device(self, device_id: str) -> list[Entity]:
+        """デバイスIDに属するエンティティを返す. / Return the entities for a Remo device ID."""
+        return list(self._by_device.get(device_id, ()))
@@ -0,0 +1,121 @@
+import hmac
+from http import HTTPStatus
+import json
+import logging
+import re
+
+from aiohttp import ClientError, web
+
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+HUB_URL = "/api/nature_remo/hub"
+
+# ハブが転送するコマンドのパス / Command paths the hub forwards
+COMMAND_PATHS = re.compile(
+    r"^/(appliances/[\w-]+/(aircon_settings|light)|signals/[\w-]+/send)$"
+)
+
+
+class NatureRemoHubView(HomeAssistantView):
+    """
+    最新のスナップショットを配信し、コマンドをクラウドへ転送するハブ用のHTTPエンドポイント.
+    他のHome AssistantはNatureRemoAPIの接続先をここに向けることで、クラウドへのポーリングを共有できる.
+    エントリーはAuthorizationヘッダのハブトークンで選ぶ.
+
+    HTTP endpoint for hub mode: serves the latest snapshot and forwards
+    commands to the cloud. Other Home Assistant instances point their
+    NatureRemoAPI here so they share one cloud poll. The entry is chosen by
+    the hub token in the Authorization header.
+    """
+
+    url = HUB_URL + "/{path:.+}"
+    name = "api:nature_remo:hub"
+    # HAのユーザー認証ではなくハブトークンで認証する / Authenticated by hub token, not HA users
+    requires_auth = False
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """初期化. / Initialize the view."""
+        self.hass = hass
+        # (エントリーID, パス) → (スナップショット, JSON) / (entry ID, path) → (snapshot, JSON)
+        self._encoded: dict[tuple[str, str], tuple[object, bytes]] = {}
+
+    def _authenticate(self, request: web.Request):
+        """
+        ハブトークンが一致する、ハブ公開中のエントリーのデータを返す.
+        Return the data of the hub-enabled entry whose token matches.
+        """
+        header = request.headers.get("Authorization", "")
+        if not header.startswith("Bearer "):
+            return None, None
+        token = header.removeprefix("Bearer ").encode()
+        for entry in self.hass.config_entries.async_entries(DOMAIN):
+            # 分割前のオプションは共通のhub_tokenを使っていた / Options saved before the split used the shared hub_token
+            hub_token = entry.options.get(
+                "hub_serve_token", entry.options.get("hub_token", "")
+            )
+            if not entry.options.get("hub_serve") or not hub_token:
+                continue
+            data = self.hass.data.get(DOMAIN, {}).get(entry.entry_id)
+            if data is not None and hmac.compare_digest(token, hub_token.encode()):
+                return entry.entry_id, data
+        return None, None
+
+    async def get(self, request: web.Request, path: str) -> web.Response:
+        """最新の /devices・/appliances を返す. / Serve the latest /devices or /appliances."""
+        entry_id, data = self._authenticate(request)
+        if data is None:
+            return web.Response(status=HTTPStatus.UNAUTHORIZED)
+
+        path = f"/{path}"
+        coordinator = data["coordinator"]
+        if coordinator.data is None:
+            return web.Response(status=HTTPStatus.SERVICE_UNAVAILABLE)
+        snapshot = coordinator.snapshot
+        if path == "/devices":
+            body = snapshot.raw_devices
+        elif path == "/appliances":
+            body = snapshot.appliances
+        else:
+            return web.Response(status=HTTPStatus.NOT_FOUND)
+
+        # スナップショットが変わった時だけJSONに変換する / Encode only when the snapshot changed
+        cached = self._encoded.get((entry_id, path))
+        if cached is None or cached[0] is not snapshot:
+            items = list(body.values()) if path == "/appliances" else list(body)
+            cached = self._encoded[(entry_id, path)] = (
+                snapshot,
+                json.dumps(items, ensure_ascii=False).encode(),
+            )
+        return web.Response(body=cached[1], content_type="application/json")
+
+    async def post(self, request: web.Request, path: str) -> web.Response:
+        """コマンドをクラウドへ転送する. / Forward a command to the cloud."""
+        _, data = self._authenticate(request)
+        if data is None:
+            return web.Response(status=HTTPStatus.UNAUTHORIZED)
+
+        path = f"/{path}"
+        if not COMMAND_PATHS.match(path):
+            return web.Response(status=HTTPStatus.NOT_FOUND)
+
+        form = dict(await request.post())
+        _LOGGER.debug("Hub forwarding %s %s", path, form)
+        try:
+            response = await data["api"].forward("POST", path, form or None)
+        except (ClientError, TimeoutError) as err:
+            _LOGGER.error("Hub failed to forward %s: %s", path, err)
+            return web.Response(status=HTTPStatus.BAD_GATEWAY)
+        if response.status == 200:
+            # 応答は待たせず、まとめられたリフレッシュで新しい状態を取り込む
+            # Don't hold the response; a coalesced refresh picks up the new state
+            data["coordinator"].async_refresh_appliances()
+        return web.Response(
+            status=response.status,
+            text=response.text,
+            content_type="application/json",
+        )
@@ -0,0 +1,216 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Mapping
+import logging
+import time
+from typing import Any
+
+from aiohttp import ClientError
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .api import is_replayable
+
+_LOGGER = logging.getLogger(__name__)
+
+JOURNAL_STORAGE_VERSION = 1
+# 書き込みをまとめる遅延（秒） / Delay that batches writes (seconds)
+SAVE_DELAY = 5
+# 既定の有効期限（分） / Default expiry (minutes)
+DEFAULT_JOURNAL_TTL = 30
+JOURNAL_TTL_CHOICES = [5, 15, 30, 60, 180]
+
+
+def coalescing_keys(
+    kind: str, target: str, data: Mapping[str, Any] | None
+) -> list[tuple[str, dict]]:
+    """
+    コマンドを(まとめるキー, そのキーの内容)に分ける.
+    エアコンは設定項目毎、照明は家電毎、シグナルはシグナル毎に最新の意図だけを残す.
+
+    Split a command into (coalescing key, fields for that key). Air conditioners
+    keep the latest intent per setting, lights per appliance and signals per signal.
+    """
+    if kind == "aircon":
+        return [
+            (f"aircon:{target}:{field}", {field: value})
+            for field, value in (data or {}).items()
+        ]
+    return [(f"{kind}:{target}", dict(data or {}))]
+
+
+def superseded_keys(kind: str, target: str, data: Mapping[str, Any] | None) -> list[str]:
+    """
+    コマンドによって古くなるキー.
+    エアコンのボタン（電源）以外の設定変更は電源を入れるので、古いボタンの記録も古くなる.
+
+    Keys a command makes stale. Changing any air conditioner setting other than
+    the button turns it on, so it also supersedes an older button record.
+    """
+    keys = [key for key, _ in coalescing_keys(kind, target, data)]
+    if kind == "aircon" and data and "button" not in data:
+        keys.append(f"aircon:{target}:button")
+    return keys
+
+
+class CommandJournal:
+    """
+    クラウドに届かなかったコマンドを有効期限付きで永続化し、接続回復時や再起動後に再送するジャーナル.
+    同じキーの古い意図は新しい意図で置き換え、再送は記録順に、同じ送信先の項目をまとめて行う.
+
+    Journal that persists commands the cloud never received, with an expiry, and
+    replays them once connectivity returns or after a restart. A newer intent
+    replaces the older one for the same key; replay runs in recorded order and
+    merges the fields bound for the same endpoint.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """初期化. / Initialize the journal."""
+        self._store = Store(
+            hass, JOURNAL_STORAGE_VERSION, f"nature_remo.journal.{entry_id}"
+        )
+        self.enabled = False
+        self.ttl = DEFAULT_JOURNAL_TTL * 60
+        # キー → 記録（挿入順が記録順） / Key → record, in recorded order
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._seq = 0
+        self._replay_lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def async_load(self) -> None:
+        """保存済みのジャーナルを読み込む（期限切れは捨てる）. / Load the stored journal, dropping expired records."""
+        records = await self._store.async_load() or []
+        self._entries = {record["key"]: record for record in records}
+        self._seq = max((record["seq"] for record in records), default=0)
+        if self._prune(time.time()):
+            self._save()
+
+    @callback
+    def configure(self, enabled: bool, ttl_minutes: float) -> None:
+        """
+        オプションを反映する（無効にした場合は記録を破棄する）.
+        Apply the options; turning the journal off discards its records.
+        """
+        self.enabled = enabled
+        self.ttl = ttl_minutes * 60
+        if not enabled and self._entries:
+            _LOGGER.info("Command journal disabled, dropping %d records", len(self._entries))
+            self._entries.clear()
+            self._save()
+
+    def _save(self) -> None:
+        self._store.async_delay_save(lambda: list(self._entries.values()), SAVE_DELAY)
+
+    def _prune(self, now: float) -> bool:
+        expired = [key for key, record in self._entries.items() if record["expires_at"] <= now]
+        for key in expired:
+            _LOGGER.debug("Dropping expired journaled command %s", key)
+            del self._entries[key]
+        return bool(expired)
+
+    @callback
+    def async_record(
+        self, kind: str, target: str, path: str, data: Mapping[str, Any] | None
+    ) -> bool:
+        """
+        届かなかったコマンドを記録する（同じキーの古い意図は置き換える）. 記録した場合はTrue.
+        Record a command that did not land, replacing older intents for the same keys.
+        Returns True when recorded.
+        """
+        if not self.enabled:
+            return False
+        now = time.time()
+        for key in superseded_keys(kind, target, data):
+            self._entries.pop(key, None)
+        for key, fields in coalescing_keys(kind, target, data):
+            self._seq += 1
+            # 置き換えた意図は末尾（最新の位置）へ移す / A replaced intent moves to the end
+            self._entries[key] = {
+                "key": key,
+                "kind": kind,
+                "target": target,
+                "path": path,
+                "data": fields,
+                "seq": self._seq,
+                "expires_at": now + self.ttl,
+            }
+        self._save()
+        return True
+
+    @callback
+    def async_resolve(
+        self, kind: str, target: str, data: Mapping[str, Any] | None
+    ) -> None:
+        """
+        送信に成功したコマンドで古くなった記録を捨てる.
+        Drop records superseded by a command that was just delivered.
+        """
+        if not self._entries:
+            return
+        removed = [
+            key
+            for key in superseded_keys(kind, target, data)
+            if self._entries.pop(key, None) is not None
+        ]
+        if removed:
+            self._save()
+
+    def _batches(self) -> list[tuple[str, str, str, dict, dict[str, int]]]:
+        """
+        送信先毎に項目をまとめ、各送信先の最新の記録の順に並べる.
+        Merge fields per endpoint, ordered by each endpoint's latest record.
+        """
+        batches: dict[str, tuple[str, str, str, dict, dict[str, int]]] = {}
+        for record in self._entries.values():
+            path = record["path"]
+            # 新しい記録の順に並ぶよう、既存の送信先は末尾へ移す / Re-append so the order follows the latest record
+            batch = batches.pop(path, None) or (
+                record["kind"], record["target"], path, {}, {}
+            )
+            batch[3].update(record["data"])
+            batch[4][record["key"]] = record["seq"]
+            batches[path] = batch
+        return list(batches.values())
+
+    async def async_replay(
+        self,
+        send: Callable[[str, str, str, dict | None], Awaitable[int]],
+    ) -> None:
+        """
+        記録したコマンドを順に再送する. sendはHTTPステータスを返す.
+        通信エラーや一時的な失敗で中断し、残りは次の機会に再送する.
+
+        Replay the recorded commands in order; send returns the HTTP status.
+        Stops at a transport error or transient failure and leaves the rest for
+        the next attempt.
+        """
+        if self._replay_lock.locked() or not self._entries:
+            return
+        async with self._replay_lock:
+            if self._prune(time.time()):
+                self._save()
+            batches = self._batches()
+            if not batches:
+                return
+            _LOGGER.info("Replaying %d journaled Nature Remo commands", len(batches))
+            for kind, target, path, data, seqs in batches:
+                try:
+                    status = await send(kind, target, path, data or None)
+                except (ClientError, TimeoutError) as err:
+                    _LOGGER.debug("Journal replay stopped at %s: %s", path, err)
+                    return
+                if is_replayable(kind, status):
+                    _LOGGER.debug("Journal replay stopped at %s: %s", path, status)
+                    return
+                if status != 200:
+                    _LOGGER.warning(
+                        "Dropping journaled command %s rejected with %s", path, status
+                    )
+                # 再送中に新しい意図が記録されたキーは残す / Keep keys that got a newer intent meanwhile
+                for key, seq in seqs.items():
+                    record = self._entries.get(key)
+                    if record is not None and record["seq"] == seq:
+                        del self._entries[key]
+                self._save()
@@ -8,8 +8,11 @@ from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from .coordinator import NatureRemoCoordinator
 from .const import DOMAIN
+from .profiler import profiled
+from .tracing import Tracer
 
 _LOGGER = logging.getLogger(__name__)
+_TRACER = Tracer("light")
 
 CONF_TOKEN = "token"
 CONF_NAME = "name"
@@ -40,20 +43,22 @@ async def async_setup_entry(
     ]
     api = hass.data[DOMAIN][entry.entry_id]["api"]
 
-    entities = []
-    for appliance in coordinator.lights.values():
-        entity = NatureRemoLight(
+    if not coordinator.lights:
+        _LOGGER.warning("No light appliances matched selected IDs.")
+
+    # 家電の増減をリフレッシュ毎に反映する / Follow appliance additions and removals on every refresh
+    coordinator.async_track_entities(
+        entry,
+        async_add_entities,
+        lambda: coordinator.lights,
+        lambda appliance_id, appliance: NatureRemoLight(
             coordinator=coordinator,
             appliance=appliance,
             device=appliance["device"],
             api=api,
-        )
-        entities.append(entity)
-
-    if not entities:
-        _LOGGER.warning("No light appliances matched selected IDs.")
-
-    async_add_entities(entities, True)
+        ),
+        update_before_add=True,
+    )
 
 
 class NatureRemoLight(LightEntity):
@@ -69,6 +74,7 @@ class NatureRemoLight(LightEntity):
         self._coordinator = coordinator  # コーディネーターを使う
         self._appliance = appliance
         self._device = device
+        self._attr_device_info = coordinator.device_info(device)
         self._appliance_id = appliance["appliance_id"]
         self._attr_supported_color_modes = ColorMode.ONOFF
         self._is_on = False  # 照明のON/OFF状態
@@ -77,15 +83,6 @@ class NatureRemoLight(LightEntity):
 
         self._api = api
 
-    @property
-    def device_info(self):
-        return {
-            "identifiers": {(DOMAIN, self._device["device_id"])},
-            "name": self._device["name"],
-            "manufacturer": "Nature",
-            "model": self._device.get("firmware_version", "Nature Remo"),
-        }
-
     @property
     def supported_color_modes(self):
         """ライトの種類を定義する. / Define the type or category of the light."""
@@ -113,24 +110,56 @@ class NatureRemoLight(LightEntity):
         エンティティがHome Assistantに追加されたら更新をトリガー.
         Trigger update when the entity is added to Home Assistant.
         """
-        _LOGGER.info(
-            f"[{self._attr_name}] async_added_to_hass: Light entity complete setup"
+        _LOGGER.debug(
+            "[%s] async_added_to_hass: Light entity complete setup", self._attr_name
         )
         self.async_on_remove(self._coordinator.async_add_listener(self.update_status))
         self.update_status()
         self.async_write_ha_state()  # 状態をHome Assistantに通知
-        self._coordinator.entity_map[self.entity_id] = self
+        self.async_on_remove(
+            self._coordinator.entities.async_add(
+                self, self._appliance_id, self._device["device_id"]
+            )
+        )
+
+    async def async_send_mode(self, mode: str) -> None:
+        """
+        ボタン名（動作モード）を送信し、状態を即時更新する.
+        Send a button name (mode) and update the state immediately.
+        """
+        if mode not in self._supported_effects:
+            raise HomeAssistantError(f"Effect '{mode}' is not supported by this light")
+
+        # NatureRemo APIへリクエスト送信
+        await self._api.send_light_command(self._appliance_id, mode)
+
+        # エンティティの内部状態を即時更新
+        self._last_mode = mode
+        self._is_on = mode != "off"
+        self.async_write_ha_state()
+
+    @property
+    def appliance_id(self) -> str:
+        """家電ID. / Appliance ID."""
+        return self._appliance_id
 
+    @profiled("light.update_status")
     def update_status(self) -> None:
         """
         コーディネーターで取得した値に状態を更新する.
         Update the light state based on coordinator data.
         """
-        _LOGGER.debug(f"[{self._attr_name}] Start update_status.")
+        _TRACER.debug("[%s] Start update_status.", self._attr_name)
         appliance = self._coordinator.data.get(self._appliance_id, {})
 
         if appliance and "light" in appliance:
-            _LOGGER.info("Nature Remo Settings: %s", appliance["light"])
+            _TRACER.limited(
+                self._appliance_id,
+                300,
+                "[%s] Nature Remo Settings: %s",
+                self._attr_name,
+                appliance["light"],
+            )
 
             # 現在の状態（ON/OFF）を取得
             state = appliance["light"]["state"]
@@ -141,7 +170,7 @@ class NatureRemoLight(LightEntity):
             # 有効な効果を取得
             effect_buttons = appliance["light"].get("buttons", [])
             self._supported_effects = [btn["name"] for btn in effect_buttons]
-            _LOGGER.debug(f"[{self._attr_name}]有効ボタン: {self._supported_effects}")
+            _TRACER.debug("[%s]有効ボタン: %s", self._attr_name, self._supported_effects)
 
         # HomeAssistantへ状態を通知
         self.async_write_ha_state()
@@ -151,7 +180,7 @@ class NatureRemoLight(LightEntity):
         ライトをremo_light_modeで指定した状態でONにする.
         Turn on the light with a specified remo_light_mode.
         """
-        _LOGGER.debug(f"kwargs: {kwargs}")
+        _LOGGER.debug("kwargs: %s", kwargs)
         mode = kwargs.get("remo_light_mode", "on")
 
         # サポートされていないlight_modeの場合はエラー
@@ -160,7 +189,7 @@ class NatureRemoLight(LightEntity):
 
         # NatureRemo APIへリクエスト送信
         response = await self._api.send_light_command(self._appliance_id, mode)
-        _LOGGER.debug(f"[{self._attr_name}]send_light_command response: {response}")
+        _LOGGER.debug("[%s]send_light_command response: %s", self._attr_name, response)
 
         # 状態を更新
         self._is_on = mode != "off"
@@ -0,0 +1,273 @@
+import asyncio
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+import logging
+from typing import Any
+
+from aiohttp import ClientError
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.storage import Store
+
+from .remote import NatureRemoRemoteEntity
+
+_LOGGER = logging.getLogger(__name__)
+
+MACRO_STORAGE_KEY = "nature_remo.macros"
+MACRO_STORAGE_VERSION = 1
+
+# 進捗イベント / Progress event
+EVENT_MACRO_PROGRESS = "nature_remo_macro_progress"
+
+# 繰り返し送信の既定の間隔（秒） / Default interval between repeated sends (seconds)
+DEFAULT_REPEAT_INTERVAL = 0.3
+
+
+@dataclass(frozen=True, slots=True)
+class PlannedSignal:
+    """
+    コンパイル済みの1送信（マクロ開始からのオフセット付き）.
+    One compiled send, with its offset from the start of the macro.
+    """
+
+    offset: float
+    device_id: str
+    signal_id: str
+    label: str
+
+
+@dataclass(frozen=True, slots=True)
+class MacroPlan:
+    """
+    マクロを1回だけコンパイルした送信計画.
+    Dispatch plan compiled once per macro.
+    """
+
+    name: str
+    signals: tuple[PlannedSignal, ...]
+    appliance_ids: frozenset[str]
+    api: Any
+
+
+def compile_macro(
+    name: str,
+    steps: list[dict],
+    resolve: Callable[[str], NatureRemoRemoteEntity | None],
+) -> MacroPlan:
+    """
+    マクロの手順をシグナルIDと開始からのオフセットの列へ変換する.
+    ステップは {"remote", "command", "repeat", "interval", "delay"}、または待機だけの {"delay"}.
+
+    Compile macro steps into signal IDs with offsets from the start.
+    A step is {"remote", "command", "repeat", "interval", "delay"} or a bare {"delay"}.
+    """
+    signals = []
+    appliance_ids = set()
+    api = None
+    offset = 0.0
+    for index, step in enumerate(steps):
+        if "remote" in step:
+            remote = resolve(step["remote"])
+            if remote is None:
+                raise ValueError(f"Step {index}: {step['remote']} is not a Nature Remo remote")
+            signal_id = remote.signal_id(step.get("command", ""))
+            if signal_id is None:
+                raise ValueError(
+                    f"Step {index}: unknown command {step.get('command')!r} for {step['remote']}"
+                )
+            # 1つのマクロは1つのアカウント（APIクライアント）に閉じる
+            # A macro stays within one account (API client)
+            if api is not None and remote.coordinator.api is not api:
+                raise ValueError(f"Step {index}: remotes from different accounts")
+            api = remote.coordinator.api
+            appliance_ids.add(remote.appliance_id)
+
+            repeat = max(1, int(step.get("repeat", 1)))
+            interval = float(step.get("interval", DEFAULT_REPEAT_INTERVAL))
+            for count in range(repeat):
+                signals.append(
+                    PlannedSignal(
+                        offset=offset,
+                        device_id=remote.device_id,
+                        signal_id=signal_id,
+                        label=f"{step['remote']}:{step['command']}",
+                    )
+                )
+                if count < repeat - 1:
+                    offset += interval
+        offset += float(step.get("delay", 0))
+
+    if not signals:
+        raise ValueError(f"Macro {name} has no signals to send")
+    return MacroPlan(name, tuple(signals), frozenset(appliance_ids), api)
+
+
+class MacroExecutor:
+    """
+    赤外線マクロの保存・コンパイル・実行を行う（全エントリーで1つ）.
+    送信はRemoデバイス毎に直列化し、各送信は開始時刻からの絶対時刻で待つためずれが蓄積しない.
+
+    Stores, compiles and runs IR macros; one instance shared by every entry.
+    Sends are serialized per Remo device, and each send waits for an absolute
+    deadline from the start so delays don't drift.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        resolve: Callable[[str], NatureRemoRemoteEntity | None],
+    ) -> None:
+        """初期化. / Initialize the executor."""
+        self.hass = hass
+        self._resolve = resolve
+        self._store = Store(hass, MACRO_STORAGE_VERSION, MACRO_STORAGE_KEY)
+        self._macros: dict[str, list[dict]] | None = None
+        self._plans: dict[str, MacroPlan] = {}
+        self._running: dict[str, asyncio.Task] = {}
+        # 実行中のマクロの計画 / Plans of the running macros
+        self._running_plans: dict[str, MacroPlan] = {}
+        self._device_locks: dict[str, asyncio.Lock] = {}
+
+    async def _async_macros(self) -> dict[str, list[dict]]:
+        """保存済みのマクロを1回だけ読み込む. / Load the stored macros once."""
+        if self._macros is None:
+            self._macros = await self._store.async_load() or {}
+        return self._macros
+
+    async def async_define(self, name: str, steps: list[dict]) -> MacroPlan:
+        """
+        マクロを検証・コンパイルして保存する.
+        Validate, compile and store a macro.
+        """
+        plan = compile_macro(name, steps, self._resolve)
+        macros = await self._async_macros()
+        macros[name] = steps
+        self._plans[name] = plan
+        await self._store.async_save(macros)
+        return plan
+
+    async def async_delete(self, name: str) -> None:
+        """マクロを削除する（実行中なら中止する）. / Delete a macro, cancelling it if running."""
+        self.cancel(name)
+        macros = await self._async_macros()
+        if macros.pop(name, None) is not None:
+            await self._store.async_save(macros)
+        self._plans.pop(name, None)
+
+    @callback
+    def invalidate(self, appliance_ids: Iterable[str]) -> None:
+        """
+        シグナルが変化した家電を使うマクロのコンパイル結果を破棄する.
+        Drop compiled plans that use appliances whose signals changed.
+        """
+        changed = set(appliance_ids)
+        if not changed:
+            return
+        for name, plan in list(self._plans.items()):
+            if plan.appliance_ids & changed:
+                del self._plans[name]
+
+    async def async_run(self, name: str) -> None:
+        """
+        マクロをバックグラウンドで開始する（実行中なら最初からやり直す）.
+        Start a macro in the background, restarting it if already running.
+        """
+        plan = self._plans.get(name)
+        if plan is None:
+            macros = await self._async_macros()
+            if name not in macros:
+                raise ValueError(f"Nature Remo macro '{name}' is not defined")
+            plan = self._plans[name] = compile_macro(name, macros[name], self._resolve)
+
+        self.cancel(name)
+        task = self.hass.async_create_background_task(
+            self._async_execute(plan), f"nature_remo macro {name}"
+        )
+        self._running[name] = task
+        self._running_plans[name] = plan
+
+        def _done(finished: asyncio.Task) -> None:
+            if self._running.get(name) is finished:
+                del self._running[name]
+                del self._running_plans[name]
+
+        task.add_done_callback(_done)
+
+    @callback
+    def cancel(self, name: str) -> bool:
+        """実行中のマクロを中止する. / Cancel a running macro."""
+        task = self._running.pop(name, None)
+        if task is None:
+            return False
+        del self._running_plans[name]
+        task.cancel()
+        return True
+
+    @callback
+    def async_forget_api(self, api: Any) -> None:
+        """
+        エントリーの削除時に、そのAPIクライアントを使う計画を破棄し、実行中なら中止する.
+        再読み込み後は新しいクライアントで計画をコンパイルし直す.
+
+        When an entry unloads, drop the plans that use its API client and cancel
+        them if running. After a reload the plans are recompiled against the new client.
+        """
+        for name, plan in list(self._running_plans.items()):
+            if plan.api is api:
+                self.cancel(name)
+        for name, plan in list(self._plans.items()):
+            if plan.api is api:
+                del self._plans[name]
+
+    @callback
+    def cancel_all(self) -> None:
+        """すべての実行中マクロを中止する. / Cancel every running macro."""
+        for name in list(self._running):
+            self.cancel(name)
+
+    def _fire(self, plan: MacroPlan, step: int, status: str, label: str = "") -> None:
+        self.hass.bus.async_fire(
+            EVENT_MACRO_PROGRESS,
+            {
+                "name": plan.name,
+                "step": step,
+                "total": len(plan.signals),
+                "command": label,
+                "status": status,
+            },
+        )
+
+    async def _async_execute(self, plan: MacroPlan) -> None:
+        """
+        コンパイル済みの計画を実行する.
+        Run a compiled plan.
+        """
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        step = 0
+        try:
+            for step, signal in enumerate(plan.signals, 1):
+                delay = start + signal.offset - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                lock = self._device_locks.setdefault(signal.device_id, asyncio.Lock())
+                async with lock:
+                    # 時間指定の連続送信なので、遅れて再送されないようジャーナルに記録しない
+                    # A timed sequence must not be replayed late, so skip the journal
+                    await plan.api.send_command_signal(signal.signal_id, journal=False)
+                self._fire(plan, step, "sent", signal.label)
+        except asyncio.CancelledError:
+            self._fire(plan, step, "cancelled")
+            raise
+        except (ClientError, TimeoutError, HomeAssistantError) as err:
+            _LOGGER.error("Macro %s failed at step %d: %s", plan.name, step, err)
+            self._fire(plan, step, "failed")
+            return
+        _LOGGER.debug(
+            "Macro %s finished in %.2fs (planned %.2fs)",
+            plan.name,
+            loop.time() - start,
+            plan.signals[-1].offset,
+        )
+        self._fire(plan, step, "completed")
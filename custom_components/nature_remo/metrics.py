@@ -0,0 +1,64 @@
+import bisect
+from collections import deque
+
+# ヒストグラムのバケット境界（秒） / Histogram bucket upper bounds (seconds)
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0)
+
+
+class LatencyHistogram:
+    """
+    レイテンシを固定バケットで集計するヒストグラム.
+    直近のサンプルも保持し、パーセンタイルを推定できるようにする.
+
+    Fixed-bucket latency histogram.
+    Also keeps a window of recent samples so percentiles can be estimated.
+    """
+
+    def __init__(self, window: int = 100) -> None:
+        """初期化. / Initialize the histogram."""
+        # 最後のバケットは上限なし（+Inf） / The last bucket is +Inf
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.hedged_buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.hedged_count = 0
+        self.total = 0.0
+        self._recent: deque[float] = deque(maxlen=window)
+
+    def observe(self, seconds: float, hedged: bool = False) -> None:
+        """
+        サンプルを1件記録する.
+        Record a single latency sample.
+        """
+        index = bisect.bisect_left(LATENCY_BUCKETS, seconds)
+        self.buckets[index] += 1
+        self.count += 1
+        self.total += seconds
+        if hedged:
+            self.hedged_buckets[index] += 1
+            self.hedged_count += 1
+        self._recent.append(seconds)
+
+    def percentile(self, q: float, min_samples: int = 1) -> float | None:
+        """
+        直近サンプルからパーセンタイルを推定する（サンプル不足ならNone）.
+        Estimate a percentile from recent samples (None if there are too few).
+        """
+        if len(self._recent) < max(min_samples, 1):
+            return None
+        ordered = sorted(self._recent)
+        index = min(int(q * len(ordered)), len(ordered) - 1)
+        return ordered[index]
+
+    def as_dict(self) -> dict:
+        """
+        診断用に内容を辞書で返す.
+        Return the histogram contents as a dict for diagnostics.
+        """
+        labels = [str(b) for b in LATENCY_BUCKETS] + ["+Inf"]
+        return {
+            "count": self.count,
+            "sum": round(self.total, 3),
+            "buckets": dict(zip(labels, self.buckets)),
+            "hedged_count": self.hedged_count,
+            "hedged_buckets": dict(zip(labels, self.hedged_buckets)),
+        }
@@ -3,7 +3,16 @@ from homeassistant import config_entries
 from homeassistant.core import callback
 from homeassistant.helpers.device_registry import async_get as async_get_device_registry
 import voluptuous as vol
-from .const import DOMAIN
+from .const import (
+    DEFAULT_TIMEOUT_APPLIANCES,
+    DEFAULT_TIMEOUT_COMMANDS,
+    DEFAULT_SENSOR_HEARTBEAT,
+    DEFAULT_TIMEOUT_DEVICES,
+    DOMAIN,
+)
+from .journal import DEFAULT_JOURNAL_TTL, JOURNAL_TTL_CHOICES
+from .polling import MODES, POLL_INTERVAL_CHOICES
+from .sensor import DEVICE_SENSORS
 
 
 _LOGGER = logging.getLogger(__name__)
@@ -28,25 +37,8 @@ class NatureRemoOptionsFlowHandler(config_entries.OptionsFlow):
                 elif label in self.device_id_map:
                     result[self.device_id_map[label]] = value
 
-            lang = self.hass.config.language
-            if lang == "ja":
-                title = "再読み込みが必要です"
-                message = "Nature Remoの統合を再読み込みしてください。"
-            else:
-                title = "Reload Required"
-                message = "Please reload the Nature Remo integration to apply changes."
-
-            await self.hass.services.async_call(
-                "persistent_notification",
-                "create",
-                {
-                    "title": title,
-                    "message": message,
-                    "notification_id": "nature_remo_reload_needed",
-                },
-                blocking=True,
-            )
-
+            # 変更はupdate listenerで稼働中の統合へ即時反映される
+            # Changes are applied live by the entry's update listener
             return self.async_create_entry(title="", data=result)
 
         device_registry = async_get_device_registry(self.hass)
@@ -61,20 +53,188 @@ class NatureRemoOptionsFlowHandler(config_entries.OptionsFlow):
         lang = self.hass.config.language
         if lang == "ja":
             interval_label = "更新間隔（秒）"
+            timeout_devices_label = "タイムアウト：デバイス取得（秒）"
+            timeout_appliances_label = "タイムアウト：家電取得（秒）"
+            timeout_commands_label = "タイムアウト：操作コマンド（秒）"
+            hedge_label = "遅延時にGETリクエストを追加送信する（ヘッジ）"
+            deadband_labels = {
+                "te": "温度の不感帯（℃）",
+                "hu": "湿度の不感帯（%）",
+                "il": "照度の不感帯",
+            }
+            min_interval_label = "センサーの最小書き込み間隔（秒）"
+            heartbeat_label = "センサーの最大書き込み間隔（秒）"
+            cassette_label = "API通信を記録する（カセット）"
+            hub_serve_label = "このインスタンスをハブとして公開する"
+            hub_serve_token_label = "ハブとして受け付けるトークン"
+            hub_url_label = "接続先ハブのURL（空ならクラウド）"
+            hub_token_label = "接続先ハブのトークン"
+            mode_names = {"home": "在宅", "away": "外出", "sleep": "睡眠"}
+            poll_devices_label = "{}：デバイス取得間隔（秒）"
+            poll_appliances_label = "{}：家電取得間隔（秒）"
+            presence_label = "在宅状態のエンティティ（zone・person・group）"
+            sleep_start_label = "睡眠の開始時刻（HH:MM）"
+            sleep_end_label = "睡眠の終了時刻（HH:MM）"
+            quota_label = "1日のリクエスト上限（0は無制限）"
+            journal_label = "届かなかった操作を保存して後で再送する"
+            journal_ttl_label = "再送する操作の有効期限（分）"
             ip_label_suffix = "：IPアドレス"
         else:
             interval_label = "Update Interval (seconds)"
+            timeout_devices_label = "Timeout: devices (seconds)"
+            timeout_appliances_label = "Timeout: appliances (seconds)"
+            timeout_commands_label = "Timeout: commands (seconds)"
+            hedge_label = "Send a hedged GET request when slow"
+            deadband_labels = {
+                "te": "Temperature deadband (°C)",
+                "hu": "Humidity deadband (%)",
+                "il": "Illuminance deadband",
+            }
+            min_interval_label = "Sensor minimum write interval (seconds)"
+            heartbeat_label = "Sensor maximum silence (seconds)"
+            cassette_label = "Record API traffic (cassette)"
+            hub_serve_label = "Serve this instance as a hub"
+            hub_serve_token_label = "Token this hub accepts"
+            hub_url_label = "Hub URL to use (empty for the cloud)"
+            hub_token_label = "Token for the hub URL"
+            mode_names = {"home": "Home", "away": "Away", "sleep": "Sleep"}
+            poll_devices_label = "{}: devices interval (seconds)"
+            poll_appliances_label = "{}: appliances interval (seconds)"
+            presence_label = "Presence entity (zone, person or group)"
+            sleep_start_label = "Sleep start (HH:MM)"
+            sleep_end_label = "Sleep end (HH:MM)"
+            quota_label = "Daily request ceiling (0 for none)"
+            journal_label = "Keep commands that did not go through and replay them"
+            journal_ttl_label = "Replay commands for up to (minutes)"
             ip_label_suffix = ": IP Address"
 
-        self.special_key_map = {interval_label: "update_interval"}
+        self.special_key_map = {
+            interval_label: "update_interval",
+            timeout_devices_label: "timeout_devices",
+            timeout_appliances_label: "timeout_appliances",
+            timeout_commands_label: "timeout_commands",
+            hedge_label: "hedge_requests",
+            min_interval_label: "sensor_min_interval",
+            heartbeat_label: "sensor_heartbeat",
+            cassette_label: "record_cassette",
+            hub_serve_label: "hub_serve",
+            hub_serve_token_label: "hub_serve_token",
+            hub_url_label: "hub_url",
+            hub_token_label: "hub_token",
+            presence_label: "presence_entity",
+            sleep_start_label: "sleep_start",
+            sleep_end_label: "sleep_end",
+            quota_label: "daily_quota",
+            journal_label: "command_journal",
+            journal_ttl_label: "journal_ttl",
+        }
+        for mode in MODES:
+            self.special_key_map[poll_devices_label.format(mode_names[mode])] = (
+                f"poll_{mode}_devices"
+            )
+            self.special_key_map[poll_appliances_label.format(mode_names[mode])] = (
+                f"poll_{mode}_appliances"
+            )
+        for key, label in deadband_labels.items():
+            self.special_key_map[label] = f"deadband_{key}"
         self.device_id_map = {}
 
         interval_default = options.get("update_interval", 60)
+        timeout_choices = [5, 10, 15, 30, 60]
         data_schema = {
             vol.Optional(interval_label, default=interval_default): vol.In(
                 [30, 60, 90]
             ),
+            vol.Optional(
+                timeout_devices_label,
+                default=options.get("timeout_devices", DEFAULT_TIMEOUT_DEVICES),
+            ): vol.In(timeout_choices),
+            vol.Optional(
+                timeout_appliances_label,
+                default=options.get("timeout_appliances", DEFAULT_TIMEOUT_APPLIANCES),
+            ): vol.In(timeout_choices),
+            vol.Optional(
+                timeout_commands_label,
+                default=options.get("timeout_commands", DEFAULT_TIMEOUT_COMMANDS),
+            ): vol.In(timeout_choices),
+            vol.Optional(
+                hedge_label, default=options.get("hedge_requests", False)
+            ): bool,
         }
+        for key, label in deadband_labels.items():
+            data_schema[
+                vol.Optional(
+                    label,
+                    default=options.get(
+                        f"deadband_{key}", DEVICE_SENSORS[key].deadband
+                    ),
+                )
+            ] = vol.All(vol.Coerce(float), vol.Range(min=0))
+        data_schema[
+            vol.Optional(
+                min_interval_label, default=options.get("sensor_min_interval", 0)
+            )
+        ] = vol.In([0, 30, 60, 120, 300])
+        data_schema[
+            vol.Optional(
+                heartbeat_label,
+                default=options.get("sensor_heartbeat", DEFAULT_SENSOR_HEARTBEAT),
+            )
+        ] = vol.In([300, 900, 1800, 3600])
+        data_schema[
+            vol.Optional(
+                cassette_label, default=options.get("record_cassette", False)
+            )
+        ] = bool
+        data_schema[
+            vol.Optional(hub_serve_label, default=options.get("hub_serve", False))
+        ] = bool
+        data_schema[
+            vol.Optional(
+                hub_serve_token_label,
+                default=options.get("hub_serve_token", options.get("hub_token", "")),
+            )
+        ] = str
+        data_schema[
+            vol.Optional(hub_url_label, default=options.get("hub_url", ""))
+        ] = str
+        data_schema[
+            vol.Optional(hub_token_label, default=options.get("hub_token", ""))
+        ] = str
+
+        # モード毎のポーリング間隔（未設定なら更新間隔と同じ） / Per-mode polling, defaulting to the update interval
+        for mode in MODES:
+            for label, key in (
+                (poll_devices_label, f"poll_{mode}_devices"),
+                (poll_appliances_label, f"poll_{mode}_appliances"),
+            ):
+                data_schema[
+                    vol.Optional(
+                        label.format(mode_names[mode]),
+                        default=options.get(key, interval_default),
+                    )
+                ] = vol.In(sorted({*POLL_INTERVAL_CHOICES, interval_default}))
+        data_schema[
+            vol.Optional(presence_label, default=options.get("presence_entity", ""))
+        ] = str
+        data_schema[
+            vol.Optional(sleep_start_label, default=options.get("sleep_start", "00:00"))
+        ] = vol.Match(r"^\d{1,2}:\d{2}$")
+        data_schema[
+            vol.Optional(sleep_end_label, default=options.get("sleep_end", "00:00"))
+        ] = vol.Match(r"^\d{1,2}:\d{2}$")
+        data_schema[
+            vol.Optional(quota_label, default=options.get("daily_quota", 0))
+        ] = vol.All(vol.Coerce(int), vol.Range(min=0))
+        data_schema[
+            vol.Optional(journal_label, default=options.get("command_journal", False))
+        ] = bool
+        data_schema[
+            vol.Optional(
+                journal_ttl_label,
+                default=options.get("journal_ttl", DEFAULT_JOURNAL_TTL),
+            )
+        ] = vol.In(JOURNAL_TTL_CHOICES)
 
         for device in devices:
             name = device.name_by_user or device.name or "Unknown Device"
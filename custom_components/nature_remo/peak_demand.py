@@ -0,0 +1,70 @@
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .ring_buffer import SmartMeterHistory
+
+_LOGGER = logging.getLogger(__name__)
+
+PEAK_STORAGE_VERSION = 1
+# 書き込みをまとめる遅延（秒） / Delay that batches writes (seconds)
+SAVE_DELAY = 60
+
+
+def billing_period(now=None) -> str:
+    """
+    現在の契約期間（暦月、"YYYY-MM"）.
+    The current billing period: the calendar month as "YYYY-MM".
+    """
+    return (now or dt_util.now()).strftime("%Y-%m")
+
+
+class PeakDemandTracker:
+    """
+    スマートメーター毎のピーク需要を契約期間（暦月）単位で永続化する.
+    再起動後は保存した値を引き継ぎ、月が変わったらリセットする.
+
+    Persists each smart meter's peak demand per billing period (calendar month).
+    Stored peaks carry over restarts and are reset when the month changes.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """初期化. / Initialize the tracker."""
+        self._store = Store(hass, PEAK_STORAGE_VERSION, f"nature_remo.peaks.{entry_id}")
+        # 家電ID → {"period", "peaks"} / Appliance ID → {"period", "peaks"}
+        self._data: dict[str, dict[str, Any]] = {}
+        # 保存値を取り込み済みの履歴 / Histories that already took in the stored peaks
+        self._restored: set[str] = set()
+
+    async def async_load(self) -> None:
+        """保存済みのピーク需要を読み込む. / Load the stored peak demand."""
+        self._data = await self._store.async_load() or {}
+
+    @callback
+    def async_update(self, histories: dict[str, SmartMeterHistory]) -> None:
+        """
+        リフレッシュ毎に呼ばれ、保存値の取り込みと保存を行う.
+        月替わりのリセットはコーディネーターがサンプルを加える前に行う.
+
+        Called after each refresh: restores stored peaks and saves the current
+        ones. The coordinator resets them at a month change, before adding
+        that refresh's sample.
+        """
+        period = billing_period()
+        changed = False
+        for appliance_id, history in histories.items():
+            stored = self._data.get(appliance_id)
+            if appliance_id not in self._restored:
+                self._restored.add(appliance_id)
+                if stored is not None and stored["period"] == period:
+                    history.restore_peaks(stored["peaks"])
+
+            peaks = {str(minutes): value for minutes, value in history.peaks().items()}
+            if stored is None or stored["period"] != period or stored["peaks"] != peaks:
+                self._data[appliance_id] = {"period": period, "peaks": peaks}
+                changed = True
+        if changed:
+            self._store.async_delay_save(lambda: self._data, SAVE_DELAY)
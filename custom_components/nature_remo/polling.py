@@ -0,0 +1,185 @@
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import date, datetime, time as dt_time, timedelta
+import logging
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+# ポーリングのモード / Polling modes
+MODE_HOME = "home"
+MODE_AWAY = "away"
+MODE_SLEEP = "sleep"
+MODES = (MODE_HOME, MODE_AWAY, MODE_SLEEP)
+
+# オプションで選べる間隔（秒） / Intervals selectable in the options (seconds)
+POLL_INTERVAL_CHOICES = [30, 60, 90, 120, 300, 600, 900, 1800]
+
+# 在宅センサーがこれらの状態なら不在とみなす / Presence states treated as away
+AWAY_STATES = frozenset({"not_home", "away", "off", "0"})
+
+DEFAULT_SLEEP_START = "00:00"
+DEFAULT_SLEEP_END = "00:00"
+
+# 当日のリクエスト数の保存 / Storage for today's request count
+USAGE_STORAGE_VERSION = 1
+# 書き込みをまとめる遅延（秒） / Delay that batches writes (seconds)
+USAGE_SAVE_DELAY = 60
+
+
+@dataclass(frozen=True, slots=True)
+class PollingProfile:
+    """
+    モード毎の/devicesと/appliancesの取得間隔（秒）.
+    Per-mode fetch intervals for /devices and /appliances (seconds).
+    """
+
+    devices: float
+    appliances: float
+
+    def scaled(self, factor: float) -> "PollingProfile":
+        """間隔をfactor倍にした設定を返す. / Return the profile with both intervals scaled."""
+        return PollingProfile(self.devices * factor, self.appliances * factor)
+
+
+def _parse_time(value: str) -> dt_time:
+    """"HH:MM"を時刻に変換する. / Parse "HH:MM" into a time."""
+    hour, _, minute = value.partition(":")
+    return dt_time(int(hour), int(minute or 0))
+
+
+class PollingPolicy:
+    """
+    時間帯と在宅状態からポーリングのモードを選び、1日のリクエスト上限に収まるよう間隔を広げる.
+    Picks the polling mode from the time of day and presence, and stretches the
+    intervals so the day's requests stay under the configured ceiling.
+    """
+
+    def __init__(self) -> None:
+        """初期化. / Initialize the policy."""
+        self.profiles = {mode: PollingProfile(60, 60) for mode in MODES}
+        self.sleep_start = _parse_time(DEFAULT_SLEEP_START)
+        self.sleep_end = _parse_time(DEFAULT_SLEEP_END)
+        self.daily_quota = 0
+        # 当日の日付と、その日の開始時点のリクエスト数 / Today's date and the request count when it began
+        self._day = None
+        self._day_start_count = 0
+        self.requests_today = 0
+
+    def configure(self, options: Mapping[str, Any]) -> None:
+        """
+        オプションから各モードの間隔・睡眠時間帯・1日の上限を読み込む.
+        モード毎の間隔が未設定ならupdate_intervalを使う.
+
+        Load per-mode intervals, the sleep window and the daily ceiling from the
+        options. Modes without their own intervals fall back to update_interval.
+        """
+        base = options.get("update_interval", 60)
+        self.profiles = {
+            mode: PollingProfile(
+                options.get(f"poll_{mode}_devices", base),
+                options.get(f"poll_{mode}_appliances", base),
+            )
+            for mode in MODES
+        }
+        try:
+            self.sleep_start = _parse_time(
+                options.get("sleep_start", DEFAULT_SLEEP_START)
+            )
+            self.sleep_end = _parse_time(options.get("sleep_end", DEFAULT_SLEEP_END))
+        except ValueError:
+            _LOGGER.warning("Invalid sleep window, sleep profile disabled")
+            self.sleep_start = self.sleep_end = _parse_time(DEFAULT_SLEEP_START)
+        self.daily_quota = int(options.get("daily_quota", 0))
+
+    def record(self, request_count: int, now: datetime) -> None:
+        """
+        APIクライアントの累計リクエスト数から当日の使用数を更新する.
+        Update today's usage from the API client's running request count.
+        """
+        if now.date() != self._day:
+            self._day = now.date()
+            self._day_start_count = request_count
+        self.requests_today = request_count - self._day_start_count
+
+    def usage(self) -> dict[str, Any] | None:
+        """
+        保存用の当日の日付とリクエスト数（未記録ならNone）.
+        Today's date and request count for storage; None before the first record.
+        """
+        if self._day is None:
+            return None
+        return {"day": self._day.isoformat(), "requests": self.requests_today}
+
+    def restore_usage(self, usage: Mapping[str, Any], request_count: int) -> None:
+        """
+        保存した当日の使用数を引き継ぐ（日付が変わっていれば次のrecordでリセットされる）.
+        Carry over a stored day's usage; a different day is reset by the next record.
+        """
+        self._day = date.fromisoformat(usage["day"])
+        self._day_start_count = request_count - usage["requests"]
+        self.requests_today = usage["requests"]
+
+    def _in_sleep(self, now: datetime) -> bool:
+        start, end = self.sleep_start, self.sleep_end
+        if start == end:
+            return False
+        current = now.time()
+        if start < end:
+            return start <= current < end
+        # 日付を跨ぐ時間帯 / Window that crosses midnight
+        return current >= start or current < end
+
+    def mode(self, now: datetime, presence: str | None) -> str:
+        """
+        現在のモード（不在が睡眠より優先）.
+        Current mode; away takes precedence over sleep.
+        """
+        if presence is not None and presence in AWAY_STATES:
+            return MODE_AWAY
+        if self._in_sleep(now):
+            return MODE_SLEEP
+        return MODE_HOME
+
+    def _seconds_to_boundary(self, now: datetime) -> float | None:
+        """次に睡眠時間帯が切り替わるまでの秒数. / Seconds until the sleep window next changes."""
+        if self.sleep_start == self.sleep_end:
+            return None
+        candidates = []
+        for boundary in (self.sleep_start, self.sleep_end):
+            at = now.replace(
+                hour=boundary.hour, minute=boundary.minute, second=0, microsecond=0
+            )
+            if at <= now:
+                at += timedelta(days=1)
+            candidates.append((at - now).total_seconds())
+        return min(candidates)
+
+    def select(self, now: datetime, presence: str | None) -> tuple[str, PollingProfile]:
+        """
+        現在のモードと、上限を考慮した取得間隔を返す.
+        Return the current mode and its fetch intervals, adjusted for the ceiling.
+        """
+        mode = self.mode(now, presence)
+        profile = self.profiles[mode]
+
+        if self.daily_quota > 0:
+            midnight = (now + timedelta(days=1)).replace(
+                hour=0, minute=0, second=0, microsecond=0
+            )
+            seconds_left = (midnight - now).total_seconds()
+            remaining = max(self.daily_quota - self.requests_today, 1)
+            planned = seconds_left * (1 / profile.devices + 1 / profile.appliances)
+            if planned > remaining:
+                # 残りの上限に収まるよう両方の間隔を同じ比率で広げる
+                # Stretch both intervals by the same factor to fit what is left
+                profile = profile.scaled(planned / remaining)
+
+        # 時間帯の切り替えを跨いで待ち続けない / Don't sleep past a schedule boundary
+        boundary = self._seconds_to_boundary(now)
+        if boundary is not None:
+            limit = max(boundary + 1, 30)
+            profile = PollingProfile(
+                min(profile.devices, limit), min(profile.appliances, limit)
+            )
+        return mode, profile
@@ -0,0 +1,191 @@
+from contextlib import contextmanager, nullcontext
+import cProfile
+import functools
+import io
+import logging
+import os
+import pstats
+import time
+import tracemalloc
+
+from homeassistant.components import persistent_notification
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+_LOGGER = logging.getLogger(__name__)
+
+# このインテグレーションのソースがあるディレクトリ（レポートの絞り込みに使う）
+# Directory of this integration's sources, used to filter the report
+PACKAGE_DIR = os.path.dirname(__file__)
+
+
+class NatureRemoProfiler:
+    """
+    次のN回のリフレッシュ（またはコマンド）の間、cProfileとtracemallocで計測する.
+    ステージ毎（API通信、JSONデコード、パース、update_status等）の経過時間も集計する.
+
+    Profiles the next N refreshes (or commands) with cProfile and tracemalloc,
+    and accumulates wall time per stage (API I/O, JSON decode, parsing,
+    update_status, ...).
+    """
+
+    def __init__(self, hass: HomeAssistant, name: str) -> None:
+        """初期化. / Initialize the profiler."""
+        self.hass = hass
+        self.name = name
+        self.active = False
+        self._remaining = 0
+        self._profile: cProfile.Profile | None = None
+        self._started_tracemalloc = False
+        self._started_at = 0.0
+        # ステージ名 → [呼び出し回数, 合計秒] / Stage name → [calls, total seconds]
+        self._stages: dict[str, list] = {}
+
+    def start(self, count: int) -> None:
+        """
+        計測を開始する.
+        Start profiling for the next count refreshes or commands.
+        """
+        if self.active:
+            _LOGGER.warning("Profiling is already running for %s", self.name)
+            return
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError as err:
+            # 別のプロファイラー（HAのprofilerインテグレーション等）が動作中
+            # Another profiling tool (e.g. HA's profiler integration) is active
+            _LOGGER.warning("Cannot profile %s: %s", self.name, err)
+            return
+        self._profile = profile
+        self.active = True
+        self._remaining = count
+        self._stages = {}
+        self._started_at = time.perf_counter()
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+    def stage(self, name: str):
+        """
+        ステージの経過時間を計測するコンテキストマネージャを返す（計測中でなければ何もしない）.
+        Return a context manager timing a stage; a no-op when not profiling.
+        """
+        if not self.active:
+            return nullcontext()
+        return self._timed(name)
+
+    @contextmanager
+    def _timed(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            entry = self._stages.setdefault(name, [0, 0.0])
+            entry[0] += 1
+            entry[1] += time.perf_counter() - start
+
+    def tick(self) -> None:
+        """
+        リフレッシュまたはコマンドが1回完了したことを通知する.
+        最後の1回なら、現在のリスナー呼び出しが終わった後に計測を終了する.
+
+        Mark one refresh or command as finished. On the last one, profiling
+        stops once the current listener callbacks have run.
+        """
+        if not self.active:
+            return
+        self._remaining -= 1
+        if self._remaining == 0:
+            self.hass.loop.call_soon(self._finish)
+
+    def stop(self) -> None:
+        """レポートを書かずに計測を中止する. / Abandon profiling without writing a report."""
+        if not self.active:
+            return
+        self._profile.disable()
+        self._profile = None
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        self.active = False
+
+    def _finish(self) -> None:
+        """計測を終了し、レポートを書き出す. / Stop profiling and write the report."""
+        if not self.active:
+            return
+        self._profile.disable()
+        snapshot = tracemalloc.take_snapshot()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        self.active = False
+        elapsed = time.perf_counter() - self._started_at
+
+        summary = self._summary(elapsed)
+        report = "\n".join(
+            [summary, "", self._cprofile_report(), "", self._memory_report(snapshot)]
+        )
+        path = self.hass.config.path(
+            f"nature_remo_profile_{dt_util.now().strftime('%Y%m%d_%H%M%S')}.txt"
+        )
+        self.hass.async_add_executor_job(self._write, path, report)
+        persistent_notification.async_create(
+            self.hass,
+            f"{summary}\n\nReport: {path}",
+            title=f"Nature Remo profile: {self.name}",
+            notification_id=f"nature_remo_profile_{self.name}",
+        )
+        self._profile = None
+
+    def _summary(self, elapsed: float) -> str:
+        lines = [f"Window: {elapsed:.1f}s", "Stage | calls | total ms | avg ms"]
+        for name, (calls, total) in sorted(
+            self._stages.items(), key=lambda item: item[1][1], reverse=True
+        ):
+            lines.append(
+                f"{name} | {calls} | {total * 1000:.1f} | {total * 1000 / calls:.2f}"
+            )
+        return "\n".join(lines)
+
+    def _cprofile_report(self) -> str:
+        stream = io.StringIO()
+        stats = pstats.Stats(self._profile, stream=stream)
+        stats.sort_stats("cumulative").print_stats(PACKAGE_DIR, 40)
+        return stream.getvalue()
+
+    @staticmethod
+    def _memory_report(snapshot: tracemalloc.Snapshot) -> str:
+        snapshot = snapshot.filter_traces(
+            [tracemalloc.Filter(True, os.path.join(PACKAGE_DIR, "*"))]
+        )
+        lines = ["Top allocations (this integration):"]
+        for stat in snapshot.statistics("lineno")[:20]:
+            lines.append(str(stat))
+        return "\n".join(lines)
+
+    @staticmethod
+    def _write(path: str, report: str) -> None:
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(report)
+
+
+def profiled(stage: str):
+    """
+    エンティティのメソッドをステージとして計測するデコレーター.
+    Decorator timing an entity method as a profiler stage.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            coordinator = getattr(self, "_coordinator", None) or self.coordinator
+            profiler = coordinator.profiler
+            if not profiler.active:
+                return func(self, *args, **kwargs)
+            with profiler.stage(stage):
+                return func(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
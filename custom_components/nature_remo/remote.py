@@ -5,14 +5,15 @@ from typing import Any
 
 from homeassistant.components.remote import RemoteEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .api import NatureRemoAPI
+from .api import NatureRemoAPI, QueuedCommand
 from .const import DOMAIN
 from .coordinator import NatureRemoCoordinator
+from .profiler import profiled
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -31,14 +32,15 @@ async def async_setup_entry(
     ]
     api: NatureRemoAPI = hass.data[DOMAIN][entry.entry_id]["api"]
 
-    entities = [
-        NatureRemoRemoteEntity(
+    # リモコンの増減をリフレッシュ毎に反映する / Follow remote additions and removals on every refresh
+    coordinator.async_track_entities(
+        entry,
+        async_add_entities,
+        lambda: coordinator.ir_remotes,
+        lambda appliance_id, remote_info: NatureRemoRemoteEntity(
             coordinator=coordinator, api=api, remote_info=remote_info
-        )
-        for remote_info in coordinator.ir_remotes.values()
-    ]
-
-    async_add_entities(entities)
+        ),
+    )
 
 
 class NatureRemoRemoteEntity(CoordinatorEntity[NatureRemoCoordinator], RemoteEntity):
@@ -47,6 +49,9 @@ class NatureRemoRemoteEntity(CoordinatorEntity[NatureRemoCoordinator], RemoteEnt
     Representation of a Nature Remo IR Remote as a RemoteEntity.
     """
 
+    # コマンド一覧は記録しない / Don't record the command list in history
+    _unrecorded_attributes = frozenset({"available_commands"})
+
     def __init__(
         self,
         coordinator: NatureRemoCoordinator,
@@ -60,11 +65,18 @@ class NatureRemoRemoteEntity(CoordinatorEntity[NatureRemoCoordinator], RemoteEnt
         self._coordinator = coordinator
         self._api = api
         self._device = remote_info["device"]
+        self._attr_device_info = coordinator.device_info(self._device)
         self._appliance_id = remote_info["appliance_id"]
         self._remote_info = remote_info
-        self._commands = {s["name"].lower(): s["id"] for s in remote_info["signals"]}
-
         self._attr_state = "off"
+        self._build_commands(remote_info["signals"])
+
+    def _build_commands(self, signals: list[dict[str, Any]]) -> None:
+        """
+        シグナル一覧からコマンド索引と電源ON/OFFのシグナルIDを作成する.
+        Build the command index and power on/off signal IDs from the signal list.
+        """
+        self._commands = {s["name"].lower(): s["id"] for s in signals}
         # コマンド候補を保存
         self._power_on_id = next(
             (self._commands[c] for c in ON_COMMANDS if c in self._commands), None
@@ -72,28 +84,68 @@ class NatureRemoRemoteEntity(CoordinatorEntity[NatureRemoCoordinator], RemoteEnt
         self._power_off_id = next(
             (self._commands[c] for c in OFF_COMMANDS if c in self._commands), None
         )
+        self._command_names = list(self._commands)
+        self._update_attributes()
 
-    @property
-    def device_info(self):
+    def _set_command_state(self, state: str) -> None:
         """
-        Home Assistantのデバイス一覧に表示するための基本情報を返す.
-        Returns basic device info for display in Home Assistant's device registry.
+        最後に送信したコマンドを状態として保持し、属性を更新する.
+        Store the last sent command as the state and refresh the attributes.
         """
-        return {
-            "identifiers": {(DOMAIN, self._device["device_id"])},
-            "name": self._device["name"],
-            "manufacturer": "Nature",
-            "model": self._device.get("firmware_version", "Nature Remo"),
-        }
+        self._attr_state = state
+        self._update_attributes()
 
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        """このエンティティの追加属性を返却する. / Return extra attributes for this entity."""
-        return {
-            "available_commands": list(self._commands.keys()),
+    def _update_attributes(self) -> None:
+        """
+        属性は入力（コマンド一覧・状態）が変わった時だけ作り直す.
+        Rebuild the attributes only when their inputs (commands, state) change.
+        """
+        self._attr_extra_state_attributes = {
+            "available_commands": self._command_names,
             "command": self._attr_state,
         }
 
+    async def async_added_to_hass(self) -> None:
+        """エンティティ索引に登録する. / Register in the entity index."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.entities.async_add(
+                self, self._appliance_id, self._device["device_id"]
+            )
+        )
+
+    @callback
+    @profiled("remote.update_status")
+    def _handle_coordinator_update(self) -> None:
+        """
+        シグナルが変化したリモコンだけコマンド索引を作り直す.
+        Rebuild the command index only when this remote's signals changed.
+        """
+        if self._appliance_id in self.coordinator.changed_signals:
+            remote_info = self.coordinator.ir_remotes.get(self._appliance_id)
+            if remote_info is not None:
+                self._remote_info = remote_info
+                self._build_commands(remote_info["signals"])
+        super()._handle_coordinator_update()
+
+    @property
+    def appliance_id(self) -> str:
+        """家電ID. / Appliance ID."""
+        return self._appliance_id
+
+    @property
+    def device_id(self) -> str:
+        """送信元のRemoデバイスID. / ID of the Remo device that sends the signals."""
+        return self._device["device_id"]
+
+    def signal_id(self, command: str) -> str | None:
+        """コマンド名からシグナルIDを返す. / Return the signal ID for a command name."""
+        signal_id = self._commands.get(command.lower())
+        if signal_id is None and self.coordinator.signal_library is not None:
+            # 表記ゆれ（全角・区切り文字など）も受け付ける / Also accept spelling variants
+            signal_id = self.coordinator.signal_library.find(self._appliance_id, command)
+        return signal_id
+
     @property
     def available(self) -> bool:
         """このエンティティが利用可能かどうかを返却する. / Return whether this entity is available."""
@@ -111,7 +163,7 @@ class NatureRemoRemoteEntity(CoordinatorEntity[NatureRemoCoordinator], RemoteEnt
 
         for cmd in command:
             normalized_cmd = cmd.lower()
-            signal_id = self._commands.get(normalized_cmd)
+            signal_id = self.signal_id(cmd)
             if not signal_id:
                 _LOGGER.warning("Unknown command: %s", cmd)
                 continue
@@ -119,29 +171,51 @@ class NatureRemoRemoteEntity(CoordinatorEntity[NatureRemoCoordinator], RemoteEnt
             await self.coordinator.api.send_command_signal(signal_id)
 
             if normalized_cmd in ON_COMMANDS:
-                self._attr_state = "on"
+                self._set_command_state("on")
             elif normalized_cmd in OFF_COMMANDS:
-                self._attr_state = "off"
+                self._set_command_state("off")
             else:
-                self._attr_state = cmd
+                self._set_command_state(cmd)
             self.async_write_ha_state()
 
+    async def async_restore_command(self, command: str) -> QueuedCommand | None:
+        """
+        シーンの復元で状態（最後のコマンド）を1つ送り直し、送信結果を返す.
+        ジャーナルに記録された場合はQueuedCommandを返す.
+
+        Resend one state (last command) for a scene restore and return the
+        send result; a QueuedCommand when the signal was journaled.
+        """
+        if command == "on":
+            signal_id = self._power_on_id
+        elif command == "off":
+            signal_id = self._power_off_id
+        else:
+            signal_id = self.signal_id(command)
+        if not signal_id:
+            raise HomeAssistantError(f"Command '{command}' not available for {self.name}")
+
+        result = await self.coordinator.api.send_command_signal(signal_id)
+        self._set_command_state(command)
+        self.async_write_ha_state()
+        return result
+
     async def async_turn_on(self) -> None:
         """turn_on サービス呼び出し時の処理 / Handle the turn_on service call."""
         if self._power_on_id:
             await self.coordinator.api.send_command_signal(self._power_on_id)
-            self._attr_state = "on"
+            self._set_command_state("on")
             self.async_write_ha_state()
         else:
-            _LOGGER.debug(f"Power ON command not available for {self.name}")
+            _LOGGER.debug("Power ON command not available for %s", self.name)
             raise HomeAssistantError(f"Power ON command not available for {self.name}")
 
     async def async_turn_off(self) -> None:
         """turn_off サービス呼び出し時の処理. / Handle the turn_off service call."""
         if self._power_off_id:
             await self.coordinator.api.send_command_signal(self._power_off_id)
-            self._attr_state = "off"
+            self._set_command_state("off")
             self.async_write_ha_state()
         else:
-            _LOGGER.debug(f"Power OFF command not available for {self.name}")
+            _LOGGER.debug("Power OFF command not available for %s", self.name)
             raise HomeAssistantError(f"Power OFF command not available for {self.name}")
@@ -0,0 +1,282 @@
+from array import array
+from collections import deque
+
+# ローリング統計を計算するウィンドウ（分） / Rolling statistics windows (minutes)
+ROLLING_WINDOWS = (1, 5, 15, 60)
+
+
+class _RollingWindow:
+    """
+    リングバッファ上の1つの時間窓について、min/max/mean/ピーク需要を逐次計算する.
+    min/maxは単調キューで管理するため、1サンプルあたり償却O(1)で更新できる.
+
+    Incrementally tracks min/max/mean/peak demand for one time window over the ring buffer.
+    min/max use monotonic queues, so each sample costs amortized O(1).
+    """
+
+    def __init__(self, seconds: float) -> None:
+        self.seconds = seconds
+        self.start = 0  # 窓内で最も古いサンプルの通し番号 / Sequence number of the oldest sample in the window
+        self.total = 0.0
+        self.min_queue: deque[int] = deque()
+        self.max_queue: deque[int] = deque()
+        self.peak_demand: float | None = None
+        # 窓の長さ分のサンプルが揃ったか（それまではピーク需要に数えない）
+        # Whether the window has spanned its full length; peaks only count from then on
+        self.full = False
+        # ピーク需要に数えるサンプルの最初の通し番号（リセット以前のサンプルを含む窓は数えない）
+        # First sequence number peaks count from; windows holding samples from before a reset don't count
+        self.since = 0
+
+
+class SmartMeterHistory:
+    """
+    スマートメーターのサンプル（時刻、瞬時電力、積算買電量、積算売電量）を保持する固定長リングバッファ.
+    Fixed-size, array-backed ring buffer of smart-meter samples
+    (timestamp, instant W, cumulative buy, cumulative sell).
+    """
+
+    def __init__(self, capacity: int = 512, windows=ROLLING_WINDOWS) -> None:
+        """初期化. / Initialize the ring buffer."""
+        self.capacity = capacity
+        self.timestamps = array("d", bytes(8 * capacity))
+        self.instant = array("d", bytes(8 * capacity))
+        self.buy = array("d", bytes(8 * capacity))
+        self.sold = array("d", bytes(8 * capacity))
+        self.count = 0  # これまでに追加したサンプル数（通し番号） / Total samples appended
+        self.windows = {minutes: _RollingWindow(minutes * 60) for minutes in windows}
+        # ピーク需要が属する契約期間（"YYYY-MM"） / Billing period the peak demand belongs to ("YYYY-MM")
+        self.peak_period: str | None = None
+
+    def __len__(self) -> int:
+        return min(self.count, self.capacity)
+
+    def append(self, timestamp: float, instant: float, buy: float, sold: float) -> None:
+        """
+        サンプルを追加し、各ウィンドウの統計を更新する.
+        Append a sample and update every window's statistics.
+        """
+        seq = self.count
+        index = seq % self.capacity
+        # 上書きされるサンプルを先に各ウィンドウから除外する
+        # Evict the sample about to be overwritten from every window first
+        if seq >= self.capacity:
+            for window in self.windows.values():
+                self._evict(window, seq - self.capacity + 1)
+
+        self.timestamps[index] = timestamp
+        self.instant[index] = instant
+        self.buy[index] = buy
+        self.sold[index] = sold
+        self.count += 1
+
+        for window in self.windows.values():
+            self._advance(window, seq, timestamp, instant)
+
+    def _advance(
+        self, window: _RollingWindow, seq: int, timestamp: float, instant: float
+    ) -> None:
+        """
+        ウィンドウに新しいサンプルを加え、期限切れのサンプルを取り除く.
+        Add the new sample to a window and evict expired ones.
+        """
+        window.total += instant
+        while window.min_queue and self.instant[window.min_queue[-1] % self.capacity] >= instant:
+            window.min_queue.pop()
+        window.min_queue.append(seq)
+        while window.max_queue and self.instant[window.max_queue[-1] % self.capacity] <= instant:
+            window.max_queue.pop()
+        window.max_queue.append(seq)
+
+        # 時間切れのサンプルを除外 / Evict samples older than the window
+        start = window.start
+        while (
+            start < seq
+            and timestamp - self.timestamps[start % self.capacity] > window.seconds
+        ):
+            start += 1
+        if start > window.start and start > window.since:
+            window.full = True
+        self._evict(window, start)
+
+        # 途中まで埋まった窓は1サンプルでピークになり得るので数えない
+        # A partially filled window could set the peak from one sample, so skip it
+        if not window.full:
+            return
+        mean = window.total / (self.count - window.start)
+        if window.peak_demand is None or mean > window.peak_demand:
+            window.peak_demand = mean
+
+    def _evict(self, window: _RollingWindow, start: int) -> None:
+        """
+        通し番号startより古いサンプルをウィンドウから取り除く.
+        Remove samples older than sequence number start from a window.
+        """
+        while window.start < start:
+            window.total -= self.instant[window.start % self.capacity]
+            window.start += 1
+        while window.min_queue and window.min_queue[0] < window.start:
+            window.min_queue.popleft()
+        while window.max_queue and window.max_queue[0] < window.start:
+            window.max_queue.popleft()
+
+    def stats(self, minutes: int) -> dict | None:
+        """
+        指定ウィンドウの統計を返す（サンプルがなければNone）.
+        ピーク需要は、そのウィンドウ長の移動平均電力の今期の最大値（窓が埋まるまではNone）.
+
+        Return statistics for a window (None when there are no samples).
+        Peak demand is the highest moving-average power this period for that
+        window length; None until the window has filled.
+        """
+        window = self.windows[minutes]
+        samples = self.count - window.start
+        if samples <= 0:
+            return None
+        return {
+            "min": self.instant[window.min_queue[0] % self.capacity],
+            "max": self.instant[window.max_queue[0] % self.capacity],
+            "mean": round(window.total / samples, 1),
+            "peak_demand": (
+                round(window.peak_demand, 1) if window.peak_demand is not None else None
+            ),
+            "samples": samples,
+        }
+
+    def reset_peaks(self) -> None:
+        """
+        ピーク需要をリセットする（契約期間の切り替え時など）.
+        Reset peak demand, e.g. at the start of a new contract period.
+        """
+        for window in self.windows.values():
+            window.peak_demand = None
+            # 前の期間のサンプルが窓から抜けるまでは数えない / Don't count until the previous period's samples leave the window
+            window.full = False
+            window.since = self.count
+
+    def peaks(self) -> dict[int, float]:
+        """ウィンドウ毎のピーク需要（永続化用）. / Peak demand per window, for persisting."""
+        return {
+            minutes: window.peak_demand
+            for minutes, window in self.windows.items()
+            if window.peak_demand is not None
+        }
+
+    def restore_peaks(self, peaks: dict) -> None:
+        """
+        保存したピーク需要を取り込む（現在の値より大きい場合のみ）.
+        Take in stored peak demand, keeping whichever is higher.
+        """
+        for minutes, value in peaks.items():
+            window = self.windows.get(int(minutes))
+            if window is not None and (
+                window.peak_demand is None or value > window.peak_demand
+            ):
+                window.peak_demand = value
+
+
+# 在室率を計算するウィンドウ（分）と、1回の検出を在室とみなす時間（秒）
+# Occupancy window (minutes) and how long one detection counts as occupied (seconds)
+OCCUPANCY_WINDOW = 60
+OCCUPANCY_HOLD = 300
+
+
+class MotionLog:
+    """
+    デバイス毎のモーション検出時刻（重複なし）を保持する固定長リングバッファ.
+    ウィンドウ内の件数と在室時間（各検出からholdの間を在室とみなした和集合）を逐次計算する.
+
+    Fixed-size, array-backed ring buffer of distinct motion timestamps for one device.
+    Incrementally tracks the events in the window and the occupied time, taken as
+    the union of [detection, detection + hold] intervals.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 256,
+        window: float = OCCUPANCY_WINDOW * 60,
+        hold: float = OCCUPANCY_HOLD,
+    ) -> None:
+        """初期化. / Initialize the log."""
+        self.capacity = capacity
+        self.window = window
+        self.hold = hold
+        self.timestamps = array("d", bytes(8 * capacity))
+        self.count = 0  # これまでに追加した検出数（通し番号） / Total detections appended
+        self.start = 0  # ウィンドウ内で最も古い検出の通し番号 / Sequence number of the oldest detection in the window
+        # ウィンドウ内の隣り合う検出間の在室時間の和 / Occupied time between neighbouring detections in the window
+        self.covered = 0.0
+
+    def __len__(self) -> int:
+        return min(self.count, self.capacity)
+
+    def _at(self, seq: int) -> float:
+        return self.timestamps[seq % self.capacity]
+
+    def _gap(self, seq: int) -> float:
+        """検出seqから次の検出までの在室時間. / Occupied time from detection seq to the next."""
+        return min(self.hold, self._at(seq + 1) - self._at(seq))
+
+    @property
+    def last(self) -> float | None:
+        """最新の検出時刻. / Latest detection time."""
+        return self._at(self.count - 1) if self.count else None
+
+    def append(self, timestamp: float) -> bool:
+        """
+        検出時刻を追加する（前回以前の時刻は同じ検出とみなして無視し、Falseを返す）.
+        Append a detection; times not after the latest are the same event and ignored.
+        """
+        if self.count and timestamp <= self.last:
+            return False
+        # 上書きされる検出を先にウィンドウから除外する / Evict the detection about to be overwritten first
+        if self.count >= self.capacity:
+            self._evict(self.count - self.capacity + 1)
+        if self.start < self.count:
+            self.covered += min(self.hold, timestamp - self.last)
+        self.timestamps[self.count % self.capacity] = timestamp
+        self.count += 1
+        return True
+
+    def _evict(self, start: int) -> None:
+        """
+        通し番号startより古い検出をウィンドウから取り除く.
+        Remove detections older than sequence number start from the window.
+        """
+        while self.start < start:
+            if self.start + 1 < self.count:
+                self.covered -= self._gap(self.start)
+            self.start += 1
+        if self.start >= self.count:
+            self.covered = 0.0
+
+    def stats(self, now: float) -> dict:
+        """
+        ウィンドウ内の1時間あたり検出数・最後の検出からの分数・在室率を返す.
+        Return events per hour, minutes since the last detection and the occupied
+        ratio over the window.
+        """
+        window_start = now - self.window
+        start = self.start
+        while start < self.count and self._at(start) < window_start:
+            start += 1
+        self._evict(start)
+
+        events = self.count - self.start
+        covered = self.covered
+        if events:
+            covered += min(self.hold, now - self.last)
+        # ウィンドウ直前の検出がウィンドウ内へはみ出す分 / Spill-over from the detection just before the window
+        before = self.start - 1
+        if before >= 0 and before >= self.count - self.capacity:
+            end = self._at(self.start) if events else now
+            covered += max(0.0, min(self._at(before) + self.hold, end) - window_start)
+
+        last = self.last
+        return {
+            "events_per_hour": round(events * 3600 / self.window, 1),
+            "minutes_since_motion": (
+                round((now - last) / 60, 1) if last is not None else None
+            ),
+            "occupied_ratio": round(min(covered / self.window, 1.0), 3),
+        }
@@ -0,0 +1,241 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+import logging
+from typing import Any
+
+from aiohttp import ClientError
+
+from homeassistant.exceptions import HomeAssistantError
+
+from .api import QueuedCommand
+from .coordinator import NatureRemoCoordinator
+from .remote import NatureRemoRemoteEntity
+
+_LOGGER = logging.getLogger(__name__)
+
+SCENE_STORAGE_KEY = "nature_remo.scenes"
+SCENE_STORAGE_VERSION = 1
+
+# エアコン設定のキーとaircon_settingsのパラメータ名 / Aircon setting keys and their aircon_settings parameters
+AIRCON_PARAMS = {
+    "temp": "temperature",
+    "vol": "air_volume",
+    "dir": "air_direction",
+}
+
+
+@dataclass(slots=True)
+class RestoreCommand:
+    """
+    復元プランの1コマンド（1家電につき最大1回の送信）.
+    One command of a restore plan; at most one send per appliance.
+    """
+
+    device_id: str
+    appliance_id: str
+    name: str
+    send: Callable[[], Awaitable[Any]]
+
+
+def capture_state(coordinator: NatureRemoCoordinator) -> dict[str, dict]:
+    """
+    コーディネーターの現在の状態から、エアコン・照明・赤外線リモコンの状態を取得する.
+    Capture the state of every AC, light and IR remote from the coordinator.
+    """
+    appliances = coordinator.snapshot.appliances
+    states = {}
+    for appliance_id in coordinator.aircons:
+        settings = appliances.get(appliance_id, {}).get("settings")
+        if settings:
+            states[appliance_id] = {
+                "type": "aircon",
+                "mode": settings.get("mode", ""),
+                "temp": settings.get("temp", ""),
+                "vol": settings.get("vol", ""),
+                "dir": settings.get("dir", ""),
+                "button": settings.get("button", ""),
+            }
+
+    for appliance_id in coordinator.lights:
+        state = appliances.get(appliance_id, {}).get("light", {}).get("state")
+        if state:
+            states[appliance_id] = {
+                "type": "light",
+                "power": state.get("power", "off"),
+                "button": state.get("last_button", "on"),
+            }
+
+    # 赤外線リモコンは最後に送信したコマンドが状態になる
+    # IR remotes use the last sent command as their state
+    for appliance_id in coordinator.ir_remotes:
+        if appliance_id in states:
+            continue
+        remote = _remote_entity(coordinator, appliance_id)
+        if remote is not None and remote.state is not None:
+            states[appliance_id] = {"type": "ir", "command": remote.state}
+
+    return states
+
+
+def _remote_entity(
+    coordinator: NatureRemoCoordinator, appliance_id: str
+) -> NatureRemoRemoteEntity | None:
+    """家電IDのリモートエンティティを返す. / Return the remote entity for an appliance ID."""
+    return next(
+        (
+            entity
+            for entity in coordinator.entities.by_appliance(appliance_id)
+            if isinstance(entity, NatureRemoRemoteEntity)
+        ),
+        None,
+    )
+
+
+def aircon_payload(stored: dict, current: dict) -> dict | None:
+    """
+    保存した設定と現在の設定の差分から、1回分のaircon_settingsを作る（一致していればNone）.
+    Build one merged aircon_settings payload from the stored/current diff; None when they match.
+    """
+    if stored["button"] == "power-off":
+        if current.get("button") == "power-off":
+            return None
+        return {"button": "power-off"}
+
+    payload = {}
+    if current.get("button") == "power-off":
+        payload["button"] = ""
+    # モードを変えるとエアコン側がモード毎の設定を復元するため、その場合は全項目を送る
+    # Changing mode makes the AC recall its per-mode settings, so send every field then
+    mode_changed = stored["mode"] != current.get("mode")
+    for key, param in AIRCON_PARAMS.items():
+        value = stored.get(key)
+        if value and (mode_changed or value != current.get(key)):
+            payload[param] = value
+    if not payload and not mode_changed:
+        return None
+    payload["operation_mode"] = stored["mode"]
+    return payload
+
+
+def light_button(stored: dict, current: dict) -> str | None:
+    """
+    保存した照明状態に戻すためのボタン名を返す（一致していればNone）.
+    Return the button that brings the light back to the stored state; None when it matches.
+    """
+    if stored["power"] == "off":
+        return None if current.get("power") == "off" else "off"
+    if current.get("power") == "on" and current.get("last_button") == stored["button"]:
+        return None
+    return stored["button"] or "on"
+
+
+def plan_restore(
+    coordinator: NatureRemoCoordinator, stored: dict[str, dict]
+) -> tuple[list[RestoreCommand], list[str]]:
+    """
+    保存した状態と現在の状態を比較し、最小のコマンドプランと一致済みの家電IDを返す.
+    Compare the stored state with the current state and return the smallest
+    command plan plus the IDs of appliances that already match.
+    """
+    api = coordinator.api
+    appliances = coordinator.snapshot.appliances
+    commands: list[RestoreCommand] = []
+    unchanged: list[str] = []
+
+    for appliance_id, state in stored.items():
+        if state["type"] == "aircon" and appliance_id in coordinator.aircons:
+            info = coordinator.aircons[appliance_id]
+            current = appliances.get(appliance_id, {}).get("settings", {})
+            payload = aircon_payload(state, current)
+            if payload is None:
+                unchanged.append(appliance_id)
+                continue
+            commands.append(
+                RestoreCommand(
+                    device_id=info["device"]["device_id"],
+                    appliance_id=appliance_id,
+                    name=info["name"],
+                    # 失敗したステータスは送出させ、失敗として数える
+                    # Raise on an error status so it counts as a failure
+                    send=lambda p=payload, a=appliance_id: api.send_command_climate(
+                        p, a, raise_on_error=True
+                    ),
+                )
+            )
+
+        elif state["type"] == "light" and appliance_id in coordinator.lights:
+            info = coordinator.lights[appliance_id]
+            current = appliances.get(appliance_id, {}).get("light", {}).get("state", {})
+            button = light_button(state, current)
+            if button is None:
+                unchanged.append(appliance_id)
+                continue
+            commands.append(
+                RestoreCommand(
+                    device_id=info["device"]["device_id"],
+                    appliance_id=appliance_id,
+                    name=info["name"],
+                    send=lambda b=button, a=appliance_id: api.send_light_command(
+                        a, b, raise_on_error=True
+                    ),
+                )
+            )
+
+        elif state["type"] == "ir" and appliance_id in coordinator.ir_remotes:
+            remote = _remote_entity(coordinator, appliance_id)
+            if remote is None:
+                continue
+            if remote.state == state["command"]:
+                unchanged.append(appliance_id)
+                continue
+            commands.append(
+                RestoreCommand(
+                    device_id=coordinator.ir_remotes[appliance_id]["device"][
+                        "device_id"
+                    ],
+                    appliance_id=appliance_id,
+                    name=coordinator.ir_remotes[appliance_id]["name"],
+                    send=lambda r=remote, c=state["command"]: r.async_restore_command(
+                        c
+                    ),
+                )
+            )
+
+    return commands, unchanged
+
+
+async def execute_plan(
+    commands: list[RestoreCommand],
+) -> tuple[list[str], list[str], list[str]]:
+    """
+    同じRemoデバイスへの送信は順番に、異なるRemoデバイスへの送信は並列に実行する.
+    成功した家電ID、ジャーナルに記録された（まだ届いていない）家電ID、失敗した家電IDを返す.
+
+    Run commands for the same Remo device in order and different Remo devices
+    in parallel. Returns the appliance IDs that succeeded, those journaled
+    for replay (not delivered yet) and those that failed.
+    """
+    by_device: dict[str, list[RestoreCommand]] = {}
+    for command in commands:
+        by_device.setdefault(command.device_id, []).append(command)
+
+    sent: list[str] = []
+    queued: list[str] = []
+    failed: list[str] = []
+
+    async def _run_device(device_commands: list[RestoreCommand]) -> None:
+        for command in device_commands:
+            try:
+                result = await command.send()
+            except (ClientError, TimeoutError, HomeAssistantError) as err:
+                _LOGGER.error("Failed to restore %s: %s", command.name, err)
+                failed.append(command.appliance_id)
+            else:
+                if isinstance(result, QueuedCommand):
+                    queued.append(command.appliance_id)
+                else:
+                    sent.append(command.appliance_id)
+
+    await asyncio.gather(*(_run_device(cmds) for cmds in by_device.values()))
+    return sent, queued, failed
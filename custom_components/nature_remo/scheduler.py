@@ -0,0 +1,182 @@
+import asyncio
+from collections import deque
+from collections.abc import Callable
+import logging
+import math
+from typing import TYPE_CHECKING
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+if TYPE_CHECKING:
+    from .coordinator import NatureRemoCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# 同時に実行するリフレッシュの上限 / Maximum refreshes in flight at once
+MAX_CONCURRENT_REFRESHES = 2
+
+# アカウント（トークン）毎のリクエスト枠：RATE_WINDOW秒あたりRATE_BUDGET回
+# Nature Remo APIの制限（5分あたり30回）に合わせ、コマンド用にCOMMAND_RESERVE回を残す
+# Per-account (token) budget: RATE_BUDGET requests per RATE_WINDOW seconds,
+# matching the Nature Remo API limit of 30 per 5 minutes, with COMMAND_RESERVE kept for commands
+RATE_WINDOW = 300
+RATE_BUDGET = 30
+COMMAND_RESERVE = 5
+# 枠を使い切ったアカウントを再確認するまでの最短間隔（秒） / Shortest wait before rechecking an account over budget (seconds)
+MIN_DEFER_INTERVAL = 10
+
+
+class _Slot:
+    """
+    スケジューラーに登録された1アカウント分の状態.
+    State for one account registered with the scheduler.
+    """
+
+    def __init__(self, coordinator: "NatureRemoCoordinator") -> None:
+        self.coordinator = coordinator
+        self.offset = 0.0  # 周期内での位相（秒） / Phase within the period (seconds)
+        self.next_due = 0.0
+        self.last_started = 0.0
+        # (時刻, 累計リクエスト数)の記録 / (time, running request count) samples
+        self.samples: deque[tuple[float, int]] = deque()
+
+    @property
+    def interval(self) -> float:
+        return self.coordinator.poll_interval.total_seconds()
+
+    def requests_in_window(self, now: float) -> int:
+        """直近RATE_WINDOW秒のリクエスト数. / Requests in the last RATE_WINDOW seconds."""
+        count = self.coordinator.api.request_count
+        self.samples.append((now, count))
+        while self.samples[0][0] < now - RATE_WINDOW:
+            self.samples.popleft()
+        return count - self.samples[0][1]
+
+
+class NatureRemoPollScheduler:
+    """
+    全エントリー（アカウント）のリフレッシュを1つのタイマーで駆動するスケジューラー.
+    各アカウントの位相を周期内に均等にずらし、同時実行数を制限し、アカウント毎のリクエスト枠を守る.
+
+    Drives the refreshes of every entry (account) from one timer. Each account
+    gets an evenly spread phase within the period, in-flight refreshes are
+    capped, and each account stays inside its own request budget.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """初期化. / Initialize the scheduler."""
+        self.hass = hass
+        self._slots: dict[str, _Slot] = {}
+        self._semaphore = asyncio.Semaphore(MAX_CONCURRENT_REFRESHES)
+        self._anchor = hass.loop.time()
+        self._unsub_timer: Callable[[], None] | None = None
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    @callback
+    def async_add(
+        self, key: str, coordinator: "NatureRemoCoordinator"
+    ) -> Callable[[], None]:
+        """
+        コーディネーターを登録し、登録解除用の関数を返す.
+        登録中のコーディネーターは自分ではリフレッシュを予約しない.
+
+        Register a coordinator and return the function that unregisters it.
+        Registered coordinators no longer schedule their own refreshes.
+        """
+        slot = self._slots[key] = _Slot(coordinator)
+        # 登録直後に最初のリフレッシュが走る / The first refresh runs right after registering
+        slot.last_started = self.hass.loop.time()
+        coordinator.scheduler = self
+        coordinator.update_interval = None
+        self._rebalance()
+        self._schedule()
+
+        @callback
+        def _async_remove() -> None:
+            if self._slots.pop(key, None) is None:
+                return
+            coordinator.scheduler = None
+            self._rebalance()
+            self._schedule()
+
+        return _async_remove
+
+    def _next_grid(self, slot: _Slot, after: float) -> float:
+        """位相上でafterより後の最初の予定時刻. / First due time on the slot's grid after `after`."""
+        interval = slot.interval
+        base = self._anchor + slot.offset
+        return base + math.ceil((after - base) / interval + 1e-9) * interval
+
+    @callback
+    def async_interval_changed(self) -> None:
+        """
+        いずれかのアカウントの間隔が変わった時に位相を計算し直す.
+        Recompute the phases when any account's interval changed.
+        """
+        self._rebalance()
+        self._schedule()
+
+    def _rebalance(self) -> None:
+        """
+        最短の周期を登録数で等分し、各アカウントに位相を割り当てる.
+        Split the shortest period evenly and assign each account a phase.
+        """
+        if not self._slots:
+            return
+        period = min(slot.interval for slot in self._slots.values())
+        now = self.hass.loop.time()
+        for index, key in enumerate(sorted(self._slots)):
+            slot = self._slots[key]
+            slot.offset = index * period / len(self._slots)
+            # 位相を変えても、直前のリフレッシュから半周期は空ける
+            # Even when the phase moves, stay half a period clear of the last refresh
+            slot.next_due = self._next_grid(
+                slot, max(now, slot.last_started + slot.interval / 2)
+            )
+
+    def _schedule(self) -> None:
+        """次に予定が来るアカウントに合わせてタイマーを掛け直す. / Re-arm the timer for the next due account."""
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+        if not self._slots:
+            return
+        delay = min(slot.next_due for slot in self._slots.values()) - self.hass.loop.time()
+        self._unsub_timer = async_call_later(self.hass, max(delay, 0), self._async_fire)
+
+    @callback
+    def _async_fire(self, _now) -> None:
+        """
+        予定時刻になったアカウントのリフレッシュを開始する（枠を使い切っていれば後回しにする）.
+        Start the refreshes that are due, deferring accounts that used up their budget.
+        """
+        self._unsub_timer = None
+        now = self.hass.loop.time()
+        for slot in self._slots.values():
+            if slot.next_due > now:
+                continue
+            if slot.requests_in_window(now) >= RATE_BUDGET - COMMAND_RESERVE:
+                # 最も古い記録が枠から外れるまで待つ（すぐに再発火しないよう最短間隔は空ける）
+                # Wait until the oldest sample leaves the window, but never re-fire right away
+                slot.next_due = max(
+                    slot.samples[0][0] + RATE_WINDOW, now + MIN_DEFER_INTERVAL
+                )
+                _LOGGER.debug(
+                    "%s is over its request budget, deferring refresh",
+                    slot.coordinator.name,
+                )
+                continue
+            slot.next_due = self._next_grid(slot, now)
+            slot.last_started = now
+            self.hass.async_create_background_task(
+                self._async_refresh(slot), f"nature_remo refresh {slot.coordinator.name}"
+            )
+        self._schedule()
+
+    async def _async_refresh(self, slot: _Slot) -> None:
+        """同時実行数の枠内でリフレッシュする. / Refresh within the concurrency cap."""
+        async with self._semaphore:
+            await slot.coordinator.async_refresh()
@@ -1,48 +1,205 @@
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
 from datetime import datetime, timezone, timedelta
-from homeassistant.components.sensor import SensorEntity
+import time
+from typing import Any
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.core import callback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.components.binary_sensor import BinarySensorEntity
 from .coordinator import NatureRemoCoordinator
-from .const import DOMAIN
-
-
-SENSOR_TYPES = {
-    "te": {
-        "name": "Temperature",
-        "unit": "°C",
-        "device_class": "temperature",
-        "state_class": "measurement",
-    },
-    "hu": {
-        "name": "Humidity",
-        "unit": "%",
-        "device_class": "humidity",
-        "state_class": "measurement",
-    },
-    "il": {
-        "name": "Illuminance",
-        "unit": None,  # 単位は指定しない
-        "device_class": "illuminance",
-        "state_class": "measurement",
-    },
-    "buy_power": {
-        "name": "Buy Power",
-        "unit": "kWh",
-        "device_class": "energy",
-        "state_class": "total_increasing",
-    },
-    "sold_power": {
-        "name": "Sold Power",
-        "unit": "kWh",
-        "device_class": "energy",
-        "state_class": "total_increasing",
-    },
-    "current_power": {
-        "name": "Current Power",
-        "unit": "W",
-        "device_class": "power",
-        "state_class": "measurement",
-    },
+from .const import DEFAULT_SENSOR_HEARTBEAT, DOMAIN
+from .profiler import profiled
+from .ring_buffer import OCCUPANCY_WINDOW, ROLLING_WINDOWS
+
+
+@dataclass(frozen=True, kw_only=True)
+class NatureRemoSensorEntityDescription(SensorEntityDescription):
+    """
+    Nature Remoセンサーの宣言的な定義.
+    value_fn/attributes_fnはエンティティ生成時に1回だけ解決される.
+
+    Declarative description of a Nature Remo sensor.
+    value_fn/attributes_fn are resolved once per entity.
+
+    deadband: 前回書き込んだ値からこの幅以上変化した場合のみ書き込む
+    min_interval: 書き込みの最小間隔（秒）
+    deadband: only write when the value moves at least this far from the last written value
+    min_interval: minimum seconds between state writes
+    """
+
+    value_fn: Callable[[NatureRemoCoordinator, str], Any]
+    attributes_fn: Callable[[NatureRemoCoordinator, str], Mapping[str, Any]] | None = (
+        None
+    )
+    deadband: float = 0
+    min_interval: float = 0
+
+
+def _event_value(key: str):
+    """温湿度・照度イベントの値を取り出す関数を返す. / Return an accessor for a device event value."""
+
+    def value_fn(coordinator: NatureRemoCoordinator, device_id: str):
+        # 削除済みのデバイスでもKeyErrorにならないようにする
+        device = coordinator.devices.get(device_id)
+        if device is None:
+            return None
+        event = device["events"].get(key)
+        return event.get("val") if event else None
+
+    return value_fn
+
+
+def _meter_value(key: str):
+    """スマートメーターの値を取り出す関数を返す. / Return an accessor for a smart-meter value."""
+
+    def value_fn(coordinator: NatureRemoCoordinator, appliance_id: str):
+        meter = coordinator.smart_meters.get(appliance_id)
+        return meter.get(key) if meter else None
+
+    return value_fn
+
+
+def _fixed_time_attributes(prefix: str):
+    """
+    積算電力量に定時積算値（30分毎の確定値）を付与する関数を返す.
+    Return an attribute builder adding the fixed-time (half-hourly) reading to cumulative energy.
+    """
+
+    def attributes_fn(coordinator: NatureRemoCoordinator, appliance_id: str):
+        meter = coordinator.smart_meters.get(appliance_id, {})
+        if f"{prefix}_fixed_power" not in meter:
+            return {}
+        return {
+            "fixed_time_value": meter[f"{prefix}_fixed_power"],
+            "fixed_time_at": meter[f"{prefix}_fixed_at"].isoformat(),
+        }
+
+    return attributes_fn
+
+
+# 照度はNature Remo独自の0〜200の相対スケール / Illuminance is Nature Remo's relative 0–200 scale
+_ILLUMINANCE_ATTRIBUTES = {
+    "raw_sensor_scale": "0-200",
+    "note": "This is a relative scale used by Nature Remo.",
+}
+
+# 温度、湿度、照度センサー / Temperature, humidity and illuminance sensors
+DEVICE_SENSORS = {
+    desc.key: desc
+    for desc in (
+        NatureRemoSensorEntityDescription(
+            key="te",
+            name="Temperature",
+            native_unit_of_measurement="°C",
+            device_class=SensorDeviceClass.TEMPERATURE,
+            state_class=SensorStateClass.MEASUREMENT,
+            value_fn=_event_value("te"),
+            deadband=0.2,
+        ),
+        NatureRemoSensorEntityDescription(
+            key="hu",
+            name="Humidity",
+            native_unit_of_measurement="%",
+            device_class=SensorDeviceClass.HUMIDITY,
+            state_class=SensorStateClass.MEASUREMENT,
+            value_fn=_event_value("hu"),
+            deadband=2,
+        ),
+        NatureRemoSensorEntityDescription(
+            key="il",
+            name="Illuminance",
+            native_unit_of_measurement=None,  # 単位は指定しない
+            device_class=SensorDeviceClass.ILLUMINANCE,
+            state_class=SensorStateClass.MEASUREMENT,
+            value_fn=_event_value("il"),
+            attributes_fn=lambda coordinator, device_id: _ILLUMINANCE_ATTRIBUTES,
+            deadband=3,
+            min_interval=60,
+        ),
+    )
+}
+
+# 電気使用量センサー / Smart-meter sensors
+SMART_METER_SENSORS = {
+    desc.key: desc
+    for desc in (
+        NatureRemoSensorEntityDescription(
+            key="buy_power",
+            name="Buy Power",
+            native_unit_of_measurement="kWh",
+            device_class=SensorDeviceClass.ENERGY,
+            state_class=SensorStateClass.TOTAL_INCREASING,
+            value_fn=_meter_value("buy_power"),
+            attributes_fn=_fixed_time_attributes("buy"),
+        ),
+        NatureRemoSensorEntityDescription(
+            key="sold_power",
+            name="Sold Power",
+            native_unit_of_measurement="kWh",
+            device_class=SensorDeviceClass.ENERGY,
+            state_class=SensorStateClass.TOTAL_INCREASING,
+            value_fn=_meter_value("sold_power"),
+            attributes_fn=_fixed_time_attributes("sold"),
+        ),
+        NatureRemoSensorEntityDescription(
+            key="current_power",
+            name="Current Power",
+            native_unit_of_measurement="W",
+            device_class=SensorDeviceClass.POWER,
+            state_class=SensorStateClass.MEASUREMENT,
+            value_fn=_meter_value("current_power"),
+        ),
+        NatureRemoSensorEntityDescription(
+            key="current_r",
+            name="Current R Phase",
+            native_unit_of_measurement="A",
+            device_class=SensorDeviceClass.CURRENT,
+            state_class=SensorStateClass.MEASUREMENT,
+            value_fn=_meter_value("current_r"),
+        ),
+        NatureRemoSensorEntityDescription(
+            key="current_t",
+            name="Current T Phase",
+            native_unit_of_measurement="A",
+            device_class=SensorDeviceClass.CURRENT,
+            state_class=SensorStateClass.MEASUREMENT,
+            value_fn=_meter_value("current_t"),
+        ),
+    )
+}
+
+
+# モーション検出ログから計算する在室統計センサー（直近OCCUPANCY_WINDOW分）
+# Occupancy statistics computed from the motion log, over the last OCCUPANCY_WINDOW minutes
+OCCUPANCY_SENSORS = {
+    desc.key: desc
+    for desc in (
+        SensorEntityDescription(
+            key="events_per_hour",
+            name="Motion Events Per Hour",
+            native_unit_of_measurement="events/h",
+            state_class=SensorStateClass.MEASUREMENT,
+        ),
+        SensorEntityDescription(
+            key="minutes_since_motion",
+            name="Minutes Since Motion",
+            native_unit_of_measurement="min",
+            device_class=SensorDeviceClass.DURATION,
+            state_class=SensorStateClass.MEASUREMENT,
+        ),
+        SensorEntityDescription(
+            key="occupied_ratio",
+            name=f"Occupied Ratio {OCCUPANCY_WINDOW}min",
+            native_unit_of_measurement="%",
+            state_class=SensorStateClass.MEASUREMENT,
+        ),
+    )
 }
 
 
@@ -57,120 +214,189 @@ async def async_setup_entry(hass, entry, async_add_entities):
     coordinator: NatureRemoCoordinator = hass.data[DOMAIN][entry.entry_id][
         "coordinator"
     ]
-    entities = []
 
     # 電気使用量センサー
-    for appliance_id, data in coordinator.smart_meters.items():
-        for key, desc in SENSOR_TYPES.items():
-            if key in data:
-                entities.append(
-                    NatureRemoSensor(
-                        coordinator,
-                        appliance_id,
-                        data["name"],
-                        data["device"],
-                        key,
-                        desc,
-                    )
-                )
+    def discover_smart_meters():
+        return {
+            (appliance_id, key): data
+            for appliance_id, data in coordinator.smart_meters.items()
+            for key in SMART_METER_SENSORS
+            if key in data
+        }
+
+    coordinator.async_track_entities(
+        entry,
+        async_add_entities,
+        discover_smart_meters,
+        lambda ids, data: NatureRemoSensor(
+            coordinator,
+            ids[0],
+            data["name"],
+            data["device"],
+            SMART_METER_SENSORS[ids[1]],
+        ),
+    )
+
+    # 瞬時電力のローリング統計センサー（ウィンドウ毎）
+    # Rolling instant-power statistics sensors, one per window
+    def discover_rolling_power():
+        return {
+            (appliance_id, minutes): data
+            for appliance_id, data in coordinator.smart_meters.items()
+            for minutes in ROLLING_WINDOWS
+        }
+
+    coordinator.async_track_entities(
+        entry,
+        async_add_entities,
+        discover_rolling_power,
+        lambda ids, data: NatureRemoRollingPowerSensor(
+            coordinator, ids[0], data["name"], data["device"], ids[1]
+        ),
+    )
 
     # 温度、湿度、照度センサー
-    for device_id, data in coordinator.devices.items():
-        for key in ("te", "hu", "il"):
-            if key in data["events"]:
-                entities.append(
-                    NatureRemoSensor(
-                        coordinator,
-                        device_id,
-                        data["name"],
-                        {
-                            "device_id": data["device_id"],
-                            "name": data["name"],
-                            "firmware_version": data["firmware_version"],
-                        },
-                        key,
-                        SENSOR_TYPES[key],
-                    )
-                )
+    def discover_devices():
+        return {
+            (device_id, key): data
+            for device_id, data in coordinator.devices.items()
+            for key in DEVICE_SENSORS
+            if key in data["events"]
+        }
+
+    coordinator.async_track_entities(
+        entry,
+        async_add_entities,
+        discover_devices,
+        lambda ids, data: NatureRemoSensor(
+            coordinator,
+            ids[0],
+            data["name"],
+            {
+                "device_id": data["device_id"],
+                "name": data["name"],
+                "firmware_version": data["firmware_version"],
+            },
+            DEVICE_SENSORS[ids[1]],
+        ),
+    )
 
     # モーションセンサー
-    for device_id, data in coordinator.motion_sensors.items():
-        # モーション検出センサー（ON/OFF）の追加
-        entities.append(
-            NatureRemoMotionBinarySensor(
-                coordinator,
-                device_id,
-                data["name"],
-                {
-                    "device_id": data["device_id"],
-                    "name": data["name"],
-                    "firmware_version": data["firmware_version"],
-                },
-            )
-        )
-        # モーション検出センサー（検出時刻）の追加
-        entities.append(
-            NatureRemoMotionTimeSensor(
-                coordinator,
-                device_id,
-                data["name"],
-                {
-                    "device_id": data["device_id"],
-                    "name": data["name"],
-                    "firmware_version": data["firmware_version"],
-                },
+    # モーション検出センサー（ON/OFF）と検出時刻センサーをデバイス毎に追加
+    # Add a motion (ON/OFF) sensor and a detection time sensor per device
+    motion_classes = {
+        "motion": NatureRemoMotionBinarySensor,
+        "last_motion": NatureRemoMotionTimeSensor,
+    }
+
+    def discover_motion_sensors():
+        return {
+            (device_id, kind): data
+            for device_id, data in coordinator.motion_sensors.items()
+            for kind in motion_classes
+        }
+
+    coordinator.async_track_entities(
+        entry,
+        async_add_entities,
+        discover_motion_sensors,
+        lambda ids, data: motion_classes[ids[1]](
+            coordinator,
+            ids[0],
+            data["name"],
+            {
+                "device_id": data["device_id"],
+                "name": data["name"],
+                "firmware_version": data["firmware_version"],
+            },
+        ),
+    )
+
+    # モーション検出ログから計算する在室統計センサー
+    # Occupancy statistics sensors computed from the motion log
+    def discover_occupancy():
+        return {
+            (device_id, key): data
+            for device_id, data in coordinator.motion_sensors.items()
+            for key in OCCUPANCY_SENSORS
+        }
+
+    coordinator.async_track_entities(
+        entry,
+        async_add_entities,
+        discover_occupancy,
+        lambda ids, data: NatureRemoOccupancySensor(
+            coordinator,
+            ids[0],
+            data["name"],
+            {
+                "device_id": data["device_id"],
+                "name": data["name"],
+                "firmware_version": data["firmware_version"],
+            },
+            OCCUPANCY_SENSORS[ids[1]],
+        ),
+    )
+
+
+class _IndexedSensorMixin:
+    """
+    追加時にエンティティ索引へ登録し、削除時に解除するセンサー共通処理.
+    Registers the sensor in the entity index when added and unregisters it on removal.
+    """
+
+    _index_appliance_id: str | None = None
+    _index_device_id: str | None = None
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.entities.async_add(
+                self, self._index_appliance_id, self._index_device_id
             )
         )
 
-    async_add_entities(entities)
 
+class NatureRemoSensor(_IndexedSensorMixin, CoordinatorEntity, SensorEntity):
+    entity_description: NatureRemoSensorEntityDescription
+
+    # 変化が多く履歴として役に立たない属性は記録しない / Don't record static, low-value attributes
+    _unrecorded_attributes = frozenset({"raw_sensor_scale", "note"})
 
-class NatureRemoSensor(CoordinatorEntity, SensorEntity):
-    def __init__(self, coordinator, appliance_id, name, device, key, description):
+    def __init__(self, coordinator, appliance_id, name, device, description):
         """
         センサークラスの初期化
         Initialize a base sensor entity for Nature Remo.
         """
         super().__init__(coordinator)
-        self._attr_unique_id = f"nature_remo_sensor_{appliance_id}_{key}"
-        self._attr_name = f"Nature Remo {name} {description['name']}"
-        self._device = device
+        self.entity_description = description
+        self._attr_unique_id = f"nature_remo_sensor_{appliance_id}_{description.key}"
+        self._attr_name = f"Nature Remo {name} {description.name}"
+        self._attr_device_info = coordinator.device_info(device)
         self._appliance_id = appliance_id
-        self._attr_native_unit_of_measurement = description["unit"]
-        self._attr_device_class = description["device_class"]
-        self._attr_state_class = description["state_class"]
-        self._key = key
-
-    @property
-    def device_info(self):
-        """
-        デバイス情報を返却する
-        Return device info to be shown in Home Assistant UI.
-        """
-        return {
-            "identifiers": {(DOMAIN, self._device["device_id"])},
-            "name": self._device["name"],
-            "manufacturer": "Nature",
-            "model": self._device.get("firmware_version", "Nature Remo"),
-        }
+        self._index_device_id = device["device_id"]
+        # 温湿度センサーではappliance_idはデバイスIDそのもの / For device sensors the ID is the device ID
+        if appliance_id != device["device_id"]:
+            self._index_appliance_id = appliance_id
+        self._key = description.key
+        # 値・属性の取り出し方はここで1回だけ解決する / Resolve the accessors once here
+        self._value_fn = description.value_fn
+        self._attributes_fn = description.attributes_fn
+        self._published_value = self._value_fn(coordinator, appliance_id)
+        self._attr_extra_state_attributes = self._read_attributes()
+        self._last_write = time.monotonic()
+        # 最後に書き込んだ時点の可用性 / Availability as of the last write
+        self._published_available = self.available
 
     @property
     def native_value(self):
         """
-        センサーの現在値を返却する
-        Return the current value of the sensor.
+        最後に書き込んだセンサー値を返却する
+        Return the last published value of the sensor.
         """
-        if self._key in ("te", "hu", "il"):
-            # 温度、湿度、照度
-            return self.coordinator.devices[self._appliance_id]["events"][self._key][
-                "val"
-            ]
-
-        # 電気使用量
-        return self.coordinator.smart_meters[self._appliance_id][self._key]
+        return self._published_value
 
-    @property
-    def extra_state_attributes(self):
+    def _read_attributes(self):
         """
         センサーに追加の属性（Attributes）を付与する
         照度センサー（il）の場合、Nature Remoが返す0〜200の相対的な明るさスケールを補足情報として返す。
@@ -178,16 +404,146 @@ class NatureRemoSensor(CoordinatorEntity, SensorEntity):
         Adds extra attributes to the sensor.
         For illuminance sensors ("il"), it returns supplemental info about Nature Remo's relative brightness scale (0–200).
         """
-        attributes = {}
+        if self._attributes_fn is None:
+            return None
+        return self._attributes_fn(self.coordinator, self._appliance_id)
+
+    def _should_publish(self, value, now: float) -> bool:
+        """
+        デッドバンドと最小書き込み間隔、ハートビートから書き込むべきか判定する
+        Decide whether to write, based on deadband, minimum interval and heartbeat.
+        """
+        options = self.coordinator.sensor_options
+        elapsed = now - self._last_write
+        if elapsed >= options.get("sensor_heartbeat", DEFAULT_SENSOR_HEARTBEAT):
+            return True
+        if value == self._published_value:
+            return False
+        # オプションの最小間隔はキー毎の既定値の下限として働く
+        # The option acts as a floor over the per-key default interval
+        min_interval = max(
+            options.get("sensor_min_interval", 0),
+            self.entity_description.min_interval,
+        )
+        if elapsed < min_interval:
+            return False
+        if not isinstance(value, (int, float)) or not isinstance(
+            self._published_value, (int, float)
+        ):
+            return True
+        deadband = options.get(
+            f"deadband_{self._key}", self.entity_description.deadband
+        )
+        return abs(value - self._published_value) >= deadband
+
+    @callback
+    @profiled("sensor.update_status")
+    def _handle_coordinator_update(self) -> None:
+        """
+        値が閾値を超えて変化した場合、ハートビート経過時、または可用性が変わった時のみ状態を書き込む
+        属性は書き込む時だけ計算し直す
+
+        Write state only when the value moved past the deadband, the heartbeat
+        expired or availability changed. Attributes are only recomputed when a
+        write happens.
+        """
+        value = self._value_fn(self.coordinator, self._appliance_id)
+        now = time.monotonic()
+        available = self.available
+        if available == self._published_available and not self._should_publish(
+            value, now
+        ):
+            return
+        self._published_available = available
+        self._published_value = value
+        self._attr_extra_state_attributes = self._read_attributes()
+        self._last_write = now
+        self.async_write_ha_state()
+
+
+class NatureRemoRollingPowerSensor(
+    _IndexedSensorMixin, CoordinatorEntity, SensorEntity
+):
+    def __init__(self, coordinator, appliance_id, name, device, minutes):
+        """
+        瞬時電力のローリング平均センサーの初期化（min/max/ピーク需要は属性）
+        Initialize a rolling mean power sensor (min/max/peak demand as attributes).
+        """
+        super().__init__(coordinator)
+        self._attr_unique_id = f"nature_remo_sensor_{appliance_id}_power_{minutes}min"
+        self._attr_name = f"Nature Remo {name} Power Mean {minutes}min"
+        self._attr_device_info = coordinator.device_info(device)
+        self._appliance_id = appliance_id
+        self._index_appliance_id = appliance_id
+        self._index_device_id = device["device_id"]
+        self._minutes = minutes
+        self._attr_native_unit_of_measurement = "W"
+        self._attr_device_class = SensorDeviceClass.POWER
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+        self._update_from_history()
+
+    def _update_from_history(self) -> None:
+        """
+        ウィンドウ内の平均瞬時電力と、最小・最大・ピーク需要の属性を更新する
+        Update the window's mean instant power and its min/max/peak demand attributes.
+        """
+        history = self.coordinator.smart_meter_history.get(self._appliance_id)
+        stats = history.stats(self._minutes) if history is not None else None
+        if not stats:
+            self._attr_native_value = None
+            self._attr_extra_state_attributes = {}
+            return
+        self._attr_native_value = stats["mean"]
+        self._attr_extra_state_attributes = {
+            "min": stats["min"],
+            "max": stats["max"],
+            "peak_demand": stats["peak_demand"],
+            "samples": stats["samples"],
+        }
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """リフレッシュ毎に統計を1回だけ計算する. / Compute the statistics once per refresh."""
+        self._update_from_history()
+        self.async_write_ha_state()
+
+
+class NatureRemoOccupancySensor(
+    _IndexedSensorMixin, CoordinatorEntity, SensorEntity
+):
+    def __init__(self, coordinator, device_id, name, device, description):
+        """
+        モーション検出ログから在室統計を計算するセンサーの初期化
+        Initialize an occupancy statistics sensor backed by the motion log.
+        """
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._device_id = device_id
+        self._index_device_id = device_id
+        self._attr_device_info = coordinator.device_info(device)
+        self._attr_name = f"Nature Remo {name} {description.name}"
+        self._attr_unique_id = f"{device_id}_{description.key}"
+        self._update_from_log()
 
-        if self._key == "il":
-            attributes["raw_sensor_scale"] = "0-200"
-            attributes["note"] = "This is a relative scale used by Nature Remo."
+    def _update_from_log(self) -> None:
+        """ログから値を計算する. / Compute the value from the log."""
+        log = self.coordinator.motion_logs.get(self._device_id)
+        if log is None or not log.count:
+            self._attr_native_value = None
+            return
+        value = log.stats(time.time())[self.entity_description.key]
+        if self.entity_description.key == "occupied_ratio":
+            value = round(value * 100, 1)
+        self._attr_native_value = value
 
-        return attributes
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """リフレッシュ毎に統計を1回だけ計算する. / Compute the statistics once per refresh."""
+        self._update_from_log()
+        self.async_write_ha_state()
 
 
-class NatureRemoMotionTimeSensor(CoordinatorEntity, SensorEntity):
+class NatureRemoMotionTimeSensor(_IndexedSensorMixin, CoordinatorEntity, SensorEntity):
     def __init__(self, coordinator, device_id, name, device):
         """
         モーション検出時刻センサーの初期化
@@ -195,25 +551,13 @@ class NatureRemoMotionTimeSensor(CoordinatorEntity, SensorEntity):
         """
         super().__init__(coordinator)
         self._device_id = device_id
-        self._device = device
+        self._index_device_id = device_id
+        self._attr_device_info = coordinator.device_info(device)
         self._attr_name = f"Nature Remo {name} Last Motion"
         self._attr_unique_id = f"{device_id}_last_motion"
         self._attr_device_class = None  # 時刻だから特に設定なし（UIで表示できる）
         self._attr_native_unit_of_measurement = None
 
-    @property
-    def device_info(self):
-        """
-        モーション検出時刻センサーのデバイス情報
-        Return device info for the motion time sensor.
-        """
-        return {
-            "identifiers": {(DOMAIN, self._device["device_id"])},
-            "name": self._device["name"],
-            "manufacturer": "Nature",
-            "model": self._device.get("firmware_version", "Nature Remo"),
-        }
-
     @property
     def native_value(self):
         """
@@ -226,32 +570,22 @@ class NatureRemoMotionTimeSensor(CoordinatorEntity, SensorEntity):
         return None
 
 
-class NatureRemoMotionBinarySensor(CoordinatorEntity, BinarySensorEntity):
+class NatureRemoMotionBinarySensor(
+    _IndexedSensorMixin, CoordinatorEntity, BinarySensorEntity
+):
     def __init__(self, coordinator, device_id, name, device):
         """
         モーション検出センサーの初期化
         Initialize the binary motion sensor entity.
         """
         super().__init__(coordinator)
-        self._device = device
+        self._attr_device_info = coordinator.device_info(device)
         self._device_id = device_id
+        self._index_device_id = device_id
         self._attr_name = f"Nature Remo {name} Motion"
         self._attr_unique_id = f"{device_id}_motion"
         self._attr_device_class = "motion"
 
-    @property
-    def device_info(self):
-        """
-        モーション検出センサーのデバイス情報
-        Return device info for the motion sensor.
-        """
-        return {
-            "identifiers": {(DOMAIN, self._device["device_id"])},
-            "name": self._device["name"],
-            "manufacturer": "Nature",
-            "model": self._device.get("firmware_version", "Nature Remo"),
-        }
-
     @property
     def is_on(self):
         """
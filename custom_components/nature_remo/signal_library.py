@@ -0,0 +1,135 @@
+from collections.abc import Iterable, Mapping
+import logging
+import re
+from typing import Any
+import unicodedata
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+_LOGGER = logging.getLogger(__name__)
+
+SIGNAL_STORAGE_VERSION = 1
+# 書き込みをまとめる遅延（秒） / Delay that batches writes (seconds)
+SAVE_DELAY = 30
+
+_SEPARATORS_RE = re.compile(r"[\s_\-・]+")
+
+
+def normalize_alias(name: str) -> str:
+    """
+    ボタン名を照合用に正規化する（全角・大文字・区切り文字の違いを吸収）.
+    Normalize a button name for matching: ignores width, case and separators.
+    """
+    return _SEPARATORS_RE.sub("", unicodedata.normalize("NFKC", name)).casefold()
+
+
+class SignalLibrary:
+    """
+    赤外線シグナルをシグナルID毎に永続化するライブラリ.
+    名前・正規化した別名・送信元デバイスに加え、学習済みなら生のIR（タイミング）データを持つ.
+    家電のシグナル集合が変化した時だけ更新する.
+
+    Persistent library of IR signals keyed by signal ID. Holds the name,
+    normalized aliases and sending device, plus raw IR timing data once learned.
+    Only refreshed when an appliance's signal set changes.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """初期化. / Initialize the library."""
+        self._store = Store(hass, SIGNAL_STORAGE_VERSION, f"nature_remo.signals.{entry_id}")
+        self._signals: dict[str, dict[str, Any]] = {}
+        # 家電ID → 正規化した別名 → シグナルID / Appliance ID → normalized alias → signal ID
+        self._aliases: dict[str, dict[str, str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._signals)
+
+    async def async_load(self) -> None:
+        """保存済みのライブラリを読み込む. / Load the stored library."""
+        self._signals = await self._store.async_load() or {}
+        self._aliases = {}
+        for signal_id, signal in self._signals.items():
+            self._aliases.setdefault(signal["appliance_id"], {}).setdefault(
+                signal["alias"], signal_id
+            )
+
+    @callback
+    def async_update(
+        self, ir_remotes: Mapping[str, dict], changed: Iterable[str]
+    ) -> None:
+        """
+        シグナル集合が変化した家電だけライブラリを更新する（学習済みのIRデータは引き継ぐ）.
+        Refresh the appliances whose signal set changed, keeping learned IR data.
+        """
+        # 消えた家電のシグナルも削除する / Also drop signals of appliances that disappeared
+        stale = {a for a in changed if a in ir_remotes}
+        stale.update(a for a in self._aliases if a not in ir_remotes)
+        if not stale:
+            return
+
+        for appliance_id in stale:
+            old_ids = [
+                signal_id
+                for signal_id, signal in self._signals.items()
+                if signal["appliance_id"] == appliance_id
+            ]
+            learned = {
+                signal_id: self._signals.pop(signal_id).get("ir") for signal_id in old_ids
+            }
+            self._aliases.pop(appliance_id, None)
+            remote = ir_remotes.get(appliance_id)
+            if remote is None:
+                continue
+
+            aliases = self._aliases[appliance_id] = {}
+            for signal in remote["signals"]:
+                alias = normalize_alias(signal["name"])
+                self._signals[signal["id"]] = {
+                    "name": signal["name"],
+                    "alias": alias,
+                    "appliance_id": appliance_id,
+                    "device_id": remote["device"]["device_id"],
+                    # 同じシグナルIDの学習済みデータは引き継ぐ / Keep learned data for surviving IDs
+                    "ir": learned.get(signal["id"]),
+                }
+                aliases.setdefault(alias, signal["id"])
+
+        _LOGGER.debug(
+            "Signal library updated for %d appliances (%d signals)",
+            len(stale),
+            len(self._signals),
+        )
+        self._store.async_delay_save(lambda: self._signals, SAVE_DELAY)
+
+    def get(self, signal_id: str) -> dict[str, Any] | None:
+        """シグナルIDの情報を返す. / Return the entry for a signal ID."""
+        return self._signals.get(signal_id)
+
+    def find(self, appliance_id: str, name: str) -> str | None:
+        """
+        家電のボタン名（表記ゆれを許容）からシグナルIDを返す.
+        Return the signal ID for an appliance's button name, tolerant of spelling variants.
+        """
+        return self._aliases.get(appliance_id, {}).get(normalize_alias(name))
+
+    def ir_data(self, signal_id: str) -> dict[str, Any] | None:
+        """学習済みの生IRデータを返す. / Return the learned raw IR data."""
+        signal = self._signals.get(signal_id)
+        return signal.get("ir") if signal else None
+
+    @callback
+    def async_set_ir_data(self, signal_id: str, ir: dict[str, Any]) -> None:
+        """
+        シグナルの生IRデータ（format・freq・data）を保存する.
+        Store the raw IR data (format, freq, data) for a signal.
+        """
+        signal = self._signals.get(signal_id)
+        if signal is None:
+            raise KeyError(signal_id)
+        signal["ir"] = {
+            "format": ir.get("format", "us"),
+            "freq": ir.get("freq", 38),
+            "data": list(ir["data"]),
+        }
+        self._store.async_delay_save(lambda: self._signals, SAVE_DELAY)
@@ -0,0 +1,81 @@
+from contextlib import contextmanager
+import logging
+import time
+
+from .metrics import LatencyHistogram
+
+# サブシステム毎のロガーはこの名前の子になる（HAのlogger設定で個別にレベルを変えられる）
+# Subsystem loggers are children of this name, so HA's logger config can set levels per subsystem
+TRACE_LOGGER = "custom_components.nature_remo.trace"
+
+# スパン名 → 経過時間のヒストグラム / Span name → latency histogram
+SPAN_METRICS: dict[str, LatencyHistogram] = {}
+
+
+class Tracer:
+    """
+    ホットパス向けの軽量なトレース機構.
+    遅延フォーマット、サブシステム毎のレベル、同じメッセージの間引き、スパン計測を提供する.
+
+    Lightweight tracing for hot paths: lazy formatting, per-subsystem levels,
+    rate-limited repeats and span timings that feed SPAN_METRICS.
+    """
+
+    def __init__(self, subsystem: str) -> None:
+        """初期化. / Initialize the tracer for a subsystem."""
+        self.subsystem = subsystem
+        self.logger = logging.getLogger(f"{TRACE_LOGGER}.{subsystem}")
+        # 間引きキー → [最後に出力した時刻, 抑制した件数] / Rate-limit key → [last emitted, suppressed count]
+        self._last: dict[str, list] = {}
+
+    def enabled(self, level: int = logging.DEBUG) -> bool:
+        """指定レベルが有効か. / Whether the level is enabled."""
+        return self.logger.isEnabledFor(level)
+
+    def debug(self, msg: str, *args) -> None:
+        """
+        DEBUGが無効ならフォーマットせずに返る.
+        Returns without formatting when DEBUG is disabled.
+        """
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(msg, *args)
+
+    def limited(
+        self, key: str, interval: float, msg: str, *args, level: int = logging.DEBUG
+    ) -> None:
+        """
+        同じキーのメッセージはinterval秒に1回だけ出力し、抑制した件数を添える.
+        Emit a message at most once per interval seconds per key, noting how many were suppressed.
+        """
+        if not self.logger.isEnabledFor(level):
+            return
+        now = time.monotonic()
+        entry = self._last.get(key)
+        if entry is not None and now - entry[0] < interval:
+            entry[1] += 1
+            return
+        suppressed = entry[1] if entry is not None else 0
+        self._last[key] = [now, 0]
+        if suppressed:
+            self.logger.log(level, msg + " (%d similar suppressed)", *args, suppressed)
+        else:
+            self.logger.log(level, msg, *args)
+
+    @contextmanager
+    def span(self, name: str):
+        """
+        処理時間を計測してSPAN_METRICSに記録し、DEBUG時はログにも出す.
+        Time a block, record it in SPAN_METRICS and log it at DEBUG.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            key = f"{self.subsystem}.{name}"
+            histogram = SPAN_METRICS.get(key)
+            if histogram is None:
+                histogram = SPAN_METRICS[key] = LatencyHistogram()
+            histogram.observe(elapsed)
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("span %s: %.1f ms", key, elapsed * 1000)
@@ -0,0 +1,322 @@
+from collections.abc import Callable, Mapping
+from datetime import datetime
+import logging
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN
+from .tracing import SPAN_METRICS
+
+_LOGGER = logging.getLogger(__name__)
+
+# スナップショットの区分 / Sections of the snapshot
+SECTIONS = ("devices", "appliances", "capabilities", "metrics", "freshness")
+
+
+def _iso(value: Any) -> Any:
+    """datetimeをISO8601文字列にする. / Convert a datetime to an ISO 8601 string."""
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def diff_sections(
+    old: Mapping[str, Mapping[str, Any]], new: Mapping[str, Mapping[str, Any]]
+) -> dict[str, dict]:
+    """
+    区分毎にキー単位の差分を取る（変化がなければ空の辞書）.
+    同じオブジェクトの区分は比較しない.
+
+    Diff each section key by key; returns an empty dict when nothing changed.
+    Sections that are the same object are not compared.
+    """
+    changed: dict[str, dict] = {}
+    removed: dict[str, list] = {}
+    for name, section in new.items():
+        before = old.get(name, {})
+        if section is before:
+            continue
+        updates = {
+            key: value
+            for key, value in section.items()
+            if key not in before or before[key] != value
+        }
+        gone = [key for key in before if key not in section]
+        if updates:
+            changed[name] = updates
+        if gone:
+            removed[name] = gone
+    if not changed and not removed:
+        return {}
+    return {"changed": changed, "removed": removed}
+
+
+class SnapshotPublisher:
+    """
+    コーディネーターのスナップショットをダッシュボード向けに正規化して配信する（エントリー毎に1つ）.
+    区分は元のスナップショットの構造が差し替わった時だけ作り直し、差分はリフレッシュ毎に
+    1回だけ計算して全購読者へ送る.
+
+    Publishes the coordinator's snapshot, normalized for dashboards; one per
+    entry. Sections are rebuilt only when the underlying snapshot structures
+    were replaced, and each refresh's diff is computed once and sent to every
+    subscriber.
+    """
+
+    def __init__(self, entry_id: str, coordinator) -> None:
+        """初期化. / Initialize the publisher."""
+        self.entry_id = entry_id
+        self.coordinator = coordinator
+        # (元の構造, 区分)のキャッシュ / Cache of (source structures, section)
+        self._devices: tuple[tuple, dict] | None = None
+        self._appliances: tuple[tuple, dict, dict] | None = None
+        # 購読中の最新の区分（差分の基準） / Latest sections while subscribed, the diff baseline
+        self._current: dict[str, dict] | None = None
+        self._subscribers: list[Callable[[str, dict], None]] = []
+        self._unsub_coordinator: Callable[[], None] | None = None
+
+    def _device_section(self) -> dict:
+        snapshot = self.coordinator.snapshot
+        source = (snapshot.devices, snapshot.motion_sensors)
+        if self._devices is not None and all(
+            a is b for a, b in zip(self._devices[0], source)
+        ):
+            return self._devices[1]
+
+        devices: dict[str, dict] = {}
+        for device_id, device in snapshot.devices.items():
+            devices[device_id] = {
+                "name": device["name"],
+                "firmware_version": device.get("firmware_version", ""),
+                "events": dict(device.get("events", {})),
+            }
+        for device_id, motion in snapshot.motion_sensors.items():
+            entry = devices.setdefault(
+                device_id,
+                {
+                    "name": motion["name"],
+                    "firmware_version": motion.get("firmware_version", ""),
+                },
+            )
+            entry["last_motion"] = _iso(motion.get("last_motion"))
+        self._devices = (source, devices)
+        return devices
+
+    def _appliance_sections(self) -> tuple[dict, dict]:
+        snapshot = self.coordinator.snapshot
+        source = (snapshot.appliances, snapshot.smart_meters)
+        if self._appliances is not None and all(
+            a is b for a, b in zip(self._appliances[0], source)
+        ):
+            return self._appliances[1], self._appliances[2]
+
+        appliances: dict[str, dict] = {}
+        capabilities: dict[str, dict] = {}
+        for appliance_id, raw in snapshot.appliances.items():
+            appliance = {
+                "type": raw.get("type"),
+                "name": raw.get("nickname", "Unnamed"),
+                "device_id": raw.get("device", {}).get("id", ""),
+            }
+            capability: dict[str, Any] = {}
+            if "aircon" in raw:
+                appliance["settings"] = raw.get("settings")
+                capability["modes"] = raw["aircon"].get("range", {}).get("modes", {})
+            light = raw.get("light")
+            if light:
+                appliance["state"] = light.get("state")
+                capability["buttons"] = [b.get("name") for b in light.get("buttons", [])]
+            meter = snapshot.smart_meters.get(appliance_id)
+            if meter is not None:
+                appliance["smart_meter"] = {
+                    key: _iso(value)
+                    for key, value in meter.items()
+                    if key not in ("name", "appliance_id", "device")
+                }
+            if raw.get("signals"):
+                capability["signals"] = [s.get("name") for s in raw["signals"]]
+            appliances[appliance_id] = appliance
+            capabilities[appliance_id] = capability
+        self._appliances = (source, appliances, capabilities)
+        return appliances, capabilities
+
+    def sections(self) -> dict[str, dict]:
+        """
+        現在のスナップショットを区分毎の辞書で返す.
+        Return the current snapshot as a dict of sections.
+        """
+        coordinator = self.coordinator
+        appliances, capabilities = self._appliance_sections()
+        return {
+            "devices": self._device_section(),
+            "appliances": appliances,
+            "capabilities": capabilities,
+            "metrics": {
+                "request_count": coordinator.api.request_count,
+                "requests_today": coordinator.polling.requests_today,
+                "polling_mode": coordinator.polling_mode,
+                "poll_interval": coordinator.poll_interval.total_seconds(),
+                # ヘッジ送信で追加消費したリクエスト / Extra requests spent on hedging
+                "hedged_requests": coordinator.api.hedged_requests,
+                "hedge_wins": coordinator.api.hedge_wins,
+                # 実行中・直近の結果を共有して省いたGET / GETs saved by sharing in-flight or fresh results
+                "shared_reads": coordinator.api.shared_reads,
+                "api_latency": {
+                    path: histogram.as_dict()
+                    for path, histogram in coordinator.api.latency.items()
+                },
+                "refresh_latency": coordinator.refresh_latency.as_dict(),
+                # 処理区間毎の経過時間（全エントリー共通） / Per-span timings, shared by every entry
+                "spans": {
+                    name: histogram.as_dict()
+                    for name, histogram in sorted(SPAN_METRICS.items())
+                },
+            },
+            "freshness": {
+                "last_update_success": coordinator.last_update_success,
+                "devices": _iso(coordinator.last_fetched.get("/devices")),
+                "appliances": _iso(coordinator.last_fetched.get("/appliances")),
+            },
+        }
+
+    def current(self) -> dict[str, dict]:
+        """購読中なら差分の基準、そうでなければ現在の区分. / The diff baseline while subscribed, else the current sections."""
+        return self._current if self._current is not None else self.sections()
+
+    @callback
+    def async_subscribe(self, send: Callable[[str, dict], None]) -> Callable[[], None]:
+        """
+        リフレッシュ毎の差分の送信先を登録し、登録解除用の関数を返す.
+        Register a receiver for the diff after each refresh and return the function that removes it.
+        """
+        if not self._subscribers:
+            self._current = self.sections()
+            self._unsub_coordinator = self.coordinator.async_add_listener(
+                self._async_refreshed
+            )
+        self._subscribers.append(send)
+
+        @callback
+        def _async_unsubscribe() -> None:
+            if send not in self._subscribers:
+                return
+            self._subscribers.remove(send)
+            if not self._subscribers:
+                self._stop()
+
+        return _async_unsubscribe
+
+    def _stop(self) -> None:
+        if self._unsub_coordinator is not None:
+            self._unsub_coordinator()
+            self._unsub_coordinator = None
+        self._current = None
+
+    @callback
+    def _async_refreshed(self) -> None:
+        """差分を1回だけ計算して全購読者へ送る. / Compute the diff once and send it to every subscriber."""
+        new = self.sections()
+        diff = diff_sections(self._current or {}, new)
+        self._current = new
+        if not diff:
+            return
+        payload = {"type": "diff", **diff}
+        for send in list(self._subscribers):
+            send(self.entry_id, payload)
+
+    @callback
+    def async_shutdown(self) -> None:
+        """
+        エントリーの削除時に購読者へ通知して購読を終える.
+        Tell subscribers the entry went away and drop them.
+        """
+        for send in list(self._subscribers):
+            send(self.entry_id, {"type": "unloaded"})
+        self._subscribers.clear()
+        self._stop()
+
+
+def _publishers(hass: HomeAssistant, entry_id: str | None) -> list[SnapshotPublisher]:
+    """対象エントリーの配信オブジェクト. / Publishers for the requested entries."""
+    entries = hass.data.get(DOMAIN, {})
+    if entry_id is not None:
+        entries = {entry_id: entries[entry_id]} if entry_id in entries else {}
+    return [data["publisher"] for data in entries.values()]
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "nature_remo/snapshot",
+        vol.Optional("entry_id"): str,
+    }
+)
+@callback
+def ws_snapshot(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """
+    全エントリー（またはentry_idの1つ）の現在のスナップショットを1通で返す.
+    Return the current snapshot of every entry (or just entry_id) in one message.
+    """
+    publishers = _publishers(hass, msg.get("entry_id"))
+    if not publishers and "entry_id" in msg:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "Nature Remo entry not found"
+        )
+        return
+    connection.send_result(
+        msg["id"],
+        {"entries": {publisher.entry_id: publisher.current() for publisher in publishers}},
+    )
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "nature_remo/subscribe_snapshot",
+        vol.Optional("entry_id"): str,
+    }
+)
+@callback
+def ws_subscribe_snapshot(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """
+    最初に全体のスナップショットを送り、以降はリフレッシュ毎の差分だけを送る.
+    購読開始後に追加されたエントリーは含まれない.
+
+    Send the full snapshot first, then only the diff after each refresh.
+    Entries set up after subscribing are not included.
+    """
+    publishers = _publishers(hass, msg.get("entry_id"))
+    if not publishers and "entry_id" in msg:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "Nature Remo entry not found"
+        )
+        return
+
+    @callback
+    def _send(entry_id: str, payload: dict) -> None:
+        connection.send_message(
+            websocket_api.event_message(msg["id"], {"entry_id": entry_id, **payload})
+        )
+
+    unsubs = [publisher.async_subscribe(_send) for publisher in publishers]
+
+    @callback
+    def _async_unsubscribe() -> None:
+        for unsub in unsubs:
+            unsub()
+
+    connection.subscriptions[msg["id"]] = _async_unsubscribe
+    connection.send_result(msg["id"])
+    for publisher in publishers:
+        _send(publisher.entry_id, {"type": "snapshot", **publisher.current()})
+
+
+@callback
+def async_register_commands(hass: HomeAssistant) -> None:
+    """WebSocketコマンドを登録する. / Register the websocket commands."""
+    websocket_api.async_register_command(hass, ws_snapshot)
+    websocket_api.async_register_command(hass, ws_subscribe_snapshot)
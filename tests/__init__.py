@@ -0,0 +1 @@
+"""Nature Remo統合のテスト. / Tests for the Nature Remo integration."""
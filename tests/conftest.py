@@ -0,0 +1,9 @@
+"""テスト共通のフィクスチャ. / Shared test fixtures."""
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    """custom_componentsを読み込めるようにする. / Allow custom_components to load."""
+    yield
@@ -0,0 +1,105 @@
+"""カセットの記録と再生のテスト. / Tests for cassette recording and replay."""
+
+import json
+import time
+
+from custom_components.nature_remo.api import ApiResponse
+from custom_components.nature_remo.cassette import CassetteRecorder, CassetteReplayAPI
+from custom_components.nature_remo.coordinator import NatureRemoCoordinator
+
+DEVICE_ID = "0b6a1c2e-1111-4a4a-8b8b-000000000001"
+APPLIANCE_ID = "0b6a1c2e-2222-4a4a-8b8b-000000000002"
+
+DEVICES = [
+    {
+        "id": DEVICE_ID,
+        "name": "Living Remo",
+        "firmware_version": "Remo/1.14.0",
+        "mac_address": "aa:bb:cc:dd:ee:ff",
+        "newest_events": {
+            "te": {"val": 24.5, "created_at": "2026-10-01T00:00:00Z"},
+            "hu": {"val": 48, "created_at": "2026-10-01T00:00:00Z"},
+            "mo": {"val": 1, "created_at": "2026-10-01T00:00:00Z"},
+        },
+    }
+]
+APPLIANCES = [
+    {
+        "id": APPLIANCE_ID,
+        "type": "AC",
+        "nickname": "Living AC",
+        "device": {"id": DEVICE_ID, "name": "Living Remo"},
+        "settings": {"temp": "26", "mode": "cool", "vol": "auto", "button": ""},
+        "aircon": {"range": {"modes": {"cool": {"temp": ["26"]}}}},
+        "signals": [{"id": "sig-1", "name": "Power"}],
+    }
+]
+
+
+def _record(path: str) -> None:
+    """/devicesと/appliancesを1回ずつ記録する. / Record one /devices and one /appliances."""
+    recorder = CassetteRecorder(path, salt="test")
+    for api_path, body in (("/devices", DEVICES), ("/appliances", APPLIANCES)):
+        recorder.record(
+            "GET",
+            api_path,
+            None,
+            ApiResponse(
+                status=200,
+                headers={"Content-Type": "application/json", "Set-Cookie": "secret"},
+                text=json.dumps(body),
+            ),
+            0.01,
+            {"Authorization": "Bearer secret-token"},
+        )
+    recorder.close()
+
+
+async def test_cassette_replays_through_coordinator(hass, tmp_path) -> None:
+    """記録したカセットでコーディネーターが更新できる. / A recorded cassette drives a coordinator refresh."""
+    path = str(tmp_path / "cassette.jsonl.gz")
+    await hass.async_add_executor_job(_record, path)
+
+    entries = await hass.async_add_executor_job(CassetteReplayAPI.load, path)
+    assert [entry["path"] for entry in entries] == ["/devices", "/appliances"]
+    # IDと秘匿情報は伏せられ、不要なヘッダは残らない
+    # IDs and secrets are redacted and unlisted headers are dropped
+    assert DEVICE_ID not in json.dumps(entries)
+    assert entries[0]["body"][0]["mac_address"] == "REDACTED"
+    assert "Set-Cookie" not in entries[0]["headers"]
+    assert entries[0]["request_headers"] == {"Authorization": "REDACTED"}
+
+    api = CassetteReplayAPI(entries)
+    coordinator = NatureRemoCoordinator(hass, api)
+    await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    snapshot = coordinator.snapshot
+    device_id = entries[0]["body"][0]["id"]
+    appliance_id = entries[1]["body"][0]["id"]
+    assert snapshot.devices[device_id]["events"]["te"]["val"] == 24.5
+    assert device_id in snapshot.motion_sensors
+    assert snapshot.aircons[appliance_id]["name"] == "Living AC"
+    assert snapshot.ir_remotes[appliance_id]["signals"] == [{"id": "sig-1", "name": "Power"}]
+
+
+async def test_realtime_replay_keeps_recorded_spacing() -> None:
+    """記録時の間隔と応答時間を再現する. / Realtime replay keeps the recorded spacing and latency."""
+    entries = [
+        {"t": 5.0, "method": "GET", "path": "/devices", "data": None, "status": 200,
+         "headers": {}, "body": [], "elapsed": 0.05},
+        {"t": 5.3, "method": "GET", "path": "/appliances", "data": None, "status": 200,
+         "headers": {}, "body": [], "elapsed": 0.05},
+    ]
+    api = CassetteReplayAPI(entries, realtime=True)
+
+    start = time.monotonic()
+    await api._request("GET", "/devices", "/devices")
+    first = time.monotonic() - start
+    await api._request("GET", "/appliances", "/appliances")
+    second = time.monotonic() - start
+
+    assert 0.05 <= first < 0.2
+    # 2件目は記録時と同じく0.3秒後に送られ、応答時間だけ待つ
+    # The second request lands 0.3s in, as recorded, plus its latency
+    assert 0.35 <= second < 0.6